@@ -0,0 +1,483 @@
+"""Offline-Simulation der Faber Skypad Zustandsmaschine.
+
+Führt FaberFan, FaberLight und FaberRuntimeData gegen einen nackten
+Home Assistant Kern aus (keine Konfiguration, keine geladenen
+Integrationen). `remote.send_command` ist ein Fake-Dienst, der die Befehle
+mit Zeitstempel aufzeichnet und an ein physikalisches Modell der Haube
+weitergibt. Das Modell speist einen synthetischen Leistungssensor
+(Anlaufzeit, Rauschen, Licht-Offset). Alle Timer (Timer-Dienst,
+`asyncio.sleep`, `time.monotonic`) laufen auf einer virtuellen Uhr, ein
+Szenario über mehrere Minuten dauert daher nur Bruchteile einer Sekunde.
+
+Ausgewertet werden gesendete Befehle, Latenz pro Absicht, Zustands-
+schreibvorgänge pro Minute und die Genauigkeit der Erkennung.
+
+Aufruf aus dem Repository-Verzeichnis (Home Assistant muss installiert sein):
+
+    python bench/simulate.py [Szenario ...] [--seed N] [--no-batch] [--output DATEI]
+"""
+import argparse
+import asyncio
+import contextlib
+import math
+import os
+import random
+import selectors
+import statistics
+import sys
+import tempfile
+import time
+import types
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.faber_skypad import FaberRuntimeData  # noqa: E402
+from custom_components.faber_skypad import const  # noqa: E402
+from custom_components.faber_skypad.command_queue import FaberCommandQueue  # noqa: E402
+from custom_components.faber_skypad.coordinator import FaberCoordinator  # noqa: E402
+from custom_components.faber_skypad.fan import FaberFan  # noqa: E402
+from custom_components.faber_skypad.light import FaberLight  # noqa: E402
+from custom_components.faber_skypad.timers import async_get_timer_scope, async_release_timer_scope  # noqa: E402
+
+ENTRY_ID = "bench"
+REMOTE_ENTITY = "remote.bench"
+POWER_SENSOR = "sensor.bench_power"
+
+# Zuordnung der gesendeten Codes zu lesbaren Namen
+COMMAND_NAMES = {
+    f"b64:{const.CMD_TURN_ON_OFF}": "power",
+    f"b64:{const.CMD_INCREASE}": "increase",
+    f"b64:{const.CMD_DECREASE}": "decrease",
+    f"b64:{const.CMD_BOOST}": "boost",
+    f"b64:{const.CMD_LIGHT}": "light",
+}
+
+
+# --- VIRTUELLE UHR ---
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Wartet nie real, sondern stellt die virtuelle Uhr auf den nächsten Timer."""
+
+    def __init__(self):
+        super().__init__()
+        self.loop = None
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events:
+            return events
+        if timeout is None:
+            raise RuntimeError("Simulation hängt: keine Timer und keine Ereignisse")
+        self.loop.advance(timeout)
+        return []
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event-Loop, dessen Zeit nur durch wartende Timer fortschreitet."""
+
+    def __init__(self):
+        selector = _VirtualSelector()
+        super().__init__(selector)
+        selector.loop = self
+        self._now = 0.0
+
+    def time(self):
+        return self._now
+
+    def advance(self, seconds):
+        self._now += max(seconds, 0.0)
+
+
+@contextlib.contextmanager
+def _use_virtual_monotonic(loop):
+    """Leitet `time.monotonic` der Integrationsmodule für ein Szenario auf die virtuelle Uhr um.
+
+    Jedes Szenario hat einen eigenen Loop; danach wird die echte Uhr
+    wiederhergestellt, damit das nächste Szenario nicht die Uhr eines
+    bereits geschlossenen Loops liest.
+    """
+    clock = types.SimpleNamespace(monotonic=loop.time, time=time.time)
+    patched = [
+        module
+        for name, module in list(sys.modules.items())
+        if name.startswith("custom_components.faber_skypad") and getattr(module, "time", None) is time
+    ]
+    for module in patched:
+        module.time = clock
+    try:
+        yield
+    finally:
+        for module in patched:
+            module.time = time
+
+
+# --- MODELL DER HAUBE ---
+
+class HoodModel:
+    """Physikalisches Modell: Zustand aus IR-Befehlen, Leistung mit Anlauf und Rauschen."""
+
+    LEVEL_WATTS = {"off": 1.5, 1: 32.0, 2: 51.0, 3: 78.0, "boost": 118.0}
+    BOOST_SECONDS = 300.0
+
+    def __init__(self, loop, rng, ramp_time=3.0, noise=0.8, light_offset=6.0):
+        self._loop = loop
+        self._rng = rng
+        self.ramp_time = ramp_time
+        self.noise = noise
+        self.light_offset = light_offset
+        self.mode = "off"
+        self.light = False
+        self.mode_changed_at = 0.0
+        self._power = self.LEVEL_WATTS["off"]
+        self._power_time = 0.0
+        self._boost_timer = None
+
+    def press(self, name):
+        """Wirkung eines Tastendrucks (IR oder Fernbedienung) auf das Gerät."""
+        if name == "light":
+            self.light = not self.light
+            return
+        if name == "power":
+            self._set_mode("off" if self.mode != "off" else 1)
+        elif self.mode == "off":
+            if name == "boost":
+                self._set_mode("boost")
+        elif name == "boost":
+            self._set_mode("boost")
+        elif name == "increase":
+            self._set_mode(3 if self.mode == "boost" else min(self.mode + 1, 3))
+        elif name == "decrease":
+            self._set_mode(2 if self.mode == "boost" else max(self.mode - 1, 1))
+
+    def _set_mode(self, mode):
+        if mode == self.mode:
+            return
+        self._advance_power()
+        if self._boost_timer is not None:
+            self._boost_timer.cancel()
+            self._boost_timer = None
+        if mode == "boost":
+            # Gerät schaltet Boost nach 5 Minuten selbst zurück
+            self._boost_timer = self._loop.call_later(self.BOOST_SECONDS, self._set_mode, 3)
+        self.mode = mode
+        self.mode_changed_at = self._loop.time()
+
+    def _advance_power(self):
+        now = self._loop.time()
+        target = self.LEVEL_WATTS[self.mode]
+        elapsed = now - self._power_time
+        if self.ramp_time > 0:
+            self._power += (target - self._power) * (1 - math.exp(-elapsed / self.ramp_time))
+        else:
+            self._power = target
+        self._power_time = now
+
+    def read_power(self):
+        """Aktueller Messwert des Leistungssensors."""
+        self._advance_power()
+        value = self._power + self._rng.gauss(0.0, self.noise)
+        if self.light:
+            value += self.light_offset
+        return max(value, 0.0)
+
+
+class _MemoryStore:
+    """Store-Ersatz ohne Dateizugriff."""
+
+    async def async_load(self):
+        return None
+
+    def async_delay_save(self, data_func, delay=0):
+        pass
+
+    async def async_save(self, data):
+        pass
+
+    async def async_remove(self):
+        pass
+
+
+# --- SIMULATION ---
+
+class Simulation:
+    """Eine Haube mit Fan, Licht und Leistungssensor im Kern von Home Assistant."""
+
+    def __init__(self, hass, loop, rng, batch=True, sample_interval=2.0):
+        self.hass = hass
+        self.loop = loop
+        self.model = HoodModel(loop, rng)
+        self.batch = batch
+        self.sample_interval = sample_interval
+        self.ir_calls = []
+        self.state_writes = defaultdict(int)
+        self.intents = defaultdict(list)
+        self._accuracy_samples = []
+        self._light_samples = []
+        self._lags = []
+        self._pending_change = None
+        self._tasks = []
+        self.runtime_data = None
+        self.fan = None
+        self.light = None
+
+    async def async_setup(self, run_on_enabled=False, run_on_seconds=60):
+        hass = self.hass
+        hass.services.async_register("remote", "send_command", self._async_send_command)
+        hass.states.async_set(POWER_SENSOR, f"{self.model.read_power():.1f}", {"unit_of_measurement": "W"})
+
+        config = {
+            "name": "Bench",
+            const.CONF_REMOTE_ENTITY: REMOTE_ENTITY,
+            const.CONF_POWER_SENSOR: POWER_SENSOR,
+        }
+        runtime_data = FaberRuntimeData(
+            ENTRY_ID,
+            config,
+            FaberCommandQueue(hass, REMOTE_ENTITY, batch=self.batch),
+            _MemoryStore(),
+        )
+        # Kalibriertes Profil direkt aus dem Modell übernehmen
+        for mode, watt in HoodModel.LEVEL_WATTS.items():
+            runtime_data.power_profile[mode] = watt
+            runtime_data.power_stats[mode] = {
+                "mean": watt, "std": self.model.noise, "count": 8, "settled": True
+            }
+        runtime_data.light_offset = self.model.light_offset
+        runtime_data.run_on_enabled = run_on_enabled
+        runtime_data.run_on_seconds = run_on_seconds
+        runtime_data.timers = async_get_timer_scope(hass, ENTRY_ID)
+        runtime_data.coordinator = FaberCoordinator(hass, runtime_data)
+        runtime_data.coordinator.async_start()
+        self.runtime_data = runtime_data
+
+        self.fan = FaberFan(hass, runtime_data)
+        self.light = FaberLight(runtime_data)
+        runtime_data.fan_entity = self.fan
+        for entity, entity_id in ((self.fan, "fan.bench"), (self.light, "light.bench")):
+            entity.hass = hass
+            entity.entity_id = entity_id
+            entity.async_write_ha_state = self._counting_writer(entity_id)
+            await entity.async_added_to_hass()
+
+        self._tasks.append(self.loop.create_task(self._async_sensor_loop()))
+        self._tasks.append(self.loop.create_task(self._async_accuracy_loop()))
+
+    async def async_teardown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.fan.async_will_remove_from_hass()
+        self.runtime_data.coordinator.async_shutdown()
+        async_release_timer_scope(self.hass, self.runtime_data.timers)
+        self.runtime_data.command_queue.shutdown()
+
+    def _counting_writer(self, entity_id):
+        def _write():
+            self.state_writes[entity_id] += 1
+        return _write
+
+    async def _async_send_command(self, call):
+        """Fake `remote.send_command`: zeichnet auf und drückt die Tasten im Modell."""
+        commands = call.data["command"]
+        if isinstance(commands, str):
+            commands = [commands]
+        hold = call.data.get("hold_secs", 0.0)
+        delay = call.data.get("delay_secs", 0.0)
+        self.ir_calls.append((self.loop.time(), [COMMAND_NAMES.get(c, c) for c in commands]))
+        for index, command in enumerate(commands):
+            await asyncio.sleep(hold)
+            self.press(COMMAND_NAMES.get(command, command))
+            if index < len(commands) - 1:
+                await asyncio.sleep(delay)
+
+    def press(self, name):
+        """Tastendruck am Gerät (per IR oder an der Haube selbst)."""
+        previous = self.model.mode
+        self.model.press(name)
+        if self.model.mode != previous:
+            self._pending_change = (self.model.mode, self.loop.time())
+
+    async def _async_sensor_loop(self):
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            self.hass.states.async_set(
+                POWER_SENSOR, f"{self.model.read_power():.1f}", {"unit_of_measurement": "W"}
+            )
+
+    async def _async_accuracy_loop(self):
+        """Vergleicht jede Sekunde die Erkennung mit dem wahren Zustand des Modells."""
+        while True:
+            await asyncio.sleep(1.0)
+            detected = self.runtime_data.coordinator.mode
+            self._accuracy_samples.append(detected == self.model.mode)
+            self._light_samples.append(self.light.is_on == self.model.light)
+            if self._pending_change and detected == self._pending_change[0]:
+                self._lags.append(self.loop.time() - self._pending_change[1])
+                self._pending_change = None
+
+    async def intent(self, label, coro):
+        """Führt eine Absicht aus und misst die Zeit bis zur Rückkehr."""
+        start = self.loop.time()
+        await coro
+        self.intents[label].append(self.loop.time() - start)
+
+    def spawn_intent(self, label, coro):
+        """Startet eine Absicht parallel (z.B. für schnelle Slider-Bewegungen)."""
+        task = self.loop.create_task(self.intent(label, coro))
+        self._tasks.append(task)
+        return task
+
+    async def wait(self, seconds):
+        await asyncio.sleep(seconds)
+
+    def report(self, name, duration):
+        pulses = sum(len(commands) for _t, commands in self.ir_calls)
+        writes = sum(self.state_writes.values())
+        accuracy = (
+            100 * sum(self._accuracy_samples) / len(self._accuracy_samples)
+            if self._accuracy_samples else 0.0
+        )
+        light_accuracy = (
+            100 * sum(self._light_samples) / len(self._light_samples)
+            if self._light_samples else 0.0
+        )
+        lines = [
+            f"== {name} ({duration:.0f}s virtuell) ==",
+            f"  remote.send_command Aufrufe: {len(self.ir_calls)}",
+            f"  IR-Pulse:                    {pulses}",
+            f"  Zustandsschreibvorgänge/min: {writes / (duration / 60):.1f}"
+            f"  ({', '.join(f'{k}={v}' for k, v in sorted(self.state_writes.items()))})",
+            f"  Erkennungsgenauigkeit:       {accuracy:.1f} %",
+            f"  Licht korrekt:               {light_accuracy:.1f} %",
+        ]
+        if self._lags:
+            lines.append(
+                f"  Erkennungsverzögerung:       Ø {statistics.fmean(self._lags):.1f}s,"
+                f" max {max(self._lags):.1f}s ({len(self._lags)} Wechsel)"
+            )
+        lines.append(
+            f"  Endzustand:                  Modell={self.model.mode},"
+            f" Fan={'an' if self.fan.is_on else 'aus'} {self.fan.percentage}%"
+            f" {self.fan.preset_mode or ''}".rstrip()
+        )
+        for label, latencies in self.intents.items():
+            lines.append(
+                f"  Latenz {label:<22} n={len(latencies):<3}"
+                f" Ø {statistics.fmean(latencies):.2f}s  max {max(latencies):.2f}s"
+            )
+        return "\n".join(lines)
+
+
+# --- SZENARIEN ---
+
+async def scenario_slider_spam(sim):
+    """Schnelle Slider-Bewegungen: nur das letzte Ziel soll gesendet werden."""
+    await sim.intent("turn_on", sim.fan.async_turn_on(percentage=33))
+    await sim.wait(10)
+    for percentage in (66, 100, 33, 100, 66, 33, 66, 100, 66):
+        sim.spawn_intent("set_percentage", sim.fan.async_set_percentage(percentage))
+        await sim.wait(0.3)
+    await sim.wait(30)
+
+
+async def scenario_manual_remote(sim):
+    """Bedienung an der Haube: nur die Erkennung über den Leistungssensor greift."""
+    await sim.wait(10)
+    for name, pause in (
+        ("power", 40), ("increase", 40), ("increase", 40), ("decrease", 40),
+        ("light", 30), ("boost", 60), ("power", 40), ("light", 20),
+    ):
+        sim.press(name)
+        await sim.wait(pause)
+
+
+async def scenario_run_on(sim):
+    """Ausschalten mit Nachlauf: Stufe 1 für 60 Sekunden, dann aus."""
+    await sim.intent("turn_on", sim.fan.async_turn_on(percentage=100))
+    await sim.wait(30)
+    await sim.intent("turn_off", sim.fan.async_turn_off())
+    await sim.wait(90)
+
+
+async def scenario_boost_timeout(sim):
+    """Boost läuft nach 5 Minuten am Gerät und in Home Assistant aus."""
+    await sim.intent("turn_on", sim.fan.async_turn_on(percentage=66))
+    await sim.wait(20)
+    await sim.intent("boost", sim.fan.async_set_preset_mode(const.PRESET_BOOST))
+    await sim.wait(330)
+    await sim.intent("turn_off", sim.fan.async_turn_off())
+    await sim.wait(20)
+
+
+async def scenario_light(sim):
+    """Licht schalten bei laufendem Motor."""
+    await sim.intent("turn_on", sim.fan.async_turn_on(percentage=66))
+    await sim.wait(20)
+    await sim.intent("light_on", sim.light.async_turn_on())
+    await sim.wait(30)
+    await sim.intent("light_off", sim.light.async_turn_off())
+    await sim.wait(20)
+
+
+SCENARIOS = {
+    "slider_spam": (scenario_slider_spam, {}),
+    "manual_remote": (scenario_manual_remote, {}),
+    "run_on": (scenario_run_on, {"run_on_enabled": True, "run_on_seconds": 60}),
+    "boost_timeout": (scenario_boost_timeout, {}),
+    "light": (scenario_light, {}),
+}
+
+
+async def _async_run_scenario(loop, name, seed, batch):
+    scenario, setup_kwargs = SCENARIOS[name]
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        sim = Simulation(hass, loop, random.Random(seed), batch=batch)
+        await sim.async_setup(**setup_kwargs)
+        start = loop.time()
+        await scenario(sim)
+        await hass.async_block_till_done()
+        duration = loop.time() - start
+        await sim.async_teardown()
+        return sim.report(name, duration)
+
+
+def run(names, seed=1, batch=True):
+    """Führt die Szenarien aus und liefert den Bericht als Text."""
+    reports = []
+    for name in names:
+        loop = VirtualClockLoop()
+        asyncio.set_event_loop(loop)
+        started = time.perf_counter()
+        try:
+            with _use_virtual_monotonic(loop):
+                report = loop.run_until_complete(_async_run_scenario(loop, name, seed, batch))
+        finally:
+            loop.close()
+        reports.append(f"{report}\n  Rechenzeit:                  {time.perf_counter() - started:.3f}s")
+    return "\n\n".join(reports)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", metavar="SZENARIO", help=", ".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-batch", action="store_true", help="Jeden Puls einzeln senden")
+    parser.add_argument("--output", help="Bericht zusätzlich in diese Datei schreiben")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unbekannte Szenarien: {', '.join(sorted(unknown))}")
+
+    report = run(args.scenarios or list(SCENARIOS), seed=args.seed, batch=not args.no_batch)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,35 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, DEFAULT_RUN_ON_SECONDS
+from .const import (
+    DOMAIN,
+    DEFAULT_RUN_ON_SECONDS,
+    CONF_REMOTE_ENTITY,
+    CONF_BATCH_COMMANDS,
+    CONF_COMMAND_SET,
+    CONF_COMMAND_DEVICE,
+    CONF_METRICS,
+    DEFAULT_METRICS,
+    CONF_HOMING,
+    DEFAULT_HOMING,
+    DEFAULT_BATCH_COMMANDS,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+)
+from .command_queue import FaberCommandQueue
+from .commands import FaberCommandSet
+from .metrics import FaberMetrics
+from .scheduler import async_get_scheduler, async_release_scheduler
+from .timers import async_get_timer_scope, async_release_timer_scope
+from .calibration import FaberCalibrationProgress
+from .coordinator import FaberCoordinator
+from .energy import new_energy_totals
+from .homing import FaberHomingPlanner
+from .auto_mode import FaberAutoController, auto_sensors
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,27 +47,114 @@ PLATFORMS = [
 
 class FaberRuntimeData:
     """Klasse zum Speichern von Laufzeitdaten, die zwischen Entitäten geteilt werden."""
-    def __init__(self):
+    def __init__(self, entry_id, config, command_queue, store):
+        self.entry_id = entry_id
+        self.config = config
+        self.name = config.get("name", "Faber Skypad")
+        # Eine DeviceInfo pro Config-Entry, von allen Entitäten geteilt
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry_id)},
+            name=self.name,
+            manufacturer="Faber",
+            model="Skypad",
+        )
+        self.command_queue = command_queue
+        self.pacing = command_queue.pacing
+        self.metrics = command_queue.metrics
+        self.homing = FaberHomingPlanner(config.get(CONF_HOMING, DEFAULT_HOMING))
+        self.auto = FaberAutoController(auto_sensors(config))
         self.run_on_enabled = False
         self.run_on_seconds = DEFAULT_RUN_ON_SECONDS
         self.run_on_active = False
         self.run_on_finish_time = None
+        # Stufe der laufenden Nachlauf-Phase (Profil) oder None
+        self.run_on_level = None
+        self.boost_active = False
+        self.boost_finish_time = None
         self.fan_entity = None
-        self._listeners = []
-
-    def register_listener(self, callback_func):
-        """Registriert eine Funktion, die bei Änderungen aufgerufen wird."""
-        self._listeners.append(callback_func)
-        
-    def unregister_listener(self, callback_func):
-        """Entfernt einen Listener."""
-        if callback_func in self._listeners:
-            self._listeners.remove(callback_func)
-
-    def trigger_update(self):
-        """Informiert alle Listener über Änderungen."""
-        for callback_func in self._listeners:
-            callback_func()
+        self.power_profile = {
+            "off": 0.0,
+            1: 0.0,
+            2: 0.0,
+            3: 0.0,
+            "boost": 0.0
+        }
+        self.power_stats = {}
+        # Mehrverbrauch des Lichts über dem jeweiligen Modus (0 = nicht gelernt)
+        self.light_offset = 0.0
+        self.energy_totals = new_energy_totals()
+        self.calibration = FaberCalibrationProgress()
+        self.last_speed_step = 0
+        self._store = store
+        self._save_pending = False
+        self.timers = None
+        self.coordinator = None
+
+    async def async_load(self):
+        """Lädt gespeicherte Profile und Einstellungen (einmalig beim Setup)."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        for key, value in stored.get("power_profile", {}).items():
+            mode = int(key) if key.isdigit() else key
+            if mode in self.power_profile:
+                self.power_profile[mode] = float(value)
+        for key, stats in stored.get("power_stats", {}).items():
+            mode = int(key) if key.isdigit() else key
+            if mode in self.power_profile or mode == "light":
+                self.power_stats[mode] = stats
+        self.light_offset = float(stored.get("light_offset", 0.0))
+        energy = stored.get("energy", {})
+        self.energy_totals["energy_kwh"] = float(energy.get("energy_kwh", 0.0))
+        for counter in ("level_seconds", "level_activations"):
+            for key, value in energy.get(counter, {}).items():
+                mode = int(key) if key.isdigit() else key
+                if mode in self.energy_totals[counter]:
+                    self.energy_totals[counter][mode] = value
+        self.run_on_enabled = stored.get("run_on_enabled", self.run_on_enabled)
+        self.run_on_seconds = stored.get("run_on_seconds", self.run_on_seconds)
+        self.last_speed_step = stored.get("last_speed_step", 0)
+        self.pacing.restore(stored.get("pacing", {}))
+        self.homing.restore(stored.get("homing", {}))
+
+    def async_schedule_save(self):
+        """Speichert verzögert, mehrere Änderungen werden zu einem Schreibvorgang."""
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    async def async_flush(self):
+        """Schreibt ausstehende Änderungen sofort (z.B. beim Entladen)."""
+        if self._save_pending:
+            await self._store.async_save(self._data_to_save())
+
+    def update_speed_step(self, step):
+        """Merkt sich die zuletzt bekannte Stufe für den nächsten Start."""
+        if step != self.last_speed_step:
+            self.last_speed_step = step
+            self.async_schedule_save()
+
+    def _data_to_save(self):
+        self._save_pending = False
+        return {
+            "power_profile": {str(mode): watt for mode, watt in self.power_profile.items()},
+            "power_stats": {str(mode): stats for mode, stats in self.power_stats.items()},
+            "light_offset": self.light_offset,
+            "energy": {
+                "energy_kwh": self.energy_totals["energy_kwh"],
+                "level_seconds": {
+                    str(mode): value for mode, value in self.energy_totals["level_seconds"].items()
+                },
+                "level_activations": {
+                    str(mode): value for mode, value in self.energy_totals["level_activations"].items()
+                },
+            },
+            "run_on_enabled": self.run_on_enabled,
+            "run_on_seconds": self.run_on_seconds,
+            "last_speed_step": self.last_speed_step,
+            "pacing": self.pacing.as_dict(),
+            "homing": self.homing.as_dict(),
+        }
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Setzt die Integration aus der Konfiguration auf."""
@@ -48,10 +162,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     _LOGGER.debug("Setup Faber Skypad Entry: %s", entry.entry_id)
 
-    # Runtime Data initialisieren
+    # Optionen überschreiben die Daten aus der Ersteinrichtung
+    config = {**entry.data, **entry.options}
+
+    # Code-Tabelle einmalig prüfen und vorformatieren
+    try:
+        command_set = FaberCommandSet(
+            config.get(CONF_COMMAND_SET) or {}, config.get(CONF_COMMAND_DEVICE)
+        )
+    except ValueError as err:
+        raise ConfigEntryError(f"Ungültiger Befehlssatz: {err}") from err
+
+    # Runtime Data initialisieren und gespeicherte Werte einmalig laden
+    runtime_data = FaberRuntimeData(
+        entry.entry_id,
+        config,
+        FaberCommandQueue(
+            hass,
+            config[CONF_REMOTE_ENTITY],
+            batch=config.get(CONF_BATCH_COMMANDS, DEFAULT_BATCH_COMMANDS),
+            # Ein Scheduler pro Remote, geteilt mit allen Einträgen am selben IR-Sender
+            scheduler=async_get_scheduler(hass, config[CONF_REMOTE_ENTITY], entry.entry_id),
+            commands=command_set,
+            metrics=FaberMetrics(config.get(CONF_METRICS, DEFAULT_METRICS)),
+        ),
+        Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"),
+    )
+    await runtime_data.async_load()
+    # Alle Fristen des Eintrags laufen über den gemeinsamen Timer-Dienst der Domain
+    runtime_data.timers = async_get_timer_scope(hass, entry.entry_id)
+    runtime_data.coordinator = FaberCoordinator(hass, runtime_data)
+    runtime_data.coordinator.async_start()
+
     hass.data[DOMAIN][entry.entry_id] = {
-        "config": entry.data,
-        "runtime_data": FaberRuntimeData()
+        "config": config,
+        "runtime_data": runtime_data
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -65,9 +210,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Entfernt die Integration."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        data["runtime_data"].coordinator.async_shutdown()
+        async_release_timer_scope(hass, data["runtime_data"].timers)
+        data["runtime_data"].command_queue.shutdown()
+        async_release_scheduler(hass, data["runtime_data"].command_queue.scheduler, entry.entry_id)
+        await data["runtime_data"].async_flush()
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Löscht die gespeicherten Daten, wenn die Integration entfernt wird."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Lädt die Integration neu, wenn sich Optionen ändern."""
     await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
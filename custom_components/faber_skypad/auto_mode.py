@@ -0,0 +1,166 @@
+"""Luftqualitäts-Automatik der Faber Skypad."""
+import math
+from collections import deque
+
+from .const import (
+    CONF_AUTO_HUMIDITY_SENSOR,
+    CONF_AUTO_VOC_SENSOR,
+    CONF_AUTO_PM_SENSOR,
+    CONF_AUTO_TEMPERATURE_SENSOR,
+    AUTO_THRESHOLDS,
+    AUTO_HYSTERESIS,
+    AUTO_SMOOTHING_TIME,
+    AUTO_MIN_DWELL,
+    AUTO_MAX_PULSES_PER_MINUTE,
+)
+
+# Konfigurierbare Sensoren und ihre Art (Schlüssel in AUTO_THRESHOLDS)
+AUTO_SENSOR_KINDS = {
+    CONF_AUTO_HUMIDITY_SENSOR: "humidity",
+    CONF_AUTO_VOC_SENSOR: "voc",
+    CONF_AUTO_PM_SENSOR: "pm",
+    CONF_AUTO_TEMPERATURE_SENSOR: "temperature",
+}
+
+# Zeitfenster der Pulsbegrenzung in Sekunden
+PULSE_WINDOW = 60.0
+# Nachlauf nach einer berechneten Schwellenüberschreitung, damit sie sicher erreicht ist
+CROSSING_MARGIN = 0.5
+
+
+def auto_sensors(config):
+    """Konfigurierte Sensoren der Automatik als {entity_id: Art}."""
+    return {
+        config[key]: kind for key, kind in AUTO_SENSOR_KINDS.items() if config.get(key)
+    }
+
+
+class _SmoothedValue:
+    """Exponentielle Glättung über die Zeit für ereignisgesteuerte Messwerte.
+
+    Zwischen zwei Meldungen gilt der letzte Rohwert; der geglättete Wert
+    nähert sich ihm mit der Zeitkonstante AUTO_SMOOTHING_TIME an. Daher
+    lässt er sich für jeden Zeitpunkt berechnen, ohne abzufragen.
+    """
+
+    __slots__ = ("raw", "value", "time")
+
+    def __init__(self, raw, now):
+        self.raw = raw
+        self.value = raw
+        self.time = now
+
+    def add(self, raw, now) -> None:
+        self.value = self.at(now)
+        self.raw = raw
+        self.time = now
+
+    def at(self, now) -> float:
+        return self.raw + (self.value - self.raw) * math.exp(-(now - self.time) / AUTO_SMOOTHING_TIME)
+
+    def crossing(self, limit, now):
+        """Zeitpunkt, an dem der geglättete Wert `limit` erreicht, oder None."""
+        current = self.at(now)
+        if (current - limit) * (self.raw - limit) >= 0:
+            # Grenze liegt nicht zwischen aktuellem Wert und Rohwert
+            return None
+        return (
+            self.time
+            + AUTO_SMOOTHING_TIME * math.log((self.value - self.raw) / (limit - self.raw))
+            + CROSSING_MARGIN
+        )
+
+
+class FaberAutoController:
+    """Bildet geglättete Luftwerte auf Lüfterstufen ab.
+
+    Jede Sensorart fordert über ihre Schwellen eine Stufe von 1 bis 3, die
+    höchste Forderung gewinnt. Zurückgeschaltet wird erst, wenn der Wert um
+    AUTO_HYSTERESIS unter die Schwelle der aktuellen Stufe gefallen ist.
+    Eine neue Stufe wird frühestens nach AUTO_MIN_DWELL Sekunden gewählt,
+    und innerhalb einer Minute werden höchstens AUTO_MAX_PULSES_PER_MINUTE
+    Pulse geplant.
+
+    `decide` liefert neben dem Ziel den Zeitpunkt, zu dem sich die
+    Entscheidung ohne neue Messung ändern kann (Glättung erreicht eine
+    Schwelle, Verweildauer oder Pulsfenster laufen ab). Der Aufrufer plant
+    dafür einen einzelnen Timer, statt die Sensoren abzufragen.
+    """
+
+    def __init__(self, sensors):
+        self.sensors = dict(sensors)
+        self._values = {}
+        self._pulses = deque()
+        self._changed_at = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sensors)
+
+    def reset(self) -> None:
+        """Vergisst Messwerte und Sperren (beim Aktivieren der Automatik)."""
+        self._values.clear()
+        self._changed_at = None
+
+    def add_sample(self, entity_id, value, now) -> None:
+        smoothed = self._values.get(entity_id)
+        if smoothed is None:
+            self._values[entity_id] = _SmoothedValue(value, now)
+        else:
+            smoothed.add(value, now)
+
+    def values(self, now):
+        """Aktuelle geglättete Werte je Sensor (für Diagnose)."""
+        return {entity_id: round(smoothed.at(now), 2) for entity_id, smoothed in self._values.items()}
+
+    def demand(self, current, now) -> int:
+        """Geforderte Stufe aller Sensoren mit Hysterese gegenüber `current`."""
+        level = 1
+        for entity_id, smoothed in self._values.items():
+            value = smoothed.at(now)
+            for step, limit in self._limits(entity_id, current):
+                if value >= limit:
+                    level = max(level, step)
+        return level
+
+    def decide(self, current, now):
+        """Liefert (Zielstufe oder None, Zeitpunkt der nächsten Prüfung oder None)."""
+        target = self.demand(current, now)
+        if target == current:
+            return None, self._next_crossing(current, now)
+
+        if self._changed_at is not None and now < self._changed_at + AUTO_MIN_DWELL:
+            return None, self._changed_at + AUTO_MIN_DWELL
+
+        # Ein Wechsel über mehr Pulse als erlaubt wartet auf ein leeres Fenster
+        needed = min(abs(target - current), AUTO_MAX_PULSES_PER_MINUTE)
+        excess = needed - self.pulse_budget(now)
+        if excess > 0:
+            return None, self._pulses[excess - 1] + PULSE_WINDOW
+        return target, None
+
+    def pulse_budget(self, now) -> int:
+        """Pulse, die im aktuellen Fenster noch gesendet werden dürfen."""
+        while self._pulses and self._pulses[0] <= now - PULSE_WINDOW:
+            self._pulses.popleft()
+        return AUTO_MAX_PULSES_PER_MINUTE - len(self._pulses)
+
+    def record(self, pulses, now) -> None:
+        """Merkt sich einen ausgeführten Stufenwechsel der Automatik."""
+        self._pulses.extend([now] * pulses)
+        self._changed_at = now
+
+    def _limits(self, entity_id, current):
+        thresholds = AUTO_THRESHOLDS[self.sensors[entity_id]]
+        for step, threshold in enumerate(thresholds, start=2):
+            # Auf einer bereits erreichten Stufe gilt die abgesenkte Schwelle
+            yield step, threshold * (1 - AUTO_HYSTERESIS) if current >= step else threshold
+
+    def _next_crossing(self, current, now):
+        next_check = None
+        for entity_id, smoothed in self._values.items():
+            for _step, limit in self._limits(entity_id, current):
+                crossing = smoothed.crossing(limit, now)
+                if crossing is not None and (next_check is None or crossing < next_check):
+                    next_check = crossing
+        return next_check
@@ -4,11 +4,11 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN, CONF_REMOTE_ENTITY
+from .const import DOMAIN
+from .entity import FaberEntity
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -16,61 +16,59 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Adds the binary sensor."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    config = data["config"]
-    runtime_data = data["runtime_data"]
-    name = config.get("name", "Faber Skypad")
-    remote_entity = config[CONF_REMOTE_ENTITY]
+    runtime_data = hass.data[DOMAIN][config_entry.entry_id]["runtime_data"]
 
-    async_add_entities([FaberRunOnActiveSensor(name, config_entry.entry_id, remote_entity, runtime_data)])
+    async_add_entities([
+        FaberRunOnActiveSensor(runtime_data),
+        FaberBoostActiveSensor(runtime_data),
+    ])
 
-class FaberRunOnActiveSensor(BinarySensorEntity):
+class FaberRunOnActiveSensor(FaberEntity, BinarySensorEntity):
     """Indicates whether the timer is currently active."""
 
     _attr_translation_key = "timer_active"
     _attr_has_entity_name = True
+    _attr_device_class = BinarySensorDeviceClass.RUNNING
 
-    def __init__(self, name, entry_id, remote_entity, runtime_data):
-        self._base_name = name
-        self._entry_id = entry_id
-        self._remote_entity = remote_entity
-        self._runtime_data = runtime_data
-        
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._entry_id)},
-            name=self._base_name,
-            manufacturer="Faber",
-            model="Skypad",
-        )
-
-    @property
-    def unique_id(self):
-        return f"{self._entry_id}_run_on_active_sensor"
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "run_on_active_sensor")
 
     @property
     def is_on(self):
         """Returns True if the timer is active."""
         return self._runtime_data.run_on_active
 
-    @property
-    def device_class(self):
-        return BinarySensorDeviceClass.RUNNING
-
     @property
     def icon(self):
         return "mdi:timer-outline" if self.is_on else "mdi:timer-off-outline"
 
     async def async_added_to_hass(self):
         """Registers the listener for updates."""
-        self._runtime_data.register_listener(self._handle_update)
+        self.async_on_remove(
+            self._runtime_data.coordinator.async_add_listener(self.async_write_ha_state_if_changed)
+        )
+
+class FaberBoostActiveSensor(FaberEntity, BinarySensorEntity):
+    """Indicates whether the boost timer is currently running."""
+
+    _attr_translation_key = "boost_active"
+    _attr_has_entity_name = True
+    _attr_device_class = BinarySensorDeviceClass.RUNNING
 
-    async def async_will_remove_from_hass(self):
-        """Removes the listener."""
-        self._runtime_data.unregister_listener(self._handle_update)
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "boost_active_sensor")
 
-    @callback
-    def _handle_update(self):
-        """Is called when the runtime data changes."""
-        self.async_write_ha_state()
\ No newline at end of file
+    @property
+    def is_on(self):
+        """Returns True if the boost is active."""
+        return self._runtime_data.boost_active
+
+    @property
+    def icon(self):
+        return "mdi:fan-plus" if self.is_on else "mdi:fan"
+
+    async def async_added_to_hass(self):
+        """Registers the listener for updates."""
+        self.async_on_remove(
+            self._runtime_data.coordinator.async_add_listener(self.async_write_ha_state_if_changed)
+        )
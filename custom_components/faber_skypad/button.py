@@ -3,9 +3,9 @@ from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN, CONF_REMOTE_ENTITY
+from .const import DOMAIN
+from .entity import FaberEntity
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -13,38 +13,57 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Adds the button."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    config = data["config"]
-    runtime_data = data["runtime_data"]
-    name = config.get("name", "Faber Skypad")
-    remote_entity = config[CONF_REMOTE_ENTITY]
+    runtime_data = hass.data[DOMAIN][config_entry.entry_id]["runtime_data"]
 
-    async_add_entities([FaberCalibrationButton(name, config_entry.entry_id, remote_entity, runtime_data)])
+    async_add_entities([
+        FaberCalibrationButton(runtime_data),
+        FaberCancelCalibrationButton(runtime_data),
+        FaberRepairCalibrationButton(runtime_data),
+    ])
 
-class FaberCalibrationButton(ButtonEntity):
+class FaberCalibrationButton(FaberEntity, ButtonEntity):
     """Button to start the calibration process."""
     
     _attr_translation_key = "start_calibration"
     _attr_has_entity_name = True
+    _attr_icon = "mdi:auto-fix"
 
-    def __init__(self, name, entry_id, remote_entity, runtime_data):
-        self._base_name = name
-        self._entry_id = entry_id
-        self._remote_entity = remote_entity
-        self._runtime_data = runtime_data
-        self._attr_unique_id = f"{entry_id}_calibration_button"
-        self._attr_icon = "mdi:auto-fix"
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._entry_id)},
-            name=self._base_name,
-            manufacturer="Faber",
-            model="Skypad",
-        )
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "calibration_button")
 
     async def async_press(self) -> None:
         """Executes the calibration process."""
         if self._runtime_data.fan_entity:
-            await self._runtime_data.fan_entity.async_start_calibration()
\ No newline at end of file
+            await self._runtime_data.fan_entity.async_start_calibration()
+
+
+class FaberCancelCalibrationButton(FaberEntity, ButtonEntity):
+    """Button to abort a running calibration."""
+
+    _attr_translation_key = "cancel_calibration"
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:cancel"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "cancel_calibration_button")
+
+    async def async_press(self) -> None:
+        """Aborts the calibration process."""
+        if self._runtime_data.fan_entity:
+            await self._runtime_data.fan_entity.async_cancel_calibration()
+
+
+class FaberRepairCalibrationButton(FaberEntity, ButtonEntity):
+    """Button to re-measure only the inconsistent calibration levels."""
+
+    _attr_translation_key = "repair_calibration"
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:auto-fix"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "repair_calibration_button")
+
+    async def async_press(self) -> None:
+        """Re-measures the levels that look inconsistent."""
+        if self._runtime_data.fan_entity:
+            await self._runtime_data.fan_entity.async_repair_calibration()
\ No newline at end of file
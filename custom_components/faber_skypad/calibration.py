@@ -0,0 +1,186 @@
+"""Hilfsklassen für die Kalibrierung der Faber Skypad."""
+import time
+from statistics import fmean, pstdev
+
+from .const import (
+    COMMAND_POWER,
+    COMMAND_INCREASE,
+    COMMAND_BOOST,
+    COMMAND_LIGHT,
+    CALIBRATION_WAIT_TIME,
+    CALIBRATION_OFF_WAIT_TIME,
+    CALIBRATION_MIN_SETTLE_TIME,
+    CALIBRATION_SETTLE_SAMPLES,
+    CALIBRATION_SETTLE_STD,
+    CALIBRATION_SETTLE_RATIO,
+)
+
+# Ablauf der Kalibrierung: (Modus, Befehl vor der Messung, maximale Messdauer).
+# Die Haube ist vor dem ersten Schritt aus und nach dem letzten Schritt im Boost.
+# Der Schritt "light" schaltet nur das Licht um und misst dessen Mehrverbrauch.
+CALIBRATION_STEPS = (
+    ("off", None, CALIBRATION_OFF_WAIT_TIME),
+    ("light", COMMAND_LIGHT, CALIBRATION_OFF_WAIT_TIME),
+    (1, COMMAND_POWER, CALIBRATION_WAIT_TIME),
+    (2, COMMAND_INCREASE, CALIBRATION_WAIT_TIME),
+    (3, COMMAND_INCREASE, CALIBRATION_WAIT_TIME),
+    ("boost", COMMAND_BOOST, CALIBRATION_WAIT_TIME),
+)
+CALIBRATION_MODES = tuple(mode for mode, _command, _timeout in CALIBRATION_STEPS)
+# Stufen des Motors in aufsteigender Leistung (ohne Licht)
+PROFILE_MODES = tuple(mode for mode in CALIBRATION_MODES if mode != "light")
+
+# Zustände der Kalibrierung
+STATE_IDLE = "idle"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+# Abgeschlossen, aber einzelne Stufen nur bis zum Zeitlimit gemessen
+STATE_UNSETTLED = "unsettled"
+STATE_CANCELLED = "cancelled"
+STATE_FAILED = "failed"
+
+
+class FaberLevelSampler:
+    """Sammelt die Messwerte einer Kalibrierungsstufe.
+
+    Messwerte aus den ersten CALIBRATION_MIN_SETTLE_TIME Sekunden nach dem
+    Befehl (`started`) gehören zur Anlauframpe und werden verworfen. Eine
+    Stufe gilt als eingeschwungen, sobald die letzten Messwerte nur noch
+    gering streuen und keinen Trend mehr zeigen: Die Mittelwerte der beiden
+    Fensterhälften dürfen höchstens um die halbe Streugrenze auseinander
+    liegen, sonst ist das Ende einer langsamen Rampe noch im Fenster. Das
+    Ergebnis (Mittelwert, Standardabweichung, Anzahl) wird aus diesem
+    Fenster berechnet.
+    """
+
+    def __init__(self, started, min_settle_time=CALIBRATION_MIN_SETTLE_TIME, settle_samples=CALIBRATION_SETTLE_SAMPLES):
+        self._ramp_end = started + min_settle_time
+        self._settle_samples = settle_samples
+        self.samples = []
+
+    def add(self, value: float, now: float) -> bool:
+        """Nimmt einen Messwert auf und meldet, ob die Stufe eingeschwungen ist."""
+        if now < self._ramp_end:
+            return False
+        self.samples.append(value)
+        return self.is_settled
+
+    @property
+    def is_settled(self) -> bool:
+        window = self.samples[-self._settle_samples:]
+        if len(window) < self._settle_samples:
+            return False
+        limit = _settle_limit(fmean(window))
+        half = len(window) // 2
+        trend = abs(fmean(window[half:]) - fmean(window[:half]))
+        return pstdev(window) <= limit and trend <= limit / 2
+
+    def result(self):
+        """Liefert die Statistik des eingeschwungenen Fensters (oder aller Werte)."""
+        window = self.samples[-self._settle_samples:]
+        if not window:
+            return {"mean": 0.0, "std": 0.0, "count": 0, "settled": False}
+        return {
+            "mean": fmean(window),
+            "std": pstdev(window),
+            "count": len(window),
+            "settled": self.is_settled,
+        }
+
+
+class FaberCalibrationProgress:
+    """Fortschritt der laufenden Kalibrierung für Sensoren und Attribute."""
+
+    def __init__(self):
+        self.state = STATE_IDLE
+        self.step = None
+        self._step_index = 0
+        self._step_count = 0
+        self._started = None
+        self._step_started = None
+        self._finished = None
+        self._remaining_timeouts = []
+
+    def start(self, step_timeouts):
+        """Beginnt einen neuen Lauf mit den maximalen Dauern der Schritte."""
+        self.state = STATE_RUNNING
+        self.step = None
+        self._step_index = 0
+        self._step_count = len(step_timeouts)
+        self._started = time.monotonic()
+        self._step_started = self._started
+        self._finished = None
+        self._remaining_timeouts = list(step_timeouts)
+
+    def advance(self, step):
+        """Meldet den Beginn des nächsten Schritts."""
+        if self.step is not None:
+            self._step_index += 1
+            self._remaining_timeouts.pop(0)
+        self.step = step
+        self._step_started = time.monotonic()
+
+    def finish(self, state):
+        self.state = state
+        self.step = None
+        self._finished = time.monotonic()
+        if state == STATE_DONE:
+            self._step_index = self._step_count
+        self._remaining_timeouts = []
+
+    @property
+    def is_running(self) -> bool:
+        return self.state == STATE_RUNNING
+
+    @property
+    def percent(self) -> int:
+        if not self._step_count:
+            return 0
+        return round(100 * self._step_index / self._step_count)
+
+    @property
+    def elapsed(self):
+        if self._started is None:
+            return None
+        end = self._finished if self._finished is not None else time.monotonic()
+        return round(end - self._started, 1)
+
+    @property
+    def eta(self):
+        """Geschätzte Restdauer in Sekunden (obere Schranke aus den Timeouts)."""
+        if not self.is_running:
+            return None
+        in_step = time.monotonic() - self._step_started
+        return round(max(sum(self._remaining_timeouts) - in_step, 0), 1)
+
+
+def step_timeout(timeout: float, sample_interval) -> float:
+    """Messdauer eines Schritts, die auch bei langsamem Sensor ein volles Fenster erlaubt."""
+    needed = CALIBRATION_MIN_SETTLE_TIME + 2 * CALIBRATION_SETTLE_SAMPLES * (sample_interval or 0.0)
+    return max(timeout, needed)
+
+
+def inconsistent_levels(power_profile, power_stats):
+    """Liefert die Stufen, deren Messung unplausibel aussieht.
+
+    Unplausibel sind fehlende Werte, Stufen, die nur bis zum Zeitlimit
+    gemessen wurden (nicht eingeschwungen), und Stufen, die die aufsteigende
+    Reihenfolge off < 1 < 2 < 3 < boost verletzen. Das Licht wird nur auf
+    eine vorhandene, eingeschwungene Messung geprüft.
+    """
+    inconsistent = set()
+    for mode in CALIBRATION_MODES:
+        if mode not in ("off", "light") and not power_profile.get(mode):
+            inconsistent.add(mode)
+        stats = power_stats.get(mode)
+        if not stats or not stats.get("settled", True):
+            inconsistent.add(mode)
+
+    for lower, higher in zip(PROFILE_MODES, PROFILE_MODES[1:]):
+        if power_profile.get(higher, 0) <= power_profile.get(lower, 0):
+            inconsistent.update((lower, higher))
+    return inconsistent
+
+
+def _settle_limit(mean: float) -> float:
+    return max(CALIBRATION_SETTLE_STD, mean * CALIBRATION_SETTLE_RATIO)
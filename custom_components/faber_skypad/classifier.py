@@ -0,0 +1,242 @@
+"""Streaming-Klassifikator für die Leistungsmessung der Faber Skypad."""
+from bisect import bisect_left
+from collections import deque
+from statistics import median
+from typing import Optional
+
+from .const import (
+    MATCH_TOLERANCE,
+    LIGHT_MIN_OFFSET,
+    LIGHT_DWELL_TIME,
+    MIN_MATCH_TOLERANCE,
+    CALIBRATION_TOLERANCE_SIGMA,
+    FALLBACK_THRESHOLD,
+    CLASSIFIER_WINDOW,
+    CLASSIFIER_HYSTERESIS,
+    DEFAULT_DWELL_TIME,
+)
+
+
+class FaberPowerClassifier:
+    """Ordnet Leistungswerte einem Modus ("off", 1, 2, 3, "boost") zu.
+
+    Die Rohwerte laufen durch einen Ringpuffer mit Median-Filter. Ein Wechsel
+    des Modus wird erst gemeldet, wenn der neue Modus die Hysterese-Schwelle
+    überschreitet und für die Verweilzeit stabil bleibt. Die Verweilzeit
+    zählt ab dem ersten Rohwert beim neuen Modus, damit sich die
+    Verzögerung des Medians nicht zu ihr addiert.
+
+    Das Profil wird einmalig in sortierte Entscheidungsgrenzen übersetzt
+    (`compile`), sodass jeder Messwert mit einem einzigen `bisect`
+    zugeordnet wird. Nach jeder Änderung am Profil muss `compile` erneut
+    aufgerufen werden.
+
+    Ist der Licht-Offset gelernt, wird jede Stufe zusätzlich mit Licht
+    (Stufe + Offset) eingetragen. Erkannt wird dann ein Zustand
+    (Modus, Licht); ohne Offset ist das Licht None. Die Lichtbänder liegen
+    zwischen den Stufen, daher zählt bei einem Stufenwechsel nur der Modus
+    und das Licht bleibt unverändert. Ein Lichtwechsel wird nur bei
+    gleichbleibendem Modus und ohne wartenden Stufenwechsel angenommen und
+    braucht die längere Verweilzeit LIGHT_DWELL_TIME.
+    """
+
+    def __init__(
+        self,
+        power_profile,
+        dwell_time=DEFAULT_DWELL_TIME,
+        power_stats=None,
+        window=CLASSIFIER_WINDOW,
+        light_offset=0.0,
+    ):
+        self._profile = power_profile
+        self._stats = power_stats if power_stats is not None else {}
+        self._dwell_time = dwell_time
+        self._light_dwell_time = max(dwell_time, LIGHT_DWELL_TIME)
+        self._samples = deque(maxlen=window)
+        self._sample_times = deque(maxlen=window)
+        self.light_offset = light_offset
+        self.state = None
+        self._candidate = None
+        self._candidate_since = None
+        self._boundaries = []
+        self._states = []
+        self._watts = []
+        self._tolerances = []
+        self._state_watts = {}
+        self._hysteresis = {}
+        self.compile()
+
+    @property
+    def mode(self):
+        return self.state[0] if self.state is not None else None
+
+    @property
+    def light(self):
+        return self.state[1] if self.state is not None else None
+
+    def compile(self) -> None:
+        """Übersetzt das Profil in sortierte Grenzen und Toleranzbänder."""
+        if self._profile[1] == 0:
+            # Fallback ohne Kalibrierung: eine feste Schwelle über der Baseline
+            threshold = self._profile["off"] + FALLBACK_THRESHOLD
+            self._boundaries = [threshold]
+            self._states = [("off", None), (1, None)]
+            self._watts = [threshold, threshold]
+            self._tolerances = [float("inf"), float("inf")]
+            self._state_watts = {}
+            margin = FALLBACK_THRESHOLD * CLASSIFIER_HYSTERESIS
+            self._hysteresis = {("off", None): threshold - margin, (1, None): threshold + margin}
+            return
+
+        levels = [
+            (watt, mode)
+            for mode, watt in self._profile.items()
+            if watt != 0 or mode == "off"
+        ]
+        if self.light_offset >= LIGHT_MIN_OFFSET:
+            entries = [(watt, (mode, False)) for watt, mode in levels]
+            entries += [(watt + self.light_offset, (mode, True)) for watt, mode in levels]
+        else:
+            entries = [(watt, (mode, None)) for watt, mode in levels]
+        entries.sort(key=lambda entry: entry[0])
+
+        self._states = [state for _watt, state in entries]
+        self._watts = [watt for watt, _state in entries]
+        self._state_watts = dict(zip(self._states, self._watts))
+        self._boundaries = [
+            (low + high) / 2 for low, high in zip(self._watts, self._watts[1:])
+        ]
+        # "off" (ohne Licht) wird immer akzeptiert, alle anderen nur innerhalb der Toleranz
+        self._tolerances = [
+            float("inf") if state[0] == "off" and not state[1] else self._tolerance_for(state[0])
+            for state in self._states
+        ]
+        self._hysteresis = {}
+
+    def _tolerance_for(self, mode) -> float:
+        """Toleranz aus der gemessenen Streuung, sonst der globale Standardwert."""
+        stats = self._stats.get(mode)
+        if not stats or not stats.get("count"):
+            return MATCH_TOLERANCE
+        return max(MIN_MATCH_TOLERANCE, stats["std"] * CALIBRATION_TOLERANCE_SIGMA)
+
+    @property
+    def dwell_time(self) -> float:
+        return self._dwell_time
+
+    @property
+    def light_dwell_time(self) -> float:
+        return self._light_dwell_time
+
+    @property
+    def settle_samples(self) -> int:
+        """Neue Messwerte, bis der Median einen Wechsel vollständig widerspiegelt."""
+        return self._samples.maxlen // 2 + 1
+
+    @property
+    def pending_deadline(self) -> Optional[float]:
+        """Zeitpunkt, an dem der aktuelle Kandidat übernommen werden kann."""
+        if self._candidate is None:
+            return None
+        if self.state is not None and self._candidate[0] == self.state[0]:
+            return self._candidate_since + self._light_dwell_time
+        return self._candidate_since + self._dwell_time
+
+    def reset(self) -> None:
+        """Verwirft Puffer und Zustand und übersetzt das Profil neu (z.B. nach einer Kalibrierung)."""
+        self._samples.clear()
+        self._sample_times.clear()
+        self.state = None
+        self._candidate = None
+        self._candidate_since = None
+        self.compile()
+
+    def match(self, power: float):
+        """Liefert (Zustand, Abstand) für einen Wert ohne Filter und Hysterese.
+
+        Der Zustand ist None, wenn der Wert außerhalb der Toleranz liegt.
+        """
+        index = bisect_left(self._boundaries, power)
+        diff = abs(power - self._watts[index])
+        if diff > self._tolerances[index]:
+            return None, diff
+        return self._states[index], diff
+
+    def add_sample(self, power: float, now: float):
+        """Nimmt einen Messwert auf und liefert einen neu übernommenen Zustand oder None."""
+        self._samples.append(power)
+        self._sample_times.append(now)
+        filtered = median(self._samples)
+
+        candidate, _diff = self.match(filtered)
+        if candidate is not None and self.state is not None and candidate != self.state:
+            if not self._exceeds_hysteresis(filtered, candidate):
+                candidate = self.state
+            elif candidate[0] != self.state[0]:
+                # Stufenwechsel: die Rampe läuft durch die Lichtbänder, das Licht bleibt
+                candidate = (candidate[0], self.state[1])
+            elif self._candidate is not None and self._candidate[0] != self.state[0]:
+                # Lichtwechsel während eines wartenden Stufenwechsels verwerfen
+                candidate = self.state
+
+        if candidate is None or candidate == self.state:
+            self._candidate = None
+            self._candidate_since = None
+            return None
+
+        if candidate != self._candidate:
+            self._candidate = candidate
+            self._candidate_since = self._onset(candidate, now)
+        return self.poll(now)
+
+    def poll(self, now: float):
+        """Übernimmt den Kandidaten, sobald die Verweilzeit abgelaufen ist."""
+        deadline = self.pending_deadline
+        if deadline is None or now < deadline:
+            return None
+        if not self._raw_matches(self._samples[-1], self._candidate):
+            # Der Median hinkt nach: ein kürzerer Sprung ist schon wieder vorbei
+            return None
+        self.state = self._candidate
+        self._candidate = None
+        self._candidate_since = None
+        return self.state
+
+    def _onset(self, candidate, now: float) -> float:
+        """Zeitpunkt des ersten Rohwerts der laufenden Folge, die zum Kandidaten passt.
+
+        Der Median zeigt einen Wechsel erst nach `settle_samples` neuen Werten.
+        Die Verweilzeit eines Stufenwechsels zählt ab dem ersten davon, damit
+        sich Median und Verweilzeit nicht addieren. Ein Lichtwechsel zählt
+        erst ab dem Median: Seine Rohwerte können noch von einer Rampe durch
+        das Lichtband stammen.
+        """
+        if self.state is not None and candidate[0] == self.state[0]:
+            return now
+        onset = now
+        for power, sampled_at in zip(reversed(self._samples), reversed(self._sample_times)):
+            if not self._raw_matches(power, candidate):
+                break
+            onset = sampled_at
+        return onset
+
+    def _raw_matches(self, power: float, candidate) -> bool:
+        """Liegt ein einzelner Rohwert beim Kandidaten (bei einem Stufenwechsel nur der Modus)?"""
+        state, _diff = self.match(power)
+        if state is None:
+            return False
+        if self.state is None or candidate[0] != self.state[0]:
+            return state[0] == candidate[0]
+        return state == candidate
+
+    def _exceeds_hysteresis(self, power: float, candidate) -> bool:
+        """Prüft, ob der Wert deutlich genug beim neuen Zustand liegt."""
+        if self._hysteresis:
+            # Fallback: Schwelle um einen Teil des Schwellwerts verschoben
+            limit = self._hysteresis[candidate]
+            return power < limit if candidate[0] == "off" else power > limit
+
+        current_watt = self._state_watts.get(self.state, 0.0)
+        candidate_watt = self._state_watts[candidate]
+        gap = abs(candidate_watt - current_watt)
+        return abs(power - current_watt) - abs(power - candidate_watt) >= gap * CLASSIFIER_HYSTERESIS
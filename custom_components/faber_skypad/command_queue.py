@@ -0,0 +1,216 @@
+"""Serialisierte IR-Befehlswarteschlange für Faber Skypad."""
+import asyncio
+import logging
+import time
+from typing import Callable, Iterable, List, Optional, Union
+
+from homeassistant.core import HomeAssistant
+
+from .const import CMD_HOLD_SECS
+from .pacing import FaberPacingEngine
+from .scheduler import FaberTransmitScheduler
+from .commands import FaberCommandSet, DEFAULT_COMMAND_SET
+from .metrics import (
+    FaberMetrics,
+    METRIC_INTENTS,
+    METRIC_SUPERSEDED,
+    METRIC_PULSES_SAVED,
+    METRIC_PULSES,
+    METRIC_PULSES_PER_INTENT,
+    METRIC_QUEUE_WAIT,
+    METRIC_SERVICE_CALLS,
+    METRIC_SERVICE_ERRORS,
+    METRIC_SERVICE_LATENCY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Schlüssel für Absichten, die sich gegenseitig ersetzen
+INTENT_SPEED = "speed"
+
+CommandPlan = Union[Iterable[str], Callable[[], Iterable[str]]]
+
+
+class FaberCommandQueue:
+    """Serialisiert alle IR-Befehle eines Config-Entries.
+
+    Jede Absicht (Intent) wird exklusiv abgearbeitet. Absichten mit gleichem
+    Schlüssel ersetzen sich: Eine neuere Absicht verwirft noch wartende
+    ältere und bricht eine laufende an der nächsten Pulsgrenze ab. Der Plan
+    wird erst bei Ausführung berechnet, sodass eine Folge von Slider-Bewegungen
+    nur die minimal nötigen Pulse zum letzten Ziel sendet.
+
+    Im Batch-Modus wird eine ganze Pulsfolge in einem einzigen
+    `remote.send_command` Aufruf gesendet; die Abstände übernimmt die Remote
+    über `delay_secs`. Der Abstand zwischen den Pulsen kommt aus der
+    adaptiven Taktung (`pacing`).
+
+    Befehle werden als logische Namen (z.B. "power") eingereiht und erst
+    beim Senden über die vorformatierte Code-Tabelle (`commands`) übersetzt.
+
+    Gesendet wird nur im Sendefenster des Schedulers der Remote, den sich
+    alle Config-Entries mit demselben IR-Sender teilen. Das Fenster umfasst
+    die Pulsfolge und den anschließenden Abstand.
+
+    `pulses_saved` zählt die Pulse, die durch ersetzte Absichten nicht
+    gesendet werden mussten (bei erst zur Ausführung geplanten Absichten nur
+    die nach einem Abbruch an der Pulsgrenze verbliebenen).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        remote_entity: str,
+        batch: bool = True,
+        pacing: Optional[FaberPacingEngine] = None,
+        scheduler: Optional[FaberTransmitScheduler] = None,
+        commands: Optional[FaberCommandSet] = None,
+        metrics: Optional[FaberMetrics] = None,
+    ):
+        self.hass = hass
+        self._remote_entity = remote_entity
+        self._batch = batch
+        self.pacing = pacing if pacing is not None else FaberPacingEngine()
+        self.scheduler = scheduler if scheduler is not None else FaberTransmitScheduler(remote_entity)
+        self.commands = commands if commands is not None else FaberCommandSet(DEFAULT_COMMAND_SET)
+        self.metrics = metrics if metrics is not None else FaberMetrics()
+        self._submitted = None
+        self._lock = asyncio.Lock()
+        self._generations = {}
+        self._closed = False
+        self.pulses_saved = 0
+
+    def supersede(self, key: str) -> int:
+        """Verwirft alle wartenden und laufenden Absichten mit diesem Schlüssel.
+
+        Liefert die neue Generation, mit der die überholende Absicht später
+        gesendet werden kann.
+        """
+        self._generations[key] = self._generations.get(key, 0) + 1
+        return self._generations[key]
+
+    def generation(self, key: str) -> int:
+        """Aktuelle Generation eines Schlüssels (ohne ältere Absichten zu verwerfen)."""
+        return self._generations.setdefault(key, 0)
+
+    def is_current(self, key: str, generation: int) -> bool:
+        """False, wenn eine Absicht dieser Generation inzwischen ersetzt wurde."""
+        return self._is_current(key, generation)
+
+    def shutdown(self) -> None:
+        """Verwirft alle noch nicht gesendeten Befehle (z.B. beim Entladen)."""
+        self._closed = True
+        for key in self._generations:
+            self._generations[key] += 1
+
+    def _is_current(self, key: Optional[str], generation: Optional[int]) -> bool:
+        if self._closed:
+            return False
+        return key is None or self._generations.get(key) == generation
+
+    async def async_submit(
+        self,
+        plan: CommandPlan,
+        key: Optional[str] = None,
+        on_pulse: Optional[Callable[[List[str]], None]] = None,
+        prefix: Iterable[str] = (),
+        priority: bool = False,
+        generation: Optional[int] = None,
+    ) -> bool:
+        """Reiht eine Absicht ein und wartet auf ihre Ausführung.
+
+        `plan` ist eine Befehlsliste oder eine Funktion, die die Liste erst bei
+        Ausführung liefert. `prefix` wird immer gesendet, auch wenn die Absicht
+        ersetzt wurde (z.B. der Einschaltpuls). `on_pulse` wird nach jedem
+        Aufruf der Remote einmal mit den darin gesendeten Befehlen aufgerufen
+        (im Batch-Modus also mit der ganzen Folge). `priority` zieht die Befehle
+        im Scheduler der Remote vor (Ausschalten). `generation` übernimmt eine
+        beim Überholen (`supersede`) gezogene Generation, statt erneut zu
+        überholen. Gibt False zurück, wenn die Absicht ersetzt wurde.
+        """
+        if key is not None and generation is None:
+            generation = self.supersede(key)
+        prefix = list(prefix)
+        submitted = time.monotonic() if self.metrics.enabled else None
+        self.metrics.inc(METRIC_INTENTS)
+
+        async with self._lock:
+            current = self._is_current(key, generation)
+            if not current:
+                _LOGGER.debug("Absicht '%s' wurde vor dem Senden ersetzt", key)
+                self.metrics.inc(METRIC_SUPERSEDED)
+                if not callable(plan):
+                    self._count_saved(len(list(plan)))
+                if not prefix or self._closed:
+                    return False
+                commands = prefix
+            else:
+                commands = prefix + list(plan() if callable(plan) else plan)
+
+            if not commands:
+                return current
+
+            self._submitted = submitted
+            self.metrics.observe(METRIC_PULSES_PER_INTENT, len(commands))
+            self.pacing.on_burst(len(commands))
+            if self._batch and len(commands) > 1:
+                await self._async_transmit(commands, on_pulse, priority)
+                return current
+
+            for index, command in enumerate(commands):
+                if index >= len(prefix) and not self._is_current(key, generation):
+                    _LOGGER.debug("Absicht '%s' an Pulsgrenze abgebrochen", key)
+                    self.metrics.inc(METRIC_SUPERSEDED)
+                    self._count_saved(len(commands) - index)
+                    return False
+                await self._async_transmit([command], on_pulse, priority)
+        return current
+
+    def _count_saved(self, pulses: int) -> None:
+        self.pulses_saved += pulses
+        self.metrics.inc(METRIC_PULSES_SAVED, pulses)
+
+    async def _async_transmit(self, commands, on_pulse, priority) -> None:
+        """Sendet eine Pulsfolge im Sendefenster der Remote inklusive Abstand."""
+        await self.scheduler.async_acquire(self, priority)
+        if self._submitted is not None:
+            # Wartezeit vom Einreihen bis zum ersten Sendefenster
+            self.metrics.observe(METRIC_QUEUE_WAIT, (time.monotonic() - self._submitted) * 1000)
+            self._submitted = None
+        self.metrics.inc(METRIC_PULSES, len(commands))
+        try:
+            await self._async_send_raw(commands)
+            if on_pulse is not None:
+                on_pulse(commands)
+            await asyncio.sleep(self.pacing.delay)
+        finally:
+            self.scheduler.release()
+
+    async def _async_send_raw(self, commands: List[str]) -> None:
+        """Sendet eine Pulsfolge in einem Aufruf an die Remote mit Hold-Zeit."""
+        data = {
+            "entity_id": self._remote_entity,
+            "command": self.commands.resolve(commands),
+            "hold_secs": CMD_HOLD_SECS,
+        }
+        if self.commands.device:
+            data["device"] = self.commands.device
+        if len(commands) > 1:
+            # Abstand zwischen den Pulsen übernimmt die Remote selbst
+            data["delay_secs"] = self.pacing.delay
+            data["num_repeats"] = 1
+
+        _LOGGER.debug("Sende %s Befehl(e) an %s", len(commands), self._remote_entity)
+        if not self.metrics.enabled:
+            await self.hass.services.async_call("remote", "send_command", data, blocking=True)
+            return
+
+        started = time.monotonic()
+        self.metrics.inc(METRIC_SERVICE_CALLS)
+        try:
+            await self.hass.services.async_call("remote", "send_command", data, blocking=True)
+        except Exception:
+            self.metrics.inc(METRIC_SERVICE_ERRORS)
+            raise
+        finally:
+            self.metrics.observe(METRIC_SERVICE_LATENCY, (time.monotonic() - started) * 1000)
@@ -0,0 +1,85 @@
+"""Befehlssätze (IR-Codes) der Faber Skypad."""
+import base64
+import binascii
+import json
+from typing import Dict, List, Optional
+
+from .const import (
+    COMMAND_POWER,
+    COMMAND_INCREASE,
+    COMMAND_DECREASE,
+    COMMAND_BOOST,
+    COMMAND_LIGHT,
+    CMD_TURN_ON_OFF,
+    CMD_INCREASE,
+    CMD_DECREASE,
+    CMD_BOOST,
+    CMD_LIGHT,
+)
+
+COMMAND_KEYS = (COMMAND_POWER, COMMAND_INCREASE, COMMAND_DECREASE, COMMAND_BOOST, COMMAND_LIGHT)
+
+# Broadlink Codes der Faber Skypad (Standard, wenn nichts anderes konfiguriert ist)
+DEFAULT_COMMAND_SET = {
+    COMMAND_POWER: CMD_TURN_ON_OFF,
+    COMMAND_INCREASE: CMD_INCREASE,
+    COMMAND_DECREASE: CMD_DECREASE,
+    COMMAND_BOOST: CMD_BOOST,
+    COMMAND_LIGHT: CMD_LIGHT,
+}
+
+
+class FaberCommandSet:
+    """Code-Tabelle eines Config-Entries.
+
+    Die Codes werden einmalig beim Setup geprüft und in das Format von
+    `remote.send_command` gebracht, sodass beim Senden nur noch
+    nachgeschlagen wird. Unterstützt werden:
+
+    * Base64-Codes (Broadlink), mit oder ohne `b64:` Präfix
+    * Namen von Befehlen, die die Remote selbst gelernt hat
+      (`remote.learn_command`); dazu wird das Gerät (`device`) angegeben.
+      Fehlende Befehle heißen dann wie ihr Schlüssel (z.B. "power").
+    """
+
+    def __init__(self, codes: Dict[str, str], device: Optional[str] = None):
+        self.device = device or None
+        self._codes = {}
+        for key in COMMAND_KEYS:
+            default = key if self.device else DEFAULT_COMMAND_SET[key]
+            self._codes[key] = _format_code(key, codes.get(key, default), self.device)
+        unknown = set(codes) - set(COMMAND_KEYS)
+        if unknown:
+            raise ValueError(f"Unbekannte Befehle: {', '.join(sorted(unknown))}")
+
+    def resolve(self, commands: List[str]) -> List[str]:
+        """Übersetzt Befehlsnamen in die vorformatierten Codes."""
+        return [self._codes[command] for command in commands]
+
+
+def parse_command_json(text: str) -> Dict[str, str]:
+    """Liest eine Code-Tabelle aus JSON ({"power": "...", ...}); leer = Standard."""
+    if not text or not text.strip():
+        return {}
+    try:
+        codes = json.loads(text)
+    except ValueError as err:
+        raise ValueError(f"Ungültiges JSON: {err}") from err
+    if not isinstance(codes, dict) or not all(isinstance(code, str) for code in codes.values()):
+        raise ValueError("Erwartet ein Objekt aus Befehlsnamen und Codes")
+    return codes
+
+
+def _format_code(key: str, code: str, device: Optional[str]) -> str:
+    code = code.strip()
+    if not code:
+        raise ValueError(f"Leerer Code für '{key}'")
+    if device:
+        # Von der Remote gelernter Befehl, wird über den Namen gesendet
+        return code
+    raw = code[4:] if code.startswith("b64:") else code
+    try:
+        base64.b64decode(raw, validate=True)
+    except (binascii.Error, ValueError) as err:
+        raise ValueError(f"Ungültiger Base64-Code für '{key}'") from err
+    return f"b64:{raw}"
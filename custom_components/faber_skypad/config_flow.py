@@ -1,11 +1,39 @@
 """Config flow for the Faber Skypad integration."""
+import json
 import logging
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers import selector
 
-from .const import DOMAIN, CONF_REMOTE_ENTITY, CONF_POWER_SENSOR
+from .const import (
+    DOMAIN,
+    CONF_REMOTE_ENTITY,
+    CONF_POWER_SENSOR,
+    CONF_BATCH_COMMANDS,
+    DEFAULT_BATCH_COMMANDS,
+    CONF_DWELL_TIME,
+    DEFAULT_DWELL_TIME,
+    CONF_OPTIMISTIC,
+    DEFAULT_OPTIMISTIC,
+    CONF_COMMAND_SET,
+    CONF_COMMAND_DEVICE,
+    CONF_METRICS,
+    DEFAULT_METRICS,
+    CONF_HOMING,
+    DEFAULT_HOMING,
+    CONF_VERIFY,
+    DEFAULT_VERIFY,
+    CONF_RUN_ON_PROFILE,
+    CONF_RUN_ON_END_SENSOR,
+    CONF_RUN_ON_END_THRESHOLD,
+    CONF_AUTO_HUMIDITY_SENSOR,
+    CONF_AUTO_VOC_SENSOR,
+    CONF_AUTO_PM_SENSOR,
+    CONF_AUTO_TEMPERATURE_SENSOR,
+)
+from .commands import FaberCommandSet, parse_command_json
+from .run_on import parse_run_on_profile, format_run_on_profile
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,14 +81,34 @@ class FaberOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Shows the form with the current values."""
+        errors = {}
+
         if user_input is not None:
-            # The user_input contains the new options. We create an entry with this
-            # data, and HA will store it in config_entry.options and reload the integration.
-            return self.async_create_entry(title="", data=user_input)
+            # Code-Tabelle als JSON importieren und vor dem Speichern prüfen
+            try:
+                codes = parse_command_json(user_input.get(CONF_COMMAND_SET, ""))
+                FaberCommandSet(codes, user_input.get(CONF_COMMAND_DEVICE))
+            except ValueError as err:
+                _LOGGER.debug("Invalid command set: %s", err)
+                errors[CONF_COMMAND_SET] = "invalid_command_set"
+            # Nachlauf-Profil "Stufe:Sekunden, ..." prüfen und als Liste speichern
+            try:
+                stages = parse_run_on_profile(user_input.get(CONF_RUN_ON_PROFILE, ""))
+            except ValueError as err:
+                _LOGGER.debug("Invalid run-on profile: %s", err)
+                errors[CONF_RUN_ON_PROFILE] = "invalid_run_on_profile"
+            if not errors:
+                user_input[CONF_COMMAND_SET] = codes
+                user_input[CONF_RUN_ON_PROFILE] = [list(stage) for stage in stages]
+                # The user_input contains the new options. We create an entry with this
+                # data, and HA will store it in config_entry.options and reload the integration.
+                return self.async_create_entry(title="", data=user_input)
 
         # When building the form, we show the current options, falling back to the
         # initial data if no options have been set yet.
         combined_config = {**self.config_entry.data, **self.config_entry.options}
+        command_set = combined_config.get(CONF_COMMAND_SET) or {}
+        run_on_profile = combined_config.get(CONF_RUN_ON_PROFILE) or []
 
         schema = vol.Schema({
             vol.Required(
@@ -75,6 +123,96 @@ class FaberOptionsFlowHandler(config_entries.OptionsFlow):
             ): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain=["sensor", "binary_sensor"])
             ),
+            # Mehrere Pulse in einem Aufruf senden (Remote muss delay_secs unterstützen)
+            vol.Optional(
+                CONF_BATCH_COMMANDS,
+                default=combined_config.get(CONF_BATCH_COMMANDS, DEFAULT_BATCH_COMMANDS)
+            ): selector.BooleanSelector(),
+            # Zielzustand sofort anzeigen, Befehle im Hintergrund senden
+            vol.Optional(
+                CONF_OPTIMISTIC,
+                default=combined_config.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC)
+            ): selector.BooleanSelector(),
+            # Gesendete Befehle mit dem Leistungssensor prüfen und Drift korrigieren
+            vol.Optional(
+                CONF_VERIFY,
+                default=combined_config.get(CONF_VERIFY, DEFAULT_VERIFY)
+            ): selector.BooleanSelector(),
+            # Stufenwechsel bei Bedarf über Stufe 1 (Homing) statt relativ
+            vol.Optional(
+                CONF_HOMING,
+                default=combined_config.get(CONF_HOMING, DEFAULT_HOMING)
+            ): selector.BooleanSelector(),
+            # Wie lange ein erkannter Modus stabil sein muss, bevor er übernommen wird
+            vol.Optional(
+                CONF_DWELL_TIME,
+                default=combined_config.get(CONF_DWELL_TIME, DEFAULT_DWELL_TIME)
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0, max=60, step=0.5, unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            # Eigene Codes als JSON, z.B. {"power": "b64:...", "light": "..."}; leer = Standard
+            vol.Optional(
+                CONF_COMMAND_SET,
+                default=json.dumps(command_set, indent=2) if command_set else ""
+            ): selector.TextSelector(
+                selector.TextSelectorConfig(multiline=True)
+            ),
+            # Gerät für Befehle, die die Remote selbst gelernt hat (remote.learn_command)
+            vol.Optional(
+                CONF_COMMAND_DEVICE,
+                default=combined_config.get(CONF_COMMAND_DEVICE, "")
+            ): selector.TextSelector(),
+            # Nachlauf in Phasen, z.B. "3:120, 2:300, 1:600"; leer = Stufe 1 für die eingestellte Dauer
+            vol.Optional(
+                CONF_RUN_ON_PROFILE,
+                default=format_run_on_profile(run_on_profile)
+            ): selector.TextSelector(),
+            # Sensor für das vorzeitige Ende des Nachlaufs (Luftqualität oder Kochdunst erkannt)
+            vol.Optional(
+                CONF_RUN_ON_END_SENSOR,
+                description={"suggested_value": combined_config.get(CONF_RUN_ON_END_SENSOR)}
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor", "binary_sensor"])
+            ),
+            vol.Optional(
+                CONF_RUN_ON_END_THRESHOLD,
+                description={"suggested_value": combined_config.get(CONF_RUN_ON_END_THRESHOLD)}
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(mode=selector.NumberSelectorMode.BOX, step="any")
+            ),
+            # Sensoren für das Preset AUTO (Luftfeuchte, VOC, Feinstaub, Temperatur); ohne Sensor kein AUTO
+            vol.Optional(
+                CONF_AUTO_HUMIDITY_SENSOR,
+                description={"suggested_value": combined_config.get(CONF_AUTO_HUMIDITY_SENSOR)}
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor")
+            ),
+            vol.Optional(
+                CONF_AUTO_VOC_SENSOR,
+                description={"suggested_value": combined_config.get(CONF_AUTO_VOC_SENSOR)}
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor")
+            ),
+            vol.Optional(
+                CONF_AUTO_PM_SENSOR,
+                description={"suggested_value": combined_config.get(CONF_AUTO_PM_SENSOR)}
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor")
+            ),
+            vol.Optional(
+                CONF_AUTO_TEMPERATURE_SENSOR,
+                description={"suggested_value": combined_config.get(CONF_AUTO_TEMPERATURE_SENSOR)}
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor")
+            ),
+            # Zähler und Latenzen als Diagnose-Sensoren erfassen
+            vol.Optional(
+                CONF_METRICS,
+                default=combined_config.get(CONF_METRICS, DEFAULT_METRICS)
+            ): selector.BooleanSelector(),
         })
 
-        return self.async_show_form(step_id="init", data_schema=schema)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -5,13 +5,46 @@ DOMAIN = "faber_skypad"
 # Konfigurations-Schlüssel
 CONF_REMOTE_ENTITY = "remote_entity"
 CONF_POWER_SENSOR = "power_sensor"
+CONF_BATCH_COMMANDS = "batch_commands"
+CONF_DWELL_TIME = "dwell_time"
+CONF_OPTIMISTIC = "optimistic_updates"
+CONF_COMMAND_SET = "command_set"
+CONF_COMMAND_DEVICE = "command_device"
+CONF_METRICS = "collect_metrics"
+CONF_HOMING = "speed_homing"
+CONF_VERIFY = "verify_commands"
+CONF_RUN_ON_PROFILE = "run_on_profile"
+CONF_RUN_ON_END_SENSOR = "run_on_end_sensor"
+CONF_RUN_ON_END_THRESHOLD = "run_on_end_threshold"
+CONF_AUTO_HUMIDITY_SENSOR = "auto_humidity_sensor"
+CONF_AUTO_VOC_SENSOR = "auto_voc_sensor"
+CONF_AUTO_PM_SENSOR = "auto_pm_sensor"
+CONF_AUTO_TEMPERATURE_SENSOR = "auto_temperature_sensor"
 
 # Standardwerte
 DEFAULT_RUN_ON_SECONDS = 60
+RUN_ON_MIN_STAGE_SECONDS = 10
+RUN_ON_MAX_STAGE_SECONDS = 3600
 DEFAULT_DELAY = 0.75
 CMD_HOLD_SECS = 0.4
+DEFAULT_BATCH_COMMANDS = True
+DEFAULT_OPTIMISTIC = False
+DEFAULT_METRICS = False
+DEFAULT_HOMING = False
+DEFAULT_VERIFY = True
 
-# Commands - Base64 Codes
+# Speicherung (Profile & Einstellungen über Neustarts)
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+# Logische Befehle (Schlüssel der Code-Tabelle)
+COMMAND_POWER = "power"
+COMMAND_INCREASE = "increase"
+COMMAND_DECREASE = "decrease"
+COMMAND_BOOST = "boost"
+COMMAND_LIGHT = "light"
+
+# Commands - Base64 Codes (Standard-Code-Tabelle)
 CMD_TURN_ON_OFF = "JgAUABgYFy0vFxgXFi4vQxgsGBcvAA0F"
 CMD_INCREASE = "JgASABkXRxcXFxcYRhcYQ0ctMAANBQ=="
 CMD_DECREASE = "JgASABgtMBYXFxgtLxcXWi8tLwANBQ=="
@@ -26,6 +59,78 @@ SPEED_MAPPING = {
 }
 
 PRESET_BOOST = "BOOST"
-CALIBRATION_WAIT_TIME = 12.0
+PRESET_AUTO = "AUTO"
+# Die Haube beendet den Boost nach 5 Minuten selbst
+BOOST_DURATION = 300
+# Maximale Messdauer je Stufe (bei langsamen Sensoren entsprechend länger)
+CALIBRATION_WAIT_TIME = 30.0
+CALIBRATION_OFF_WAIT_TIME = 20.0
+# Reserve des Watchdogs über der Summe der Messdauern (Befehle, Wartezeiten)
+CALIBRATION_WATCHDOG_TIME = 120.0
+# Messwerte der ersten Sekunden nach dem Befehl gehören zur Anlauframpe
+CALIBRATION_MIN_SETTLE_TIME = 8.0
+CALIBRATION_SETTLE_SAMPLES = 6
+CALIBRATION_SETTLE_STD = 1.5
+CALIBRATION_SETTLE_RATIO = 0.02
+CALIBRATION_TOLERANCE_SIGMA = 4.0
 MATCH_TOLERANCE = 10.0
-FALLBACK_THRESHOLD = 15.0
\ No newline at end of file
+MIN_MATCH_TOLERANCE = 2.0
+FALLBACK_THRESHOLD = 15.0
+
+# Licht-Erkennung: kleinere Offsets lassen sich nicht vom Rauschen trennen
+LIGHT_MIN_OFFSET = 2.0
+# Mindest-Verweilzeit eines reinen Lichtwechsels (Sekunden); Rampen zwischen den
+# Stufen streifen die Lichtbänder und dürfen dort nicht hängen bleiben
+LIGHT_DWELL_TIME = 10.0
+
+# Streaming-Klassifikator
+CLASSIFIER_WINDOW = 5
+CLASSIFIER_HYSTERESIS = 0.2
+
+# Abgeleitete Energie- und Laufzeitsensoren (Veröffentlichung höchstens alle x Sekunden)
+ENERGY_PUBLISH_INTERVAL = 60
+# Zählerstände speichern: bei einer neuen Einschaltung, sonst höchstens alle x Sekunden
+ENERGY_SAVE_INTERVAL = 900
+DEFAULT_DWELL_TIME = 5.0
+
+# Abgleich nach dem Senden: Wartezeit bis zum Vergleich mit der Messung
+# (zusätzlich zur Erkennungszeit des Klassifikators) und maximale Korrekturversuche
+VERIFY_SETTLE_TIME = 10.0
+DRIFT_CORRECTION_RETRIES = 2
+# Solange die Erkennung noch nachzieht, wird der Abgleich höchstens bis hierhin verschoben
+VERIFY_MAX_SETTLE_TIME = 60.0
+# Glättung des gemessenen Abstands zwischen zwei Messwerten
+SAMPLE_INTERVAL_WEIGHT = 0.2
+
+# Adaptive Pulsabstände (Startwert ist DEFAULT_DELAY)
+PACING_MIN_DELAY = 0.3
+PACING_MAX_DELAY = 2.0
+PACING_SHRINK_FACTOR = 0.9
+PACING_BACKOFF_FACTOR = 1.5
+PACING_FLOOR_MARGIN = 1.1
+PACING_SUCCESS_STREAK = 3
+PACING_LATENCY_WEIGHT = 0.3
+
+# Homing: vor dem Stufenwechsel gegen Stufe 1 fahren (die Haube bleibt dort stehen)
+HOMING_MARGIN_PULSES = 1
+HOMING_DEFAULT_LOSS = 0.02
+HOMING_LOSS_WEIGHT = 0.05
+# Kosten eines Fehlschlags in Pulsen: mit Sensor eine Korrektur, ohne Sensor bleibt die Abweichung
+HOMING_RETRY_COST = 3.0
+HOMING_DRIFT_COST = 10.0
+
+# Automatik: Schwellen je Sensorart, ab denen Stufe 2 bzw. 3 gefordert wird
+# (Luftfeuchte %, VOC ppb, Feinstaub PM2.5 µg/m³, Temperatur °C)
+AUTO_THRESHOLDS = {
+    "humidity": (70.0, 80.0),
+    "voc": (500.0, 1000.0),
+    "pm": (25.0, 50.0),
+    "temperature": (28.0, 32.0),
+}
+# Zum Zurückschalten muss der Wert so weit (relativ) unter die Schwelle fallen
+AUTO_HYSTERESIS = 0.1
+# Zeitkonstante der Glättung in Sekunden
+AUTO_SMOOTHING_TIME = 30.0
+# Mindestverweildauer pro Stufe und Obergrenze für IR-Pulse der Automatik
+AUTO_MIN_DWELL = 120.0
+AUTO_MAX_PULSES_PER_MINUTE = 4
@@ -0,0 +1,497 @@
+"""Zentrale Datenverteilung pro Faber Skypad Config-Entry."""
+import logging
+import time
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STOP,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    STATE_ON,
+    STATE_OFF,
+)
+
+from .const import (
+    CONF_POWER_SENSOR,
+    CONF_RUN_ON_END_SENSOR,
+    CONF_RUN_ON_END_THRESHOLD,
+    CONF_DWELL_TIME,
+    DEFAULT_DWELL_TIME,
+    ENERGY_PUBLISH_INTERVAL,
+    ENERGY_SAVE_INTERVAL,
+    SAMPLE_INTERVAL_WEIGHT,
+    VERIFY_SETTLE_TIME,
+)
+from .classifier import FaberPowerClassifier
+from .energy import FaberEnergyMeter
+from .metrics import METRIC_SAMPLES, METRIC_DETECTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FaberCoordinator:
+    """Hub pro Config-Entry nach dem Vorbild des DataUpdateCoordinator.
+
+    Abonniert den Leistungssensor genau einmal, führt den Klassifikator, den
+    Nachlauf- und den Boost-Timer (auf dem gemeinsamen Timer-Dienst) und verteilt Änderungen gebündelt an alle Entitäten:
+    Mehrere Änderungen innerhalb eines Event-Loop-Durchlaufs lösen nur einen
+    Aufruf pro Listener aus. Energie- und Laufzeitzähler werden bei jedem
+    Messwert fortgeschrieben, ihre Listener aber höchstens alle
+    ENERGY_PUBLISH_INTERVAL Sekunden benachrichtigt. Gespeichert werden sie
+    bei einer neuen Einschaltung, sonst höchstens alle ENERGY_SAVE_INTERVAL
+    Sekunden sowie beim Entladen und Beenden von Home Assistant.
+    """
+
+    def __init__(self, hass: HomeAssistant, runtime_data):
+        self.hass = hass
+        self._runtime_data = runtime_data
+        self.power_sensor = runtime_data.config.get(CONF_POWER_SENSOR)
+        self._timers = runtime_data.timers
+        self.classifier = FaberPowerClassifier(
+            runtime_data.power_profile,
+            runtime_data.config.get(CONF_DWELL_TIME, DEFAULT_DWELL_TIME),
+            runtime_data.power_stats,
+            light_offset=runtime_data.light_offset,
+        )
+        self.energy = FaberEnergyMeter(runtime_data.power_profile, runtime_data.energy_totals)
+        self._energy_saved = self._energy_counters()
+        self._energy_saved_at = time.monotonic()
+
+        # Letztes stabiles Erkennungsergebnis
+        self.mode = None
+        self.light_on = None
+        self.running = None
+        self.is_binary = False
+        self.detection_serial = 0
+        # Anzahl und geglätteter Abstand der numerischen Messwerte
+        self.sample_count = 0
+        self.sample_interval = None
+        self._last_sample_at = None
+
+        self._listeners = set()
+        self._energy_listeners = set()
+        self._publish_timer = None
+        self._update_scheduled = False
+        self._unsub_sensor = None
+        self._unsub_stop = None
+        self._poll_timer = None
+        self._poll_deadline = None
+        self._run_on_timer = None
+        self._run_on_stages = []
+        self._run_on_stage_action = None
+        self._run_on_finish_action = None
+        self._unsub_run_on_sensor = None
+        self._boost_timer = None
+        self._boost_finish_action = None
+
+    # --- LISTENER ---
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Registriert einen Listener und liefert die Funktion zum Entfernen."""
+        self._listeners.add(update_callback)
+
+        @callback
+        def _remove():
+            self._listeners.discard(update_callback)
+
+        return _remove
+
+    @callback
+    def async_add_energy_listener(self, update_callback):
+        """Wie async_add_listener, aber für die gedrosselten Energie-Sensoren."""
+        self._energy_listeners.add(update_callback)
+
+        @callback
+        def _remove():
+            self._energy_listeners.discard(update_callback)
+
+        return _remove
+
+    @callback
+    def async_update_listeners(self):
+        """Plant genau eine Benachrichtigung für den nächsten Loop-Durchlauf."""
+        if self._update_scheduled:
+            return
+        self._update_scheduled = True
+        self.hass.loop.call_soon(self._async_dispatch)
+
+    @callback
+    def _async_dispatch(self):
+        self._update_scheduled = False
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    # --- LEISTUNGSSENSOR ---
+
+    @callback
+    def async_start(self):
+        """Abonniert den Leistungssensor und wertet den aktuellen Wert aus."""
+        if not self.power_sensor:
+            return
+        self._unsub_sensor = async_track_state_change_event(
+            self.hass, [self.power_sensor], self._async_power_sensor_changed
+        )
+        self._unsub_stop = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_hass_stop
+        )
+
+        state = self.hass.states.get(self.power_sensor)
+        if self._runtime_data.power_profile[1] != 0:
+            # Gespeichertes Profil: aktuellen Wert sofort klassifizieren
+            self._async_process_power_state(state)
+        elif state and state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            # Ohne Kalibrierung: Baseline aus dem aktuellen Wert (Fallback)
+            try:
+                self._runtime_data.power_profile["off"] = float(state.state)
+                self.classifier.compile()
+            except ValueError:
+                pass
+
+    @callback
+    def async_shutdown(self):
+        """Beendet Abonnement und alle Timer (beim Entladen)."""
+        if self._unsub_sensor:
+            self._unsub_sensor()
+            self._unsub_sensor = None
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
+        self._cancel_poll()
+        if self._run_on_timer:
+            self._run_on_timer.cancel()
+            self._run_on_timer = None
+        self._unsubscribe_run_on_sensor()
+        if self._boost_timer:
+            self._boost_timer.cancel()
+            self._boost_timer = None
+        if self._publish_timer:
+            self._publish_timer.cancel()
+            self._publish_timer = None
+        # Zähler bis jetzt fortschreiben, damit sie beim Entladen mitgespeichert werden
+        self.energy.advance(time.monotonic(), self.mode)
+        self._runtime_data.async_schedule_save()
+        self._listeners.clear()
+        self._energy_listeners.clear()
+
+    @callback
+    def async_reset_classifier(self):
+        """Verwirft die Erkennung nach einer Änderung am Profil."""
+        self._cancel_poll()
+        self.classifier.light_offset = self._runtime_data.light_offset
+        self.classifier.reset()
+        self.energy.pause()
+        self.mode = None
+        self.light_on = None
+
+    @callback
+    def _async_power_sensor_changed(self, event):
+        self._async_process_power_state(event.data.get("new_state"))
+
+    @callback
+    def _async_process_power_state(self, new_state):
+        """Wertet einen Zustand des Leistungssensors aus."""
+        # Während der Kalibrierung misst diese selbst
+        if self._runtime_data.calibration.is_running:
+            return
+
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            self.energy.pause()
+            return
+
+        try:
+            current_power = float(new_state.state)
+        except ValueError:
+            # Fallback für binäre Sensoren
+            if new_state.state in (STATE_ON, STATE_OFF):
+                self.is_binary = True
+                self.running = new_state.state == STATE_ON
+                self._async_detected()
+            return
+
+        # Gefilterte Klassifizierung; Wechsel erst nach Hysterese und Verweilzeit
+        self._runtime_data.metrics.inc(METRIC_SAMPLES)
+        now = time.monotonic()
+        self._track_sample_interval(now)
+        detected = self.classifier.add_sample(current_power, now)
+        self._schedule_poll()
+        if detected is not None:
+            self._async_apply_state(detected)
+
+        self.energy.add_sample(current_power, now, self.mode)
+        self._schedule_publish()
+
+    def _track_sample_interval(self, now):
+        if self._last_sample_at is not None:
+            gap = now - self._last_sample_at
+            if self.sample_interval is None:
+                self.sample_interval = gap
+            else:
+                self.sample_interval += SAMPLE_INTERVAL_WEIGHT * (gap - self.sample_interval)
+        self._last_sample_at = now
+        self.sample_count += 1
+
+    def detection_delay(self, light=False) -> float:
+        """Erwartete Zeit von einer Leistungsänderung bis zur Erkennung.
+
+        Der Median braucht `settle_samples` neue Werte im gemessenen Abstand
+        des Sensors. Die Verweilzeit einer Stufe läuft ab dem ersten davon
+        mit, die des Lichts beginnt erst danach.
+        """
+        classifier = self.classifier
+        settle = classifier.settle_samples * (self.sample_interval or 0.0)
+        if light:
+            return classifier.light_dwell_time + settle
+        return max(classifier.dwell_time, settle)
+
+    def detection_settling(self, samples_at):
+        """Wartezeit, bis die Erkennung einen Befehl zeigen kann, oder None.
+
+        Die Erkennung zieht nach, solange der Klassifikator einen Kandidaten
+        hat oder der Median seit dem Senden (Messwert Nr. `samples_at`) noch
+        nicht genug neue Werte sah.
+        """
+        classifier = self.classifier
+        deadline = classifier.pending_deadline
+        if deadline is not None:
+            return max(deadline - time.monotonic(), 0.0) + 1.0
+        missing = classifier.settle_samples - (self.sample_count - samples_at)
+        if missing > 0:
+            return missing * (self.sample_interval or VERIFY_SETTLE_TIME)
+        return None
+
+    @callback
+    def _async_apply_state(self, detected):
+        """Übernimmt einen erkannten Zustand (Modus, Licht)."""
+        mode, light_on = detected
+        if light_on != self.light_on:
+            self.light_on = light_on
+            self.async_update_listeners()
+        if mode != self.mode:
+            self.mode = mode
+            self._async_detected()
+
+    @callback
+    def _async_detected(self):
+        metrics = self._runtime_data.metrics
+        if metrics.enabled:
+            metrics.inc(METRIC_DETECTIONS)
+            metrics.inc(f"{METRIC_DETECTIONS}_{'binary' if self.is_binary else self.mode}")
+        self.detection_serial += 1
+        self.async_update_listeners()
+
+    def _cancel_poll(self):
+        if self._poll_timer:
+            self._poll_timer.cancel()
+            self._poll_timer = None
+
+    def _schedule_poll(self):
+        """Prüft den Kandidaten nach Ablauf der Verweilzeit auch ohne neue Messwerte."""
+        deadline = self.classifier.pending_deadline
+        if self._poll_timer and deadline == self._poll_deadline:
+            return
+        self._cancel_poll()
+        self._poll_deadline = deadline
+        if deadline is not None:
+            self._poll_timer = self._timers.async_call_later(
+                max(deadline - time.monotonic(), 0), self._async_poll_classifier
+            )
+
+    @callback
+    def _async_poll_classifier(self):
+        self._poll_timer = None
+        if self._runtime_data.calibration.is_running:
+            return
+        detected = self.classifier.poll(time.monotonic())
+        if detected is not None:
+            self._async_apply_state(detected)
+
+    def _schedule_publish(self):
+        """Veröffentlicht die Zähler gedrosselt, um den Recorder zu entlasten."""
+        if self._publish_timer or not self._energy_listeners:
+            return
+        self._publish_timer = self._timers.async_call_later(
+            ENERGY_PUBLISH_INTERVAL, self._async_publish_energy
+        )
+
+    @callback
+    def _async_publish_energy(self):
+        self._publish_timer = None
+        now = time.monotonic()
+        self.energy.advance(now, self.mode)
+        self._save_energy_if_due(now)
+        for update_callback in list(self._energy_listeners):
+            update_callback()
+
+    def _energy_counters(self):
+        energy = self.energy
+        return energy.energy_kwh, energy.runtime_seconds, sum(energy.totals["level_activations"].values())
+
+    def _save_energy_if_due(self, now):
+        """Speichert die Zähler bei einer neuen Einschaltung, sonst nur selten."""
+        counters = self._energy_counters()
+        if counters == self._energy_saved:
+            return
+        if counters[2] == self._energy_saved[2] and now - self._energy_saved_at < ENERGY_SAVE_INTERVAL:
+            return
+        self._energy_saved = counters
+        self._energy_saved_at = now
+        self._runtime_data.async_schedule_save()
+
+    @callback
+    def _async_hass_stop(self, _event):
+        """Schreibt die Zähler beim Beenden fort, der Store speichert sie zuletzt."""
+        self._unsub_stop = None
+        self.energy.advance(time.monotonic(), self.mode)
+        self._runtime_data.async_schedule_save()
+
+    # --- NACHLAUF ---
+
+    @callback
+    def async_start_run_on(self, stages, stage_action, finish_action):
+        """Startet den Nachlauf mit den Phasen [(Stufe, Sekunden), ...].
+
+        Die Haube läuft beim Start bereits in der ersten Stufe. Am Ende jeder
+        Phase wird `stage_action(Stufe)` für die nächste erwartet, am Ende der
+        letzten `finish_action`. Jede Phase ist genau ein Timer auf dem
+        gemeinsamen Dienst; die Endzeit dient nur der Anzeige.
+
+        Ist ein Sensor für das vorzeitige Ende konfiguriert, endet der
+        Nachlauf, sobald dieser meldet, dass die Luft sauber ist.
+        """
+        self._run_on_stages = list(stages)
+        self._run_on_stage_action = stage_action
+        self._run_on_finish_action = finish_action
+        total = sum(seconds for _level, seconds in self._run_on_stages)
+        self._runtime_data.run_on_finish_time = dt_util.utcnow() + timedelta(seconds=total)
+        self._runtime_data.run_on_active = True
+        self._runtime_data.run_on_level = self._run_on_stages[0][0]
+        self._schedule_run_on(self._run_on_stages[0][1])
+        self._subscribe_run_on_sensor()
+        self.async_update_listeners()
+
+    @callback
+    def async_cancel_run_on(self):
+        """Bricht den Nachlauf-Timer ab."""
+        if self._run_on_timer:
+            self._run_on_timer.cancel()
+            self._run_on_timer = None
+        self._unsubscribe_run_on_sensor()
+        self._run_on_stages = []
+        self._run_on_stage_action = None
+        self._run_on_finish_action = None
+        if self._runtime_data.run_on_active:
+            self._runtime_data.run_on_active = False
+            self._runtime_data.run_on_finish_time = None
+            self._runtime_data.run_on_level = None
+            self.async_update_listeners()
+
+    def _schedule_run_on(self, seconds):
+        if self._run_on_timer:
+            self._run_on_timer.reschedule(seconds)
+        else:
+            self._run_on_timer = self._timers.async_call_later(seconds, self._async_run_on_stage_finished)
+
+    async def _async_run_on_stage_finished(self):
+        """Wechselt in die nächste Phase oder beendet den Nachlauf."""
+        if self._run_on_stages:
+            self._run_on_stages.pop(0)
+        if not self._run_on_stages:
+            await self._async_run_on_finished()
+            return
+
+        level, seconds = self._run_on_stages[0]
+        self._runtime_data.run_on_level = level
+        self._schedule_run_on(seconds)
+        self.async_update_listeners()
+        if self._run_on_stage_action is not None:
+            await self._run_on_stage_action(level)
+
+    async def _async_run_on_finished(self):
+        if self._run_on_timer:
+            self._run_on_timer.cancel()
+        self._unsubscribe_run_on_sensor()
+        self._run_on_stages = []
+        self._run_on_stage_action = None
+        finish_action = self._run_on_finish_action
+        self._run_on_finish_action = None
+        if finish_action is not None:
+            await finish_action()
+
+    def _subscribe_run_on_sensor(self):
+        sensor = self._runtime_data.config.get(CONF_RUN_ON_END_SENSOR)
+        if not sensor or self._unsub_run_on_sensor:
+            return
+        self._unsub_run_on_sensor = async_track_state_change_event(
+            self.hass, [sensor], self._async_run_on_sensor_changed
+        )
+
+    def _unsubscribe_run_on_sensor(self):
+        if self._unsub_run_on_sensor:
+            self._unsub_run_on_sensor()
+            self._unsub_run_on_sensor = None
+
+    @callback
+    def _async_run_on_sensor_changed(self, event):
+        """Beendet den Nachlauf vorzeitig, wenn der Sensor saubere Luft meldet.
+
+        Numerische Sensoren gelten unterhalb der Schwelle als sauber, binäre
+        Sensoren (z.B. "Kochdunst erkannt") im Zustand aus.
+        """
+        new_state = event.data.get("new_state")
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        if new_state.state in (STATE_ON, STATE_OFF):
+            clean = new_state.state == STATE_OFF
+        else:
+            threshold = self._runtime_data.config.get(CONF_RUN_ON_END_THRESHOLD)
+            if threshold is None:
+                return
+            try:
+                clean = float(new_state.state) <= threshold
+            except ValueError:
+                return
+        if clean and self._runtime_data.run_on_active:
+            _LOGGER.info("Nachlauf vorzeitig beendet: %s meldet saubere Luft", new_state.entity_id)
+            self._unsubscribe_run_on_sensor()
+            self.hass.async_create_task(self._async_run_on_finished())
+
+    # --- BOOST ---
+
+    @callback
+    def async_start_boost(self, seconds, finish_action):
+        """Startet den Boost-Timer neu; `finish_action` wird am Ende aufgerufen."""
+        self._boost_finish_action = finish_action
+        self._runtime_data.boost_finish_time = dt_util.utcnow() + timedelta(seconds=seconds)
+        self._runtime_data.boost_active = True
+        if self._boost_timer:
+            self._boost_timer.reschedule(seconds)
+        else:
+            self._boost_timer = self._timers.async_call_later(seconds, self._async_boost_finished)
+        self.async_update_listeners()
+
+    @callback
+    def async_cancel_boost(self):
+        """Bricht den Boost-Timer ab (Boost vorzeitig verlassen)."""
+        if self._boost_timer:
+            self._boost_timer.cancel()
+            self._boost_timer = None
+        self._boost_finish_action = None
+        if self._runtime_data.boost_active:
+            self._runtime_data.boost_active = False
+            self._runtime_data.boost_finish_time = None
+            self.async_update_listeners()
+
+    @callback
+    def _async_boost_finished(self):
+        self._boost_timer = None
+        finish_action = self._boost_finish_action
+        self._boost_finish_action = None
+        self._runtime_data.boost_active = False
+        self._runtime_data.boost_finish_time = None
+        self.async_update_listeners()
+        if finish_action is not None:
+            finish_action()
@@ -0,0 +1,76 @@
+"""Diagnostics für Faber Skypad."""
+from typing import Any, Dict
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Liefert Konfiguration, gelernte Werte und Messwerte eines Eintrags."""
+    runtime_data = hass.data[DOMAIN][entry.entry_id]["runtime_data"]
+    coordinator = runtime_data.coordinator
+    progress = runtime_data.calibration
+
+    return {
+        "config": runtime_data.config,
+        "power_profile": {str(mode): watt for mode, watt in runtime_data.power_profile.items()},
+        "power_stats": {str(mode): stats for mode, stats in runtime_data.power_stats.items()},
+        "light_offset": runtime_data.light_offset,
+        "detection": {
+            "mode": coordinator.mode,
+            "light_on": coordinator.light_on,
+            "is_binary": coordinator.is_binary,
+            "running": coordinator.running,
+        },
+        "calibration": {
+            "state": progress.state,
+            "step": progress.step,
+            "percent": progress.percent,
+            "elapsed": progress.elapsed,
+        },
+        "run_on": {
+            "enabled": runtime_data.run_on_enabled,
+            "seconds": runtime_data.run_on_seconds,
+            "active": runtime_data.run_on_active,
+            "finish_time": runtime_data.run_on_finish_time,
+            "level": runtime_data.run_on_level,
+        },
+        "boost": {
+            "active": runtime_data.boost_active,
+            "finish_time": runtime_data.boost_finish_time,
+        },
+        "auto": {
+            "sensors": runtime_data.auto.sensors,
+            "values": runtime_data.auto.values(runtime_data.timers.service.now()),
+        },
+        "last_speed_step": runtime_data.last_speed_step,
+        "pacing": runtime_data.pacing.as_dict(),
+        "homing": {
+            "enabled": runtime_data.homing.enabled,
+            "unconfirmed_pulses": runtime_data.homing.unconfirmed_pulses,
+            **runtime_data.homing.as_dict(),
+        },
+        "energy": {
+            "energy_kwh": runtime_data.energy_totals["energy_kwh"],
+            "level_seconds": {
+                str(mode): value for mode, value in runtime_data.energy_totals["level_seconds"].items()
+            },
+            "level_activations": {
+                str(mode): value for mode, value in runtime_data.energy_totals["level_activations"].items()
+            },
+        },
+        "transmit_scheduler": {
+            "remote_entity": runtime_data.command_queue.scheduler.remote_entity,
+            "entries": len(runtime_data.command_queue.scheduler.users),
+        },
+        "pulses_saved": runtime_data.command_queue.pulses_saved,
+        "timer_service": {
+            "entries": len(runtime_data.timers.service.users),
+            "pending": len(runtime_data.timers.service),
+        },
+        "metrics": runtime_data.metrics.as_dict(),
+    }
@@ -0,0 +1,81 @@
+"""Inkrementelle Energie- und Laufzeitzähler für die Faber Skypad."""
+
+# Stufen, für die Laufzeit und Einschaltvorgänge gezählt werden
+LEVEL_MODES = (1, 2, 3, "boost")
+
+
+def new_energy_totals():
+    """Leere Zählerstände, wie sie im Store abgelegt werden."""
+    return {
+        "energy_kwh": 0.0,
+        "level_seconds": {mode: 0.0 for mode in LEVEL_MODES},
+        "level_activations": {mode: 0 for mode in LEVEL_MODES},
+    }
+
+
+class FaberEnergyMeter:
+    """Integriert den Leistungsstrom direkt im Sensor-Callback.
+
+    Die Energie der Haube (oberhalb der gelernten "off"-Baseline) wird per
+    Trapezregel zwischen zwei Messwerten aufsummiert. Die Zeit zwischen zwei
+    Messwerten wird der Stufe zugeschrieben, die zu Beginn des Intervalls
+    erkannt war. Ist die Haube aus (oder noch nichts erkannt), wird nichts
+    gezählt, sonst summieren sich Rauschen und Drift der Baseline auf. Es
+    werden keine Recorder-Abfragen benötigt.
+    """
+
+    def __init__(self, power_profile, totals):
+        self._profile = power_profile
+        self.totals = totals
+        self._last_time = None
+        self._last_power = None
+        self._last_mode = None
+
+    @property
+    def energy_kwh(self) -> float:
+        return self.totals["energy_kwh"]
+
+    @property
+    def runtime_seconds(self) -> float:
+        return sum(self.totals["level_seconds"].values())
+
+    def level_seconds(self, mode) -> float:
+        return self.totals["level_seconds"].get(mode, 0.0)
+
+    def level_activations(self, mode) -> int:
+        return self.totals["level_activations"].get(mode, 0)
+
+    def add_sample(self, power: float, now: float, mode) -> None:
+        """Integriert bis `now` und übernimmt den neuen Messwert."""
+        self._integrate(power, now)
+        self._last_power = power
+        self._set_mode(mode)
+
+    def advance(self, now: float, mode) -> None:
+        """Integriert bis `now` mit dem letzten Messwert (ohne neuen Sensorwert)."""
+        if self._last_power is None:
+            return
+        self._integrate(self._last_power, now)
+        self._set_mode(mode)
+
+    def pause(self) -> None:
+        """Unterbricht die Integration (Sensor nicht verfügbar, Kalibrierung)."""
+        self._last_time = None
+        self._last_power = None
+
+    def _integrate(self, power: float, now: float) -> None:
+        if self._last_time is not None and now > self._last_time and self._last_mode not in (None, "off"):
+            elapsed = now - self._last_time
+            baseline = self._profile["off"]
+            previous = max(self._last_power - baseline, 0.0)
+            current = max(power - baseline, 0.0)
+            # Ws -> kWh
+            self.totals["energy_kwh"] += (previous + current) / 2 * elapsed / 3_600_000
+            if self._last_mode in self.totals["level_seconds"]:
+                self.totals["level_seconds"][self._last_mode] += elapsed
+        self._last_time = now
+
+    def _set_mode(self, mode) -> None:
+        if mode != self._last_mode and mode in self.totals["level_activations"]:
+            self.totals["level_activations"][mode] += 1
+        self._last_mode = mode
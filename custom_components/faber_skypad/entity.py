@@ -0,0 +1,51 @@
+"""Gemeinsame Basisklasse für alle Faber Skypad Entitäten."""
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+
+from .metrics import METRIC_STATE_WRITES, METRIC_SUPPRESSED_WRITES
+
+
+class FaberEntity(Entity):
+    """Basis für alle Entitäten eines Config-Entries.
+
+    DeviceInfo und Unique-ID werden einmalig als `_attr_*` gesetzt; die
+    DeviceInfo wird von allen Entitäten eines Eintrags gemeinsam genutzt.
+    Zustände ändern sich nur durch Befehle oder Ereignisse, daher wird nicht
+    gepollt.
+
+    Die Integration schreibt ihren Zustand über `async_write_ha_state_if_changed`:
+    Zustand und Attribute werden mit dem zuletzt veröffentlichten Stand
+    verglichen und unveränderte Schreibvorgänge übersprungen. Aufrufe von
+    `async_write_ha_state` (auch durch Home Assistant selbst, z.B. nach einer
+    Umbenennung) schreiben immer.
+    """
+
+    _attr_should_poll = False
+    _published_state = None
+
+    def __init__(self, runtime_data, unique_id_suffix):
+        self._runtime_data = runtime_data
+        self._entry_id = runtime_data.entry_id
+        self._attr_unique_id = f"{runtime_data.entry_id}_{unique_id_suffix}"
+        self._attr_device_info = runtime_data.device_info
+
+    @callback
+    def async_write_ha_state(self):
+        self._published_state = None
+        self._runtime_data.metrics.inc(METRIC_STATE_WRITES)
+        super().async_write_ha_state()
+
+    @callback
+    def async_write_ha_state_if_changed(self):
+        """Schreibt den Zustand nur, wenn sich Zustand oder Attribute geändert haben."""
+        snapshot = (
+            self.available,
+            self.state,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+        if snapshot == self._published_state:
+            self._runtime_data.metrics.inc(METRIC_SUPPRESSED_WRITES)
+            return
+        self.async_write_ha_state()
+        self._published_state = snapshot
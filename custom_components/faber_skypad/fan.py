@@ -1,8 +1,8 @@
 """Fan Plattform für Faber Skypad."""
 import logging
 import asyncio
+import time
 from typing import Any, Optional, Dict
-from datetime import timedelta
 
 from homeassistant.components.fan import (
     FanEntity,
@@ -11,26 +11,44 @@ from homeassistant.components.fan import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event, async_call_later
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.util import dt as dt_util
-from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, STATE_ON, STATE_OFF
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
 
 from .const import (
     DOMAIN,
-    CONF_REMOTE_ENTITY,
     CONF_POWER_SENSOR,
-    CMD_TURN_ON_OFF,
-    CMD_INCREASE,
-    CMD_DECREASE,
-    CMD_BOOST,
-    DEFAULT_DELAY,
-    CMD_HOLD_SECS,
+    CONF_OPTIMISTIC,
+    DEFAULT_OPTIMISTIC,
+    CONF_RUN_ON_PROFILE,
+    CONF_VERIFY,
+    DEFAULT_VERIFY,
+    VERIFY_SETTLE_TIME,
+    VERIFY_MAX_SETTLE_TIME,
+    DRIFT_CORRECTION_RETRIES,
+    COMMAND_POWER,
+    COMMAND_INCREASE,
+    COMMAND_DECREASE,
+    COMMAND_BOOST,
+    COMMAND_LIGHT,
     SPEED_MAPPING,
     PRESET_BOOST,
-    CALIBRATION_WAIT_TIME,
-    MATCH_TOLERANCE,
-    FALLBACK_THRESHOLD,
+    PRESET_AUTO,
+    BOOST_DURATION,
+    CALIBRATION_WATCHDOG_TIME,
+)
+from .command_queue import INTENT_SPEED
+from .metrics import METRIC_HOMED_MOVES, METRIC_AUTO_CHANGES
+from .entity import FaberEntity
+from .calibration import (
+    FaberLevelSampler,
+    CALIBRATION_STEPS,
+    CALIBRATION_MODES,
+    STATE_DONE,
+    STATE_UNSETTLED,
+    STATE_CANCELLED,
+    STATE_FAILED,
+    inconsistent_levels,
+    step_timeout,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -41,71 +59,71 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Fügt die Fan Entität hinzu."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    config = data["config"]
-    runtime_data = data["runtime_data"]
-    
-    remote_entity = config[CONF_REMOTE_ENTITY]
-    power_sensor = config.get(CONF_POWER_SENSOR)
-    name = config.get("name", "Faber Skypad")
+    runtime_data = hass.data[DOMAIN][config_entry.entry_id]["runtime_data"]
 
-    fan = FaberFan(hass, name, remote_entity, power_sensor, config_entry.entry_id, runtime_data)
+    fan = FaberFan(hass, runtime_data)
     # Fan in Runtime Data registrieren für Button Zugriff
     runtime_data.fan_entity = fan
     
     async_add_entities([fan])
 
 
-class FaberFan(FanEntity):
+class FaberFan(FaberEntity, FanEntity):
     """Repräsentation des Faber Skypad Lüfters."""
 
-    def __init__(self, hass, name, remote_entity, power_sensor, entry_id, runtime_data):
+    _attr_supported_features = (
+        FanEntityFeature.SET_SPEED
+        | FanEntityFeature.TURN_ON
+        | FanEntityFeature.TURN_OFF
+        | FanEntityFeature.PRESET_MODE
+    )
+    _attr_preset_modes = [PRESET_BOOST]
+
+    def __init__(self, hass, runtime_data):
+        super().__init__(runtime_data, "fan")
         self.hass = hass
-        self._name = name
-        self._remote_entity = remote_entity
-        self._power_sensor = power_sensor
-        self._entry_id = entry_id
-        self._runtime_data = runtime_data
+        self._attr_name = runtime_data.name
+        self._power_sensor = runtime_data.config.get(CONF_POWER_SENSOR)
+        self._command_queue = runtime_data.command_queue
+        self._coordinator = runtime_data.coordinator
+        self._seen_detection_serial = 0
+        self._optimistic = runtime_data.config.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC)
+        self._verify = runtime_data.config.get(CONF_VERIFY, DEFAULT_VERIFY)
+        self._pacing = runtime_data.pacing
+        self._homing = runtime_data.homing
+        self._intent_lock = asyncio.Lock()
+        # Generation der Stufenabsichten, unter der die laufende Absicht sendet
+        self._intent_generation = None
+        # Luftqualitäts-Automatik (nur angeboten, wenn Sensoren konfiguriert sind)
+        self._auto = runtime_data.auto
+        self._auto_unsub = None
+        self._auto_timer = None
+        self._auto_task = None
+        if self._auto.enabled:
+            self._attr_preset_modes = [PRESET_BOOST, PRESET_AUTO]
+        # Nach dem Senden erwarteter Modus bis zum Abgleich mit der Messung
+        self._expected_mode = None
+        self._reconcile_timer = None
+        self._expected_since = None
+        self._expected_samples = 0
+        self._correction_attempt = 0
+        self._corrections_applied = 0
         
         self._is_on = False
         self._percentage = 0
         self._preset_mode = None
         self._current_speed_step = 0
         
-        self._run_on_cancel_fn = None
-        
         # Kalibrierungs-Daten
         self._is_calibrating = False
-        self._calibration_step_cancel = None
-        self._power_profile = {
-            "off": 0.0,
-            1: 0.0,
-            2: 0.0,
-            3: 0.0,
-            "boost": 0.0
-        }
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._entry_id)},
-            name=self._name,
-            manufacturer="Faber",
-            model="Skypad",
-            # via_device entfernt
-        )
-
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def unique_id(self):
-        return f"{self._entry_id}_fan"
-
-    @property
-    def supported_features(self):
-        return FanEntityFeature.SET_SPEED | FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF | FanEntityFeature.PRESET_MODE
+        self._calibration_task = None
+        self._calibration_cancel_requested = False
+        self._calibration_hood_on = False
+        self._calibration_light_toggled = False
+        # Gemeinsames, persistentes Profil aus den Runtime Daten
+        self._power_profile = runtime_data.power_profile
+        self._attributes_key = None
+        self._attributes = None
 
     @property
     def is_on(self):
@@ -119,27 +137,36 @@ class FaberFan(FanEntity):
     def preset_mode(self):
         return self._preset_mode
 
-    @property
-    def preset_modes(self):
-        return [PRESET_BOOST]
-
     @property
     def _run_on_active(self):
         return self._runtime_data.run_on_active
-
-    @_run_on_active.setter
-    def _run_on_active(self, value):
-        if self._runtime_data.run_on_active != value:
-            self._runtime_data.run_on_active = value
-            if not value:
-                self._runtime_data.run_on_finish_time = None
-            self._runtime_data.trigger_update()
         
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
+        """Attribute werden nur neu gebaut, wenn sich ihre Quellen geändert haben."""
+        key = (
+            self._run_on_active,
+            self._runtime_data.run_on_level,
+            self._is_calibrating,
+            self._runtime_data.calibration.state,
+            self._corrections_applied,
+            self._pacing.delay,
+            tuple(self._power_profile.values()),
+            self._runtime_data.light_offset,
+        )
+        if key != self._attributes_key:
+            self._attributes_key = key
+            self._attributes = self._build_state_attributes()
+        return self._attributes
+
+    def _build_state_attributes(self) -> Dict[str, Any]:
         attrs = {
             "run_on_active": self._run_on_active,
-            "calibration_mode": self._is_calibrating
+            "run_on_level": self._runtime_data.run_on_level,
+            "calibration_mode": self._is_calibrating,
+            "calibration_state": self._runtime_data.calibration.state,
+            "drift_corrections": self._corrections_applied,
+            "command_delay": self._pacing.delay,
         }
         if self._power_sensor:
             # Zeige die gelernten Werte im GUI
@@ -148,70 +175,84 @@ class FaberFan(FanEntity):
             attrs["power_profile_2"] = f"{self._power_profile.get(2, 0):.1f} W"
             attrs["power_profile_3"] = f"{self._power_profile.get(3, 0):.1f} W"
             attrs["power_profile_boost"] = f"{self._power_profile.get('boost', 0):.1f} W"
+            attrs["power_profile_light"] = f"+{self._runtime_data.light_offset:.1f} W"
         return attrs
 
+    async def async_will_remove_from_hass(self):
+        self._cancel_reconcile()
+        self._async_stop_auto()
+        await self.async_cancel_calibration()
+
     async def async_added_to_hass(self):
-        if self._power_sensor:
-            self.async_on_remove(
-                async_track_state_change_event(
-                    self.hass, [self._power_sensor], self._async_power_sensor_changed
-                )
-            )
-            # Versuche existierende Werte zu laden (Fallback)
-            state = self.hass.states.get(self._power_sensor)
-            if state and state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-                try:
-                    self._power_profile["off"] = float(state.state)
-                except ValueError:
-                    pass
+        # Zuletzt bekannte Stufe aus dem Speicher übernehmen
+        restored_step = self._runtime_data.last_speed_step
+        if restored_step in SPEED_MAPPING:
+            self._is_on = True
+            self._current_speed_step = restored_step
+            self._percentage = SPEED_MAPPING[restored_step]
 
-    # --- POWER SENSOR LOGIK ---
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._async_coordinator_updated)
+        )
+        # Bereits vorliegende Erkennung (z.B. binärer Sensor beim Start) übernehmen
+        self._async_coordinator_updated()
 
     @callback
-    def _async_power_sensor_changed(self, event):
-        """Erkennt den Status anhand der gelernten Profile."""
-        if self._is_calibrating:
-            return
+    def _async_commit_state(self):
+        """Schreibt den Zustand und merkt sich die Stufe für den nächsten Start.
+
+        Hält außerdem den Boost-Timer passend zum Preset: Ein erkannter Boost
+        (z.B. an der Haube gestartet) startet ihn, jedes Verlassen bricht ihn ab.
+        Ebenso endet die Automatik, sobald das Preset AUTO verlassen wird.
+        """
+        boost = self._is_on and self._preset_mode == PRESET_BOOST
+        if boost and not self._runtime_data.boost_active:
+            self._coordinator.async_start_boost(BOOST_DURATION, self._reset_boost_status)
+        elif not boost and self._runtime_data.boost_active:
+            self._coordinator.async_cancel_boost()
+        if self._auto_unsub and not (self._is_on and self._preset_mode == PRESET_AUTO):
+            self._async_stop_auto()
+        self._runtime_data.update_speed_step(self._current_speed_step if self._is_on else 0)
+        self.async_write_ha_state_if_changed()
 
-        new_state = event.data.get("new_state")
-        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-            return
+    # --- POWER SENSOR LOGIK ---
 
-        try:
-            current_power = float(new_state.state)
-        except ValueError:
-            # Fallback für binäre Sensoren
-            if new_state.state == STATE_ON:
-                self._update_state_from_binary(True)
-            elif new_state.state == STATE_OFF:
-                self._update_state_from_binary(False)
+    @callback
+    def _async_coordinator_updated(self):
+        """Übernimmt neue Erkennungsergebnisse des Koordinators."""
+        serial = self._coordinator.detection_serial
+        if serial == self._seen_detection_serial or self._is_calibrating:
             return
+        self._seen_detection_serial = serial
+
+        if self._coordinator.is_binary:
+            self._update_state_from_binary(self._coordinator.running)
+        elif self._coordinator.mode is not None:
+            if self._intent_lock.locked():
+                # Die Erkennung zeigt noch den Stand vor den gerade gesendeten Pulsen,
+                # der Abgleich nach der Absicht vergleicht mit der Messung
+                return
+            if self._expected_mode is not None:
+                if self._coordinator.mode != self._expected_mode:
+                    # Übergang nach optimistischem Befehl, der Abgleich entscheidet
+                    return
+                self._pacing.record_latency(time.monotonic() - self._expected_since)
+                self._report_pacing(True)
+                self._cancel_reconcile()
+            self._homing.confirm()
+            self._async_apply_detected_mode(self._coordinator.mode)
 
-        # Profil-Matching
-        best_match = None
-        min_diff = float("inf")
-
-        for mode, profile_watt in self._power_profile.items():
-            if profile_watt == 0 and mode != "off": continue
-            
-            diff = abs(current_power - profile_watt)
-            if diff < min_diff:
-                min_diff = diff
-                best_match = mode
+    @callback
+    def _async_apply_detected_mode(self, best_match, force=False):
+        """Gleicht den Zustand mit einem stabil erkannten Modus ab.
 
-        # Entscheidung treffen
+        Mit `force` wird die Messung auch übernommen, wenn nur das optimistisch
+        angezeigte Ziel von ihr abweicht.
+        """
         detected_on = False
         detected_speed = 0
         detected_preset = None
 
-        # Fallback Logik wenn keine Kalibrierung
-        if self._power_profile[1] == 0:
-            threshold = self._power_profile["off"] + FALLBACK_THRESHOLD
-            if current_power > threshold:
-                best_match = 1
-            else:
-                best_match = "off"
-
         # Auswerten
         if best_match == "off":
             detected_on = False
@@ -228,29 +269,31 @@ class FaberFan(FanEntity):
              if not detected_on:
                  self._cancel_run_on_timer()
                  self._is_on = False
-                 self.async_write_ha_state()
+                 self._async_commit_state()
              return
 
+        # Die Automatik fährt normale Stufen, erst eine fremde Stufe oder ein Boost beendet sie
+        current_preset = None if self._preset_mode == PRESET_AUTO else self._preset_mode
+
         # Synchronisierung
-        if min_diff <= MATCH_TOLERANCE or (best_match == "off") or (self._power_profile[1] == 0):
-            if detected_on != self._is_on or (detected_on and (detected_speed != self._current_speed_step or detected_preset != self._preset_mode)):
-                _LOGGER.debug(f"Sync: Erkannt={best_match} ({current_power}W), Diff={min_diff:.1f}")
-                
-                self._is_on = detected_on
-                if not detected_on:
-                    self._percentage = 0
-                    self._current_speed_step = 0
-                    self._preset_mode = None
+        if force or detected_on != self._is_on or (detected_on and (detected_speed != self._current_speed_step or detected_preset != current_preset)):
+            _LOGGER.debug("Sync: Erkannt=%s", best_match)
+            
+            self._is_on = detected_on
+            if not detected_on:
+                self._percentage = 0
+                self._current_speed_step = 0
+                self._preset_mode = None
+            else:
+                self._preset_mode = detected_preset
+                if detected_preset == PRESET_BOOST:
+                     self._percentage = 100
+                     self._current_speed_step = 3
                 else:
-                    self._preset_mode = detected_preset
-                    if detected_preset == PRESET_BOOST:
-                         self._percentage = 100
-                         self._current_speed_step = 3
-                    else:
-                        self._current_speed_step = detected_speed
-                        self._percentage = SPEED_MAPPING[detected_speed]
+                    self._current_speed_step = detected_speed
+                    self._percentage = SPEED_MAPPING[detected_speed]
 
-                self.async_write_ha_state()
+            self._async_commit_state()
 
     def _update_state_from_binary(self, is_running):
         """Einfaches Update für Binary Sensoren ohne Watt-Messung."""
@@ -258,7 +301,7 @@ class FaberFan(FanEntity):
              if not is_running:
                  self._cancel_run_on_timer()
                  self._is_on = False
-                 self.async_write_ha_state()
+                 self._async_commit_state()
              return
 
         if is_running != self._is_on:
@@ -271,69 +314,215 @@ class FaberFan(FanEntity):
                 self._percentage = 0
                 self._current_speed_step = 0
                 self._preset_mode = None
-            self.async_write_ha_state()
+            self._async_commit_state()
 
     # --- KALIBRIERUNG LOGIK ---
 
-    async def async_start_calibration(self):
-        """Startet den automatischen Lernlauf."""
+    async def async_start_calibration(self, modes=None):
+        """Startet den automatischen Lernlauf (optional nur für bestimmte Stufen)."""
         if self._is_calibrating:
             _LOGGER.warning("Kalibrierung läuft bereits.")
             return
+        if not self._power_sensor:
+            _LOGGER.warning("Kalibrierung benötigt einen Leistungssensor.")
+            return
+
+        modes = set(modes) if modes else set(CALIBRATION_MODES)
+        if modes & {"off", "light"}:
+            # Der Licht-Offset wird immer gegen die Baseline desselben Laufs bestimmt
+            modes.update(("off", "light"))
 
         _LOGGER.info("Starte Faber Skypad Kalibrierung...")
         self._is_calibrating = True
-        self.async_write_ha_state()
-
-        # Start: Ausschalten um Baseline zu finden
-        await self._send_command_raw(CMD_TURN_ON_OFF)
-        self._calibration_step_cancel = async_call_later(self.hass, 6.0, self._calib_step_0_measure_off)
-
-    async def _calib_step_0_measure_off(self, _now):
-        val = self._get_current_power()
-        self._power_profile["off"] = val
-        _LOGGER.info(f"Kalibrierung: Baseline (Off) = {val} W")
-        
-        await self._send_command_raw(CMD_TURN_ON_OFF)
-        self._calibration_step_cancel = async_call_later(self.hass, CALIBRATION_WAIT_TIME, self._calib_step_1_measure)
-
-    async def _calib_step_1_measure(self, _now):
-        val = self._get_current_power()
-        self._power_profile[1] = val
-        _LOGGER.info(f"Kalibrierung: Stufe 1 = {val} W")
-
-        await self._send_command_raw(CMD_INCREASE)
-        self._calibration_step_cancel = async_call_later(self.hass, CALIBRATION_WAIT_TIME, self._calib_step_2_measure)
-
-    async def _calib_step_2_measure(self, _now):
-        val = self._get_current_power()
-        self._power_profile[2] = val
-        _LOGGER.info(f"Kalibrierung: Stufe 2 = {val} W")
-
-        await self._send_command_raw(CMD_INCREASE)
-        self._calibration_step_cancel = async_call_later(self.hass, CALIBRATION_WAIT_TIME, self._calib_step_3_measure)
-
-    async def _calib_step_3_measure(self, _now):
-        val = self._get_current_power()
-        self._power_profile[3] = val
-        _LOGGER.info(f"Kalibrierung: Stufe 3 = {val} W")
-
-        await self._send_command_raw(CMD_BOOST)
-        self._calibration_step_cancel = async_call_later(self.hass, CALIBRATION_WAIT_TIME, self._calib_step_boost_measure)
-
-    async def _calib_step_boost_measure(self, _now):
-        val = self._get_current_power()
-        self._power_profile["boost"] = val
-        _LOGGER.info(f"Kalibrierung: Boost = {val} W")
+        self._calibration_cancel_requested = False
+        self._calibration_task = self.hass.async_create_task(self._async_calibration_task(modes))
+
+    async def async_repair_calibration(self):
+        """Misst nur die Stufen neu, deren Werte unplausibel sind."""
+        modes = inconsistent_levels(self._power_profile, self._runtime_data.power_stats)
+        if not modes:
+            _LOGGER.info("Kalibrierung ist konsistent, keine Nachmessung nötig.")
+            return
+        _LOGGER.info("Messe unplausible Stufen neu: %s", sorted(modes, key=str))
+        await self.async_start_calibration(modes)
+
+    async def async_cancel_calibration(self):
+        """Bricht eine laufende Kalibrierung ab und wartet auf ihr Aufräumen.
+
+        Das Aufräumen schaltet die Haube wieder aus; beim Entladen muss es
+        fertig sein, bevor die Befehlswarteschlange geschlossen wird.
+        """
+        task = self._calibration_task
+        if task and not task.done():
+            self._calibration_cancel_requested = True
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
-        await self._send_command_raw(CMD_TURN_ON_OFF)
-        
+    async def _async_calibration_task(self, modes):
+        """Führt die Zustandsmaschine mit Watchdog aus und räumt in jedem Fall auf."""
+        progress = self._runtime_data.calibration
+        # Langsame Sensoren brauchen länger für ein volles Messfenster
+        steps = [
+            (mode, command, step_timeout(timeout, self._coordinator.sample_interval))
+            for mode, command, timeout in CALIBRATION_STEPS
+        ]
+        timeouts = [timeout if mode in modes else 0 for mode, _command, timeout in steps]
+        progress.start(timeouts)
+        self._calibration_hood_on = False
+        self._calibration_light_toggled = False
+        self._async_commit_state()
+        self._coordinator.async_update_listeners()
+
+        result = STATE_FAILED
+        try:
+            await asyncio.wait_for(
+                self._async_run_calibration_steps(steps, modes),
+                sum(timeouts) + CALIBRATION_WATCHDOG_TIME,
+            )
+            unsettled = [
+                mode for mode in CALIBRATION_MODES
+                if mode in modes and not self._runtime_data.power_stats.get(mode, {}).get("settled", True)
+            ]
+            if unsettled:
+                _LOGGER.warning(
+                    "Kalibrierung: %s nicht eingeschwungen, 'Kalibrierung reparieren' misst neu.",
+                    ", ".join(str(mode) for mode in unsettled),
+                )
+                result = STATE_UNSETTLED
+            else:
+                result = STATE_DONE
+        except asyncio.TimeoutError:
+            _LOGGER.error("Kalibrierung abgebrochen: Zeitlimit überschritten.")
+        except asyncio.CancelledError:
+            if not self._calibration_cancel_requested:
+                raise
+            result = STATE_CANCELLED
+            _LOGGER.info("Kalibrierung abgebrochen.")
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Kalibrierung fehlgeschlagen.")
+        finally:
+            await self._async_finish_calibration(result)
+
+    async def _async_run_calibration_steps(self, steps, modes):
+        """Arbeitet die Schritttabelle ab: Befehl senden, dann messen oder überspringen."""
+        progress = self._runtime_data.calibration
+
+        # Ausschalten um Baseline zu finden (nur wenn die Haube läuft)
+        if self._is_on or self._run_on_active:
+            self._calibration_hood_on = True
+            await self._send_command(COMMAND_POWER)
+            self._calibration_hood_on = False
+
+        # Stufen ohne Licht messen; ein erkannt eingeschaltetes Licht am Ende wiederherstellen
+        if "light" not in modes and self._coordinator.light_on:
+            await self._send_command(COMMAND_LIGHT)
+            self._calibration_light_toggled = True
+
+        for mode, command, timeout in steps:
+            progress.advance(mode)
+            self._coordinator.async_update_listeners()
+            if mode == "light" and mode not in modes:
+                continue
+            if command is not None:
+                await self._send_command(command)
+                if command == COMMAND_POWER:
+                    self._calibration_hood_on = not self._calibration_hood_on
+                elif command == COMMAND_LIGHT:
+                    self._calibration_light_toggled = not self._calibration_light_toggled
+            if mode == "light":
+                await self._async_store_light_level(await self._async_measure_level(timeout))
+            elif mode in modes:
+                self._store_calibration_level(mode, await self._async_measure_level(timeout))
+
+    async def _async_finish_calibration(self, result):
+        """Schaltet die Haube aus und übernimmt die gemessenen Werte."""
+        if self._calibration_hood_on:
+            try:
+                await self._command_queue.async_submit([COMMAND_POWER], priority=True)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Haube konnte nach der Kalibrierung nicht ausgeschaltet werden.")
+        if self._calibration_light_toggled:
+            try:
+                await self._command_queue.async_submit([COMMAND_LIGHT])
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Licht konnte nach der Kalibrierung nicht zurückgeschaltet werden.")
+        self._calibration_hood_on = False
+        self._calibration_light_toggled = False
+        self._calibration_task = None
+
+        self._runtime_data.calibration.finish(result)
         self._is_calibrating = False
         self._is_on = False
         self._percentage = 0
+        self._current_speed_step = 0
         self._preset_mode = None
-        self.async_write_ha_state()
-        _LOGGER.info("Kalibrierung abgeschlossen. Werte gespeichert.")
+        self._coordinator.async_reset_classifier()
+        self._runtime_data.async_schedule_save()
+        self._async_commit_state()
+        self._coordinator.async_update_listeners()
+        if result in (STATE_DONE, STATE_UNSETTLED):
+            _LOGGER.info("Kalibrierung abgeschlossen. Werte gespeichert.")
+
+    async def _async_measure_level(self, timeout):
+        """Sammelt Messwerte bis die Stufe eingeschwungen ist, höchstens `timeout` Sekunden."""
+        sampler = FaberLevelSampler(time.monotonic())
+        settled = self.hass.loop.create_future()
+
+        @callback
+        def _sample(event):
+            new_state = event.data.get("new_state")
+            if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+                return
+            try:
+                value = float(new_state.state)
+            except ValueError:
+                return
+            if sampler.add(value, time.monotonic()) and not settled.done():
+                settled.set_result(None)
+
+        unsub = async_track_state_change_event(self.hass, [self._power_sensor], _sample)
+        try:
+            await asyncio.wait_for(settled, timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.debug("Stufe nach %s s nicht eingeschwungen", timeout)
+        finally:
+            unsub()
+
+        if not sampler.samples:
+            # Sensor meldet nur Änderungen: aktuellen Wert übernehmen
+            sampler.add(self._get_current_power(), time.monotonic())
+        return sampler.result()
+
+    def _store_calibration_level(self, mode, stats):
+        """Übernimmt das Messergebnis einer Stufe in Profil und Statistik."""
+        self._power_profile[mode] = stats["mean"]
+        self._runtime_data.power_stats[mode] = stats
+        _LOGGER.info(
+            "Kalibrierung: %s = %.1f W (σ %.2f W, %s Werte)",
+            mode, stats["mean"], stats["std"], stats["count"],
+        )
+
+    async def _async_store_light_level(self, stats):
+        """Bestimmt den Licht-Offset aus der Messung nach dem Umschalten des Lichts.
+
+        Der Zustand des Lichts vor der Kalibrierung ist unbekannt. Steigt die
+        Leistung, war es aus und wird für die Stufen wieder ausgeschaltet.
+        Sinkt sie, war es an: Die neue Messung ist dann die eigentliche
+        Baseline, und das Licht wird erst am Ende wieder eingeschaltet.
+        """
+        offset = stats["mean"] - self._power_profile["off"]
+        if offset < 0:
+            self._runtime_data.power_stats["light"] = self._runtime_data.power_stats["off"]
+            self._store_calibration_level("off", stats)
+        else:
+            self._runtime_data.power_stats["light"] = stats
+            await self._send_command(COMMAND_LIGHT)
+            self._calibration_light_toggled = False
+        self._runtime_data.light_offset = abs(offset)
+        _LOGGER.info("Kalibrierung: Licht = +%.1f W", abs(offset))
 
     def _get_current_power(self):
         if not self._power_sensor: return 0.0
@@ -345,156 +534,570 @@ class FaberFan(FanEntity):
                 pass
         return 0.0
 
-    async def _send_command_raw(self, command):
-        """Sendet einen Befehl an die Remote mit Hold-Zeit."""
-        cmd_formatted = command if command.startswith("b64:") else f"b64:{command}"
-        await self.hass.services.async_call(
-            "remote",
-            "send_command",
-            {
-                "entity_id": self._remote_entity,
-                "command": [cmd_formatted],
-                "hold_secs": CMD_HOLD_SECS,
-            },
-        )
-
     # --- NORMALE STEUERUNG ---
 
     async def _send_command(self, command):
-        await self._send_command_raw(command)
-        await asyncio.sleep(DEFAULT_DELAY)
+        """Reiht einen einzelnen Befehl in die Warteschlange der Haube ein."""
+        await self._command_queue.async_submit([command])
+
+    def _plan_speed_change(self, target_step, max_pulses=None):
+        """Berechnet die nötigen Pulse vom aktuellen Stand zum Ziel (relativ oder mit Homing)."""
+        commands, homed = self._homing.plan(
+            self._current_speed_step or 1, target_step, self._can_verify(), max_pulses
+        )
+        if homed:
+            _LOGGER.debug("Stufe %s über Homing (%s Pulse)", target_step, len(commands))
+            self._runtime_data.metrics.inc(METRIC_HOMED_MOVES)
+        return commands
+
+    @callback
+    def _on_speed_pulse(self, commands):
+        """Führt die Stufe nach jedem Aufruf der Remote nach und übernimmt sie sofort.
+
+        So bleibt der Zustand auch dann stimmig, wenn eine neuere Absicht die
+        Pulsfolge an der nächsten Pulsgrenze abbricht. Im Batch-Modus kommt die
+        ganze Folge in einem Aufruf, geschrieben wird dann nur der Endstand.
+        """
+        moved = False
+        for command in commands:
+            current = self._current_speed_step or 1
+            if command == COMMAND_INCREASE:
+                self._current_speed_step = min(current + 1, 3)
+            elif command == COMMAND_DECREASE:
+                self._current_speed_step = max(current - 1, 1)
+            else:
+                continue
+            self._homing.on_pulse()
+            moved = True
+        if not moved:
+            return
+        if self._is_on and not self._optimistic:
+            # Im optimistischen Modus bleibt das angezeigte Ziel stehen
+            self._percentage = SPEED_MAPPING[self._current_speed_step]
+            if self._preset_mode == PRESET_BOOST:
+                # AUTO bleibt bestehen, ihre Pulse stammen von der Automatik selbst
+                self._preset_mode = None
+        self._async_commit_state()
 
     def _cancel_run_on_timer(self):
-        if self._run_on_cancel_fn:
-            self._run_on_cancel_fn()
-            self._run_on_cancel_fn = None
-        self._run_on_active = False
+        self._coordinator.async_cancel_run_on()
+
+    # --- OPTIMISTISCHER MODUS & ABGLEICH ---
+
+    async def _async_dispatch(self, coro):
+        """Sendet direkt oder im optimistischen Modus im Hintergrund."""
+        if not self._optimistic:
+            await coro
+            return
+        self.hass.async_create_task(self._async_send_in_background(coro, self._intent_generation))
+
+    async def _async_send_in_background(self, coro, generation):
+        try:
+            await coro
+        except Exception as err:
+            _LOGGER.error("Senden im Hintergrund fehlgeschlagen: %s", err)
+            if not self._command_queue.is_current(INTENT_SPEED, generation):
+                # Eine neuere Absicht hat das angezeigte Ziel bereits ersetzt
+                return
+            self._schedule_rollback()
+
+    def _schedule_rollback(self):
+        """Setzt den Zustand auf die Messung zurück, sobald die Erkennung nachzieht.
+
+        Direkt nach dem Fehler zeigt die Erkennung womöglich noch die Stufe vor
+        den bereits gesendeten Pulsen. Gewartet wird daher wie beim Abgleich;
+        eine neue Absicht bricht das Zurücksetzen ab.
+        """
+        self._cancel_reconcile()
+        self._expected_since = time.monotonic()
+        self._expected_samples = self._coordinator.sample_count
+        self._reconcile_timer = self._runtime_data.timers.async_call_later(
+            self._coordinator.detection_delay() + VERIFY_SETTLE_TIME, self._async_rollback
+        )
+
+    @callback
+    def _async_rollback(self):
+        self._reconcile_timer = None
+        wait = self._coordinator.detection_settling(self._expected_samples)
+        if wait is not None and time.monotonic() - self._expected_since + wait <= VERIFY_MAX_SETTLE_TIME:
+            self._reconcile_timer = self._runtime_data.timers.async_call_later(wait, self._async_rollback)
+            return
+        if self._coordinator.mode is not None and not self._is_calibrating:
+            self._async_apply_detected_mode(self._coordinator.mode, force=True)
+
+    async def _async_send_and_expect(self, commands, mode, prefix=(), priority=False, key=None, generation=None):
+        completed = await self._command_queue.async_submit(
+            commands, key=key, prefix=prefix, priority=priority, generation=generation
+        )
+        if completed and (key is None or self._command_queue.is_current(key, generation)):
+            self._expect_mode(mode)
+
+    def _can_verify(self):
+        """Nur mit kalibriertem Profil: Der Fallback unterscheidet nur an/aus."""
+        return bool(
+            self._verify
+            and self._power_sensor
+            and not self._coordinator.is_binary
+            and self._power_profile[1] != 0
+        )
+
+    def _expect_mode(self, mode, attempt=0):
+        """Plant den Abgleich des gesendeten Ziels mit dem Leistungssensor.
+
+        Gewartet wird mindestens die Erkennungszeit des Klassifikators (Median-
+        Fenster im gemessenen Sensortakt plus Verweilzeit) zuzüglich Anlaufzeit,
+        bei gelernter Latenz auch länger.
+        """
+        if not self._can_verify():
+            return
+        self._cancel_reconcile()
+        self._expected_mode = mode
+        self._expected_since = time.monotonic()
+        self._expected_samples = self._coordinator.sample_count
+        self._correction_attempt = attempt
+        settle_time = self._pacing.settle_time(
+            self._coordinator.detection_delay() + VERIFY_SETTLE_TIME, VERIFY_MAX_SETTLE_TIME
+        )
+        self._reconcile_timer = self._runtime_data.timers.async_call_later(settle_time, self._async_reconcile)
+
+    def _cancel_reconcile(self):
+        if self._reconcile_timer:
+            self._reconcile_timer.cancel()
+            self._reconcile_timer = None
+        self._expected_mode = None
+
+    @callback
+    def _async_reconcile(self):
+        """Gleicht das gesendete Ziel mit der Messung ab.
+
+        Verpasste oder doppelt gezählte Pulse zwischen den Stufen werden mit
+        Ausgleichspulsen korrigiert (höchstens DRIFT_CORRECTION_RETRIES mal),
+        alle anderen Abweichungen übernehmen die Messung.
+        """
+        self._reconcile_timer = None
+        expected = self._expected_mode
+        measured = self._coordinator.mode
+        if measured is not None and measured != expected and not self._is_calibrating:
+            wait = self._coordinator.detection_settling(self._expected_samples)
+            if wait is not None:
+                if time.monotonic() - self._expected_since + wait <= VERIFY_MAX_SETTLE_TIME:
+                    self._reconcile_timer = self._runtime_data.timers.async_call_later(
+                        wait, self._async_reconcile
+                    )
+                    return
+                # Ohne neue Messwerte ist kein Urteil möglich: nichts korrigieren
+                _LOGGER.debug("Zustand %s nicht überprüfbar, Erkennung zieht nicht nach", expected)
+                self._expected_mode = None
+                return
+        self._expected_mode = None
+        if measured is None or self._is_calibrating:
+            return
+        self._report_pacing(measured == expected)
+        if measured == expected:
+            return
+
+        correction = self._plan_correction(expected, measured)
+        if correction and self._correction_attempt < DRIFT_CORRECTION_RETRIES:
+            _LOGGER.info(
+                "Drift erkannt: Ziel %s, gemessen %s, sende Korrektur (%s/%s)",
+                expected, measured, self._correction_attempt + 1, DRIFT_CORRECTION_RETRIES,
+            )
+            self._corrections_applied += 1
+            self._current_speed_step = measured
+            self.hass.async_create_task(
+                self._async_send_correction(
+                    correction,
+                    expected,
+                    self._correction_attempt + 1,
+                    self._command_queue.generation(INTENT_SPEED),
+                )
+            )
+            return
+
+        _LOGGER.warning(
+            "Zustand %s nicht bestätigt (gemessen: %s), übernehme Messung", expected, measured
+        )
+        self._async_apply_detected_mode(measured)
+
+    def _report_pacing(self, success):
+        """Meldet das Ergebnis der letzten Pulsfolge an Taktung und Homing."""
+        self._homing.report(success)
+        if self._pacing.report(success):
+            _LOGGER.debug("Pulsabstand angepasst: %.2f s", self._pacing.delay)
+            self._runtime_data.async_schedule_save()
+
+    def _plan_correction(self, expected, measured):
+        """Ausgleichspulse für eine Abweichung zwischen zwei laufenden Stufen."""
+        if measured not in SPEED_MAPPING:
+            return None
+        if expected == "boost":
+            return lambda: [COMMAND_BOOST]
+        if expected in SPEED_MAPPING:
+            return lambda: self._plan_speed_change(expected)
+        return None
+
+    async def _async_send_correction(self, plan, expected, attempt, generation):
+        # Ohne Sperre und ohne zu überholen: Jede neuere Absicht ersetzt die Korrektur
+        completed = await self._command_queue.async_submit(
+            plan, key=INTENT_SPEED, on_pulse=self._on_speed_pulse, generation=generation
+        )
+        if completed and self._command_queue.is_current(INTENT_SPEED, generation):
+            self._expect_mode(expected, attempt)
+
+    # --- ABSICHTEN ---
+    # Jede Service-Absicht läuft exklusiv unter `_intent_lock`. Absichten, die ein
+    # neues Ziel setzen, überholen vorher laufende Stufenwechsel an der nächsten
+    # Pulsgrenze, damit die ältere Absicht die Sperre schnell wieder freigibt.
+    # Jede Absicht merkt sich beim Aufruf die Generation der Stufenabsichten;
+    # wurde sie überholt, während sie auf die Sperre gewartet hat, entfällt sie
+    # ganz. So sendet eine Folge von Slider-Bewegungen nur zum letzten Ziel.
+
+    def _preempt_speed(self):
+        """Verwirft wartende und laufende Stufenwechsel zugunsten einer neuen Absicht."""
+        # Ein ausstehender Abgleich darf die neue Absicht nicht mehr korrigieren
+        self._cancel_reconcile()
+        return self._command_queue.supersede(INTENT_SPEED)
+
+    def _begin_intent(self, generation):
+        """Prüft nach dem Warten auf die Sperre, ob die Absicht noch gilt."""
+        if not self._command_queue.is_current(INTENT_SPEED, generation):
+            _LOGGER.debug("Absicht vor der Ausführung überholt")
+            return False
+        self._cancel_reconcile()
+        self._intent_generation = generation
+        return True
 
     async def async_turn_on(self, percentage: Optional[int] = None, preset_mode: Optional[str] = None, **kwargs: Any) -> None:
-        if self._is_calibrating: return
+        if percentage or preset_mode:
+            generation = self._preempt_speed()
+        else:
+            generation = self._command_queue.generation(INTENT_SPEED)
+        async with self._intent_lock:
+            if self._begin_intent(generation):
+                await self._async_turn_on(percentage, preset_mode)
 
-        was_in_run_on = self._run_on_active
-        self._cancel_run_on_timer()
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        generation = self._preempt_speed()
+        async with self._intent_lock:
+            if self._begin_intent(generation):
+                await self._async_turn_off()
 
-        if not self._is_on:
-            if was_in_run_on:
-                _LOGGER.debug("Übernehme aktiven Nachlauf in normalen Betrieb.")
-            else:
-                await self._send_command(CMD_TURN_ON_OFF)
-            
-            self._is_on = True
-            self._current_speed_step = 1
-            self._percentage = SPEED_MAPPING[1]
-        
+    async def async_set_percentage(self, percentage: int) -> None:
+        generation = self._preempt_speed()
+        async with self._intent_lock:
+            if self._begin_intent(generation):
+                await self._async_set_percentage(percentage)
+
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        generation = self._preempt_speed()
+        async with self._intent_lock:
+            if self._begin_intent(generation):
+                await self._async_set_preset_mode(preset_mode)
+
+    async def _async_turn_on(self, percentage, preset_mode):
+        if self._is_calibrating: return
+
+        # Einschaltpuls wird mit dem folgenden Stufen- oder Boost-Befehl gebündelt
         if percentage:
-            await self.async_set_percentage(percentage)
+            await self._async_set_percentage(percentage)
         elif preset_mode:
-            await self.async_set_preset_mode(preset_mode)
+            await self._async_set_preset_mode(preset_mode)
+        else:
+            power_on = self._begin_turn_on()
+            if power_on:
+                await self._async_dispatch(self._async_send_and_expect(power_on, 1))
             
-        self.async_write_ha_state()
+        self._async_commit_state()
 
-    async def async_turn_off(self, **kwargs: Any) -> None:
+    def _begin_turn_on(self):
+        """Übernimmt den Einschaltzustand und liefert den nötigen Einschaltpuls."""
+        was_in_run_on = self._run_on_active
+        self._cancel_run_on_timer()
+
+        if self._is_on:
+            return []
+
+        # Zustand vor dem Senden setzen, damit parallele Aufrufe nicht erneut toggeln
+        self._is_on = True
+
+        if was_in_run_on:
+            # Die Haube läuft noch in der Stufe der aktuellen Nachlauf-Phase
+            _LOGGER.debug("Übernehme aktiven Nachlauf in normalen Betrieb.")
+            self._current_speed_step = self._current_speed_step or 1
+            self._percentage = SPEED_MAPPING[self._current_speed_step]
+            return []
+
+        self._current_speed_step = 1
+        self._percentage = SPEED_MAPPING[1]
+        return [COMMAND_POWER]
+
+    async def _async_turn_off(self):
         if self._is_calibrating: return
 
         if (self._is_on and 
             self._runtime_data.run_on_enabled and 
             not self._run_on_active):
             
-            _LOGGER.info("Nachlauf aktiviert. Schalte auf Stufe 1 für %s Sekunden.", self._runtime_data.run_on_seconds)
-            
-            await self.async_set_percentage(33)
+            stages = self._run_on_stages()
+            _LOGGER.info("Nachlauf aktiviert: %s", ", ".join(f"Stufe {level} für {seconds} s" for level, seconds in stages))
             
-            delay = self._runtime_data.run_on_seconds 
+            await self._async_set_percentage(SPEED_MAPPING[stages[0][0]])
             
-            self._runtime_data.run_on_finish_time = dt_util.utcnow() + timedelta(seconds=delay)
-            self._run_on_active = True 
+            self._coordinator.async_start_run_on(
+                stages,
+                self._async_run_on_stage,
+                self._async_finish_run_on,
+            )
             
             self._is_on = False
             self._percentage = 0
             self._preset_mode = None
-            self.async_write_ha_state()
-            
-            self._run_on_cancel_fn = async_call_later(
-                self.hass, 
-                delay, 
-                self._async_execute_final_turn_off_callback
-            )
+            self._async_commit_state()
             return
 
         await self._async_execute_final_turn_off()
 
-    async def _async_execute_final_turn_off_callback(self, _now):
-        await self._async_execute_final_turn_off()
+    def _run_on_stages(self):
+        """Phasen des Nachlaufs: das konfigurierte Profil oder Stufe 1 für die eingestellte Dauer."""
+        profile = self._runtime_data.config.get(CONF_RUN_ON_PROFILE)
+        if profile:
+            return [tuple(stage) for stage in profile]
+        return [(1, self._runtime_data.run_on_seconds)]
+
+    async def _async_run_on_stage(self, level):
+        """Nächste Phase des Nachlaufs (Timer des Koordinators): ein Stufenwechsel."""
+        async with self._intent_lock:
+            generation = self._command_queue.generation(INTENT_SPEED)
+            if not self._run_on_active or not self._begin_intent(generation):
+                return
+            completed = await self._command_queue.async_submit(
+                lambda: self._plan_speed_change(level),
+                key=INTENT_SPEED,
+                on_pulse=self._on_speed_pulse,
+                generation=generation,
+            )
+            if completed and self._command_queue.is_current(INTENT_SPEED, generation):
+                self._expect_mode(level)
+
+    async def _async_finish_run_on(self):
+        """Ende des Nachlaufs (Timer oder Sensor des Koordinators).
+
+        Eine Absicht, die währenddessen die Sperre hielt, hat den Nachlauf
+        beendet oder die Stufe neu gesetzt; dann bleibt die Haube an.
+        """
+        generation = self._command_queue.generation(INTENT_SPEED)
+        async with self._intent_lock:
+            if not self._run_on_active or not self._begin_intent(generation):
+                return
+            await self._async_execute_final_turn_off()
 
     async def _async_execute_final_turn_off(self):
         was_in_run_on = self._run_on_active
         self._cancel_run_on_timer()
 
         if self._is_on or was_in_run_on:
-            await self._send_command(CMD_TURN_ON_OFF)
+            # Ausstehende Stufenwechsel sind durch das Ausschalten überholt
+            self._command_queue.supersede(INTENT_SPEED)
             self._is_on = False
             self._percentage = 0
             self._current_speed_step = 0
             self._preset_mode = None
-            self.async_write_ha_state()
+            await self._async_dispatch(
+                self._async_send_and_expect([COMMAND_POWER], "off", priority=True)
+            )
+            self._async_commit_state()
 
-    async def async_set_percentage(self, percentage: int) -> None:
+    async def _async_set_percentage(self, percentage):
         if self._is_calibrating: return
 
         if percentage == 0:
-            await self.async_turn_off()
+            await self._async_turn_off()
             return
-            
-        if self._run_on_active and percentage != SPEED_MAPPING[1]:
-             self._cancel_run_on_timer()
 
-        if not self._is_on:
-            await self.async_turn_on()
+        if self._preset_mode == PRESET_AUTO:
+            # Eine manuelle Stufe beendet die Automatik sofort
+            self._preset_mode = None
+            self._async_stop_auto()
+
+        power_on = self._begin_turn_on() if not self._is_on else []
 
         target_step = 1
         if percentage > 33: target_step = 2
         if percentage > 66: target_step = 3
 
-        current = self._current_speed_step
-        if current == 0:
-            current = 1
+        _LOGGER.debug("Set Percentage: %s%% -> Target Step: %s", percentage, target_step)
 
-        diff = target_step - current
-        
-        _LOGGER.debug(f"Set Percentage: {percentage}% -> Target Step: {target_step} (Current: {current}, Diff: {diff})")
+        if self._optimistic:
+            # Ziel sofort anzeigen, die Pulse folgen im Hintergrund
+            self._percentage = SPEED_MAPPING[target_step]
+            self._preset_mode = None
+            self._async_commit_state()
 
-        if diff > 0:
-            for _ in range(diff):
-                _LOGGER.debug("Sende CMD_INCREASE")
-                await self._send_command(CMD_INCREASE)
-        elif diff < 0:
-            for _ in range(abs(diff)):
-                _LOGGER.debug("Sende CMD_DECREASE")
-                await self._send_command(CMD_DECREASE)
+        await self._async_dispatch(
+            self._async_send_speed(target_step, power_on, self._intent_generation)
+        )
+
+    async def _async_send_speed(self, target_step, power_on, generation):
+        # Pulse werden erst bei Ausführung geplant; neuere Ziele ersetzen ältere
+        completed = await self._command_queue.async_submit(
+            lambda: self._plan_speed_change(target_step),
+            key=INTENT_SPEED,
+            on_pulse=self._on_speed_pulse,
+            prefix=power_on,
+            generation=generation,
+        )
+        # Im optimistischen Modus läuft das Senden außerhalb der Sperre: Eine
+        # inzwischen neuere Absicht (z.B. Ausschalten) hat Vorrang
+        if not completed or not self._command_queue.is_current(INTENT_SPEED, generation):
+            return
 
         self._current_speed_step = target_step
         self._percentage = SPEED_MAPPING[target_step]
         self._preset_mode = None
-        self.async_write_ha_state()
+        self._async_commit_state()
+        self._expect_mode(target_step)
 
-    async def async_set_preset_mode(self, preset_mode: str) -> None:
+    async def _async_set_preset_mode(self, preset_mode):
         if self._is_calibrating: return
-        self._cancel_run_on_timer()
         
         if preset_mode == PRESET_BOOST:
-            if not self._is_on:
-                await self.async_turn_on()
-            
-            await self._send_command(CMD_BOOST)
+            power_on = self._begin_turn_on()
             self._preset_mode = PRESET_BOOST
-            async_call_later(self.hass, 300, self._reset_boost_status)
+            # Erneuter Boost startet auch den Timer der Haube neu
+            self._coordinator.async_start_boost(BOOST_DURATION, self._reset_boost_status)
+            # Boost ersetzt wie ein Stufenwechsel noch nicht gesendete Stufenpulse
+            await self._async_dispatch(
+                self._async_send_and_expect(
+                    [COMMAND_BOOST], "boost", prefix=power_on, key=INTENT_SPEED,
+                    generation=self._intent_generation,
+                )
+            )
+        elif preset_mode == PRESET_AUTO and self._auto.enabled:
+            power_on = self._begin_turn_on()
+            self._preset_mode = PRESET_AUTO
+            self._async_start_auto()
+            if power_on:
+                await self._async_dispatch(self._async_send_and_expect(power_on, 1))
+            # Erste Stufe sofort wählen; der Wechsel wartet auf das Ende dieser Absicht
+            self._async_auto_evaluate()
         else:
-            await self.async_set_percentage(self._percentage)
+            self._cancel_run_on_timer()
+            await self._async_set_percentage(self._percentage)
 
-        self.async_write_ha_state()
+        self._async_commit_state()
 
     @callback
-    def _reset_boost_status(self, _now):
+    def _reset_boost_status(self):
         if self._preset_mode == PRESET_BOOST:
             self._preset_mode = None
-            self.async_write_ha_state()
\ No newline at end of file
+            self._async_commit_state()
+
+    # --- AUTOMATIK ---
+    # Ereignisgesteuert: Sensoränderungen und ein einzelner Timer für den Zeitpunkt,
+    # zu dem sich die Entscheidung ohne neue Messung ändern kann, lösen die Prüfung aus.
+
+    @property
+    def _auto_running(self):
+        return self._auto_unsub is not None
+
+    @callback
+    def _async_start_auto(self):
+        """Abonniert die Luftsensoren und übernimmt ihre aktuellen Werte."""
+        self._async_stop_auto()
+        self._auto.reset()
+        now = self._runtime_data.timers.service.now()
+        for entity_id in self._auto.sensors:
+            value = self._auto_sensor_value(self.hass.states.get(entity_id))
+            if value is not None:
+                self._auto.add_sample(entity_id, value, now)
+        self._auto_unsub = async_track_state_change_event(
+            self.hass, list(self._auto.sensors), self._async_auto_sensor_changed
+        )
+        _LOGGER.debug("Automatik aktiviert: %s", ", ".join(self._auto.sensors))
+
+    @callback
+    def _async_stop_auto(self):
+        if self._auto_unsub:
+            self._auto_unsub()
+            self._auto_unsub = None
+            _LOGGER.debug("Automatik beendet.")
+        if self._auto_timer:
+            self._auto_timer.cancel()
+            self._auto_timer = None
+
+    @staticmethod
+    def _auto_sensor_value(state):
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            return float(state.state)
+        except ValueError:
+            return None
+
+    @callback
+    def _async_auto_sensor_changed(self, event):
+        value = self._auto_sensor_value(event.data.get("new_state"))
+        if value is None:
+            return
+        self._auto.add_sample(event.data["entity_id"], value, self._runtime_data.timers.service.now())
+        self._async_auto_evaluate()
+
+    @callback
+    def _async_auto_evaluate(self):
+        """Wählt die Stufe neu oder plant die nächste Prüfung."""
+        if not self._auto_running or self._is_calibrating:
+            return
+        if self._auto_task and not self._auto_task.done():
+            # Der laufende Wechsel prüft nach seinem Ende erneut
+            return
+        timers = self._runtime_data.timers
+        now = timers.service.now()
+        target, next_check = self._auto.decide(self._current_speed_step or 1, now)
+        if target is not None:
+            if self._auto_timer:
+                self._auto_timer.cancel()
+            self._auto_task = self.hass.async_create_task(self._async_auto_apply(target))
+        elif next_check is None:
+            if self._auto_timer:
+                self._auto_timer.cancel()
+        elif self._auto_timer:
+            self._auto_timer.reschedule(next_check - now)
+        else:
+            self._auto_timer = timers.async_call_later(next_check - now, self._async_auto_evaluate)
+
+    async def _async_auto_apply(self, level):
+        """Stufenwechsel der Automatik; neuere Absichten überholen ihn wie jeden anderen."""
+        async with self._intent_lock:
+            generation = self._command_queue.generation(INTENT_SPEED)
+            if not self._auto_running or not self._is_on or not self._begin_intent(generation):
+                return
+            _LOGGER.debug("Automatik: Stufe %s -> %s", self._current_speed_step, level)
+            self._runtime_data.metrics.inc(METRIC_AUTO_CHANGES)
+            completed = await self._command_queue.async_submit(
+                lambda: self._plan_auto_change(level),
+                key=INTENT_SPEED,
+                on_pulse=self._on_speed_pulse,
+                generation=generation,
+            )
+            if (
+                completed
+                and self._command_queue.is_current(INTENT_SPEED, generation)
+                and self._preset_mode == PRESET_AUTO
+            ):
+                self._current_speed_step = level
+                self._percentage = SPEED_MAPPING[level]
+                self._async_commit_state()
+                self._expect_mode(level)
+        self._auto_task = None
+        self._async_auto_evaluate()
+
+    def _plan_auto_change(self, level):
+        """Plant die Pulse erst bei Ausführung und zählt sie für die Pulsbegrenzung.
+
+        Homing kommt nur in Frage, wenn seine ganze Pulsfolge noch ins Fenster
+        passt; sonst wird relativ geschaltet.
+        """
+        now = self._runtime_data.timers.service.now()
+        commands = self._plan_speed_change(level, self._auto.pulse_budget(now))
+        self._auto.record(len(commands), now)
+        return commands
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Wahl des Pulspfads für Stufenwechsel der Faber Skypad."""
+from .const import (
+    COMMAND_INCREASE,
+    COMMAND_DECREASE,
+    HOMING_MARGIN_PULSES,
+    HOMING_DEFAULT_LOSS,
+    HOMING_LOSS_WEIGHT,
+    HOMING_RETRY_COST,
+    HOMING_DRIFT_COST,
+)
+
+# Höchste Stufe, die über INCREASE/DECREASE erreicht wird
+MAX_SPEED_STEP = 3
+
+
+class FaberHomingPlanner:
+    """Wählt pro Stufenwechsel zwischen relativem Pfad und Homing.
+
+    Der relative Pfad sendet nur die Differenz zur mitgeführten Stufe und
+    setzt voraus, dass diese stimmt. Beim Homing wird zuerst so oft
+    DECREASE gesendet, dass die Haube sicher auf Stufe 1 steht (sie bleibt
+    dort stehen), dann INCREASE bis zum Ziel.
+
+    Gewählt wird der Pfad mit den geringeren erwarteten Kosten in Pulsen:
+    Pulse des Pfads plus Fehlerwahrscheinlichkeit mal Kosten eines
+    Fehlschlags. Die Fehlerwahrscheinlichkeit ergibt sich aus der gemessenen
+    Verlustrate pro Puls und, beim relativen Pfad, aus den Pulsen seit der
+    letzten Bestätigung der Stufe. Mit Leistungssensor ist ein Fehlschlag
+    günstig (eine Korrektur), ohne Sensor bleibt die Abweichung bestehen.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.loss_rate = HOMING_DEFAULT_LOSS
+        self.unconfirmed_pulses = 0
+        self._pending_pulses = 0
+        self._saturating = 0
+
+    def restore(self, data) -> None:
+        """Übernimmt gespeicherte Werte."""
+        self.loss_rate = min(max(data.get("loss_rate", self.loss_rate), 0.0), 1.0)
+
+    def as_dict(self):
+        return {"loss_rate": self.loss_rate}
+
+    def plan(self, current: int, target: int, confirmed: bool, max_pulses=None):
+        """Liefert (Pulse, Homing verwendet) für den Wechsel von `current` zu `target`.
+
+        Mit `max_pulses` wird Homing nur gewählt, wenn seine Pulsfolge in
+        dieses Budget passt (Pulsbegrenzung der Automatik).
+        """
+        self._saturating = 0
+        relative = self._relative_path(current, target)
+        if not self.enabled:
+            return relative, False
+
+        saturate = [COMMAND_DECREASE] * (MAX_SPEED_STEP - 1 + HOMING_MARGIN_PULSES)
+        homed = saturate + [COMMAND_INCREASE] * (target - 1)
+        if max_pulses is not None and len(homed) > max_pulses:
+            return relative, False
+        failure_cost = HOMING_RETRY_COST if confirmed else HOMING_DRIFT_COST
+
+        # Relativ: die mitgeführte Stufe muss stimmen und jeder Puls ankommen
+        relative_ok = self._survival(self.unconfirmed_pulses) * self._survival(len(relative))
+        # Homing: Verluste beim Sättigen deckt die Reserve ab, nur der Weg zum Ziel zählt
+        homed_ok = self._survival(target - 1)
+
+        relative_cost = len(relative) + (1 - relative_ok) * failure_cost
+        homed_cost = len(homed) + (1 - homed_ok) * failure_cost
+        if homed_cost < relative_cost:
+            # Nach dem Sättigen ist die Stufe bekannt, nur der Weg zum Ziel bleibt unsicher
+            self.unconfirmed_pulses = 0
+            self._saturating = len(saturate)
+            return homed, True
+        return relative, False
+
+    def on_pulse(self) -> None:
+        """Zählt einen gesendeten Stufenpuls."""
+        self._pending_pulses += 1
+        if self._saturating:
+            self._saturating -= 1
+        else:
+            self.unconfirmed_pulses += 1
+
+    def confirm(self) -> None:
+        """Die Stufe wurde gemessen (Leistungssensor)."""
+        self.unconfirmed_pulses = 0
+
+    def report(self, success: bool) -> None:
+        """Aktualisiert die Verlustrate mit dem Ergebnis der letzten Pulsfolge.
+
+        Ein Fehlschlag wird als ein verlorener Puls der Folge gewertet.
+        """
+        pulses = self._pending_pulses
+        self._pending_pulses = 0
+        if not pulses:
+            return
+        sample = 0.0 if success else 1.0 / pulses
+        for _pulse in range(pulses):
+            self.loss_rate += HOMING_LOSS_WEIGHT * (sample - self.loss_rate)
+        if success:
+            self.unconfirmed_pulses = 0
+
+    def _survival(self, pulses: int) -> float:
+        return (1 - self.loss_rate) ** pulses
+
+    @staticmethod
+    def _relative_path(current: int, target: int):
+        diff = target - current
+        if diff > 0:
+            return [COMMAND_INCREASE] * diff
+        return [COMMAND_DECREASE] * -diff
@@ -1,23 +1,26 @@
 """Light Plattform für Faber Skypad."""
 import logging
-import asyncio
+import time
 
 from homeassistant.components.light import (
     LightEntity,
     ColorMode,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import DeviceInfo
 
 from .const import (
     DOMAIN,
     CONF_REMOTE_ENTITY,
-    CMD_LIGHT,
-    DEFAULT_DELAY,
-    CMD_HOLD_SECS,
+    CONF_VERIFY,
+    DEFAULT_VERIFY,
+    COMMAND_LIGHT,
+    VERIFY_SETTLE_TIME,
+    VERIFY_MAX_SETTLE_TIME,
+    DRIFT_CORRECTION_RETRIES,
 )
+from .entity import FaberEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,85 +30,132 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Fügt die Light Entität hinzu."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    config = data["config"]
-    
-    remote_entity = config[CONF_REMOTE_ENTITY]
-    name = config.get("name", "Faber Skypad")
+    runtime_data = hass.data[DOMAIN][config_entry.entry_id]["runtime_data"]
 
-    async_add_entities([FaberLight(name, remote_entity, config_entry.entry_id)])
+    async_add_entities([FaberLight(runtime_data)])
 
-class FaberLight(LightEntity):
-    """Repräsentation des Faber Skypad Lichts."""
+class FaberLight(FaberEntity, LightEntity):
+    """Repräsentation des Faber Skypad Lichts.
 
-    def __init__(self, name, remote_entity, entry_id):
-        self._name = name
-        self._remote_entity = remote_entity
-        self._entry_id = entry_id
-        self._is_on = False
+    Der Zustand ist optimistisch. Ist der Licht-Offset kalibriert, folgt das
+    Licht dem Zustand, den der Koordinator am Leistungssensor erkennt, und
+    übernimmt so auch Schaltvorgänge an der Haube selbst.
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._entry_id)},
-            name=self._name,
-            manufacturer="Faber",
-            model="Skypad",
-            # via_device entfernt
-        )
+    Nach einem eigenen Schaltbefehl wird die Erkennung erst nach ihrer
+    Erkennungszeit abgeglichen. Zeigt sie dann noch den alten Zustand, wurde
+    der Befehl verpasst: Er wird erneut gesendet (höchstens
+    DRIFT_CORRECTION_RETRIES mal), danach gilt die Messung.
+    """
 
-    @property
-    def name(self):
-        return self._name
+    _attr_color_mode = ColorMode.ONOFF
+    _attr_supported_color_modes = {ColorMode.ONOFF}
 
-    @property
-    def unique_id(self):
-        return f"{self._entry_id}_light"
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "light")
+        self._attr_name = runtime_data.name
+        self._remote_entity = runtime_data.config[CONF_REMOTE_ENTITY]
+        self._command_queue = runtime_data.command_queue
+        self._coordinator = runtime_data.coordinator
+        self._verify = runtime_data.config.get(CONF_VERIFY, DEFAULT_VERIFY)
+        self._is_on = False
+        self._check_timer = None
+        self._expected_since = None
+        self._expected_samples = 0
+        self._correction_attempt = 0
 
     @property
     def is_on(self):
         return self._is_on
 
     @property
-    def color_mode(self):
-        return ColorMode.ONOFF
+    def assumed_state(self):
+        return self._coordinator.light_on is None
+
+    async def async_added_to_hass(self):
+        """Registriert den Listener für Erkennungen des Koordinators."""
+        self.async_on_remove(self._coordinator.async_add_listener(self._async_coordinator_updated))
+
+    async def async_will_remove_from_hass(self):
+        self._cancel_check()
+
+    @callback
+    def _async_coordinator_updated(self):
+        """Übernimmt den erkannten Zustand, außer während ein Befehl noch nachzieht."""
+        light_on = self._coordinator.light_on
+        if light_on is not None:
+            if self._check_timer is None:
+                self._is_on = light_on
+            elif light_on == self._is_on:
+                # Befehl bestätigt
+                self._cancel_check()
+        self.async_write_ha_state_if_changed()
+
+    def _expect_state(self, attempt=0):
+        """Plant den Abgleich nach einem Schaltbefehl (nur mit erkanntem Licht)."""
+        self._cancel_check()
+        if self._coordinator.light_on is None:
+            return
+        self._expected_since = time.monotonic()
+        self._expected_samples = self._coordinator.sample_count
+        self._correction_attempt = attempt
+        self._check_timer = self._runtime_data.timers.async_call_later(
+            self._coordinator.detection_delay(light=True) + VERIFY_SETTLE_TIME, self._async_check
+        )
 
-    @property
-    def supported_color_modes(self):
-        return {ColorMode.ONOFF}
-    
-    async def _send_command(self, command):
-        """Sendet einen Befehl an die Remote."""
-        if not command:
-            _LOGGER.warning("Kein Befehl für Licht konfiguriert (CMD_LIGHT ist leer).")
+    def _cancel_check(self):
+        if self._check_timer:
+            self._check_timer.cancel()
+            self._check_timer = None
+
+    @callback
+    def _async_check(self):
+        """Gleicht den geschalteten Zustand mit der Erkennung ab."""
+        self._check_timer = None
+        light_on = self._coordinator.light_on
+        if light_on is None or light_on == self._is_on:
+            return
+        wait = self._coordinator.detection_settling(self._expected_samples)
+        if wait is not None:
+            if time.monotonic() - self._expected_since + wait <= VERIFY_MAX_SETTLE_TIME:
+                self._check_timer = self._runtime_data.timers.async_call_later(wait, self._async_check)
+                return
+            # Ohne neue Messwerte ist kein Urteil möglich: nichts korrigieren
+            _LOGGER.debug("Lichtzustand nicht überprüfbar, Erkennung zieht nicht nach")
             return
 
-        cmd_formatted = command if command.startswith("b64:") else f"b64:{command}"
-        
-        _LOGGER.debug("Sende Licht-Befehl an %s: %s (Hold: %ss)", self._remote_entity, cmd_formatted, CMD_HOLD_SECS)
-
-        await self.hass.services.async_call(
-            "remote",
-            "send_command",
-            {
-                "entity_id": self._remote_entity,
-                "command": [cmd_formatted],
-                "hold_secs": CMD_HOLD_SECS,
-            },
-            blocking=True
-        )
-        await asyncio.sleep(DEFAULT_DELAY)
+        if self._verify and self._correction_attempt < DRIFT_CORRECTION_RETRIES:
+            _LOGGER.info(
+                "Licht-Befehl verpasst (erkannt: %s), sende erneut (%s/%s)",
+                "an" if light_on else "aus", self._correction_attempt + 1, DRIFT_CORRECTION_RETRIES,
+            )
+            self.hass.async_create_task(self._async_resend(self._correction_attempt + 1))
+            return
+
+        _LOGGER.warning("Lichtzustand nicht bestätigt, übernehme Messung")
+        self._is_on = light_on
+        self.async_write_ha_state_if_changed()
+
+    async def _async_resend(self, attempt):
+        await self._send_command(COMMAND_LIGHT)
+        self._expect_state(attempt)
+
+    async def _send_command(self, command):
+        """Reiht einen Befehl in die Warteschlange der Haube ein."""
+        _LOGGER.debug("Sende Licht-Befehl an %s", self._remote_entity)
+        await self._command_queue.async_submit([command])
 
     async def async_turn_on(self, **kwargs):
         """Einschalten."""
         if not self._is_on:
-            await self._send_command(CMD_LIGHT)
+            await self._send_command(COMMAND_LIGHT)
             self._is_on = True
-        self.async_write_ha_state()
+            self._expect_state()
+        self.async_write_ha_state_if_changed()
 
     async def async_turn_off(self, **kwargs):
         """Ausschalten."""
         if self._is_on:
-            await self._send_command(CMD_LIGHT)
+            await self._send_command(COMMAND_LIGHT)
             self._is_on = False
-        self.async_write_ha_state()
\ No newline at end of file
+            self._expect_state()
+        self.async_write_ha_state_if_changed()
\ No newline at end of file
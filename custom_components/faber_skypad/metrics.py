@@ -0,0 +1,102 @@
+"""Zähler und Histogramme für den IR-Pfad der Faber Skypad."""
+from bisect import bisect_left
+from collections import defaultdict
+
+# Obergrenzen der Histogramm-Klassen in Millisekunden
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PULSE_BUCKETS = (1, 2, 3, 4, 6)
+
+# Namen der Messgrößen
+METRIC_INTENTS = "intents"
+METRIC_SUPERSEDED = "intents_superseded"
+METRIC_PULSES_SAVED = "pulses_saved"
+METRIC_PULSES = "pulses"
+METRIC_SERVICE_CALLS = "service_calls"
+METRIC_SERVICE_ERRORS = "service_errors"
+METRIC_SERVICE_LATENCY = "service_latency_ms"
+METRIC_QUEUE_WAIT = "queue_wait_ms"
+METRIC_PULSES_PER_INTENT = "pulses_per_intent"
+METRIC_SAMPLES = "power_samples"
+METRIC_DETECTIONS = "detections"
+METRIC_STATE_WRITES = "state_writes"
+METRIC_SUPPRESSED_WRITES = "suppressed_writes"
+METRIC_HOMED_MOVES = "homed_moves"
+METRIC_AUTO_CHANGES = "auto_changes"
+
+
+class FaberHistogram:
+    """Histogramm mit festen Klassen, dazu Anzahl, Summe und Maximum."""
+
+    def __init__(self, buckets):
+        self._buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float):
+        """Obergrenze der Klasse, in die das Quantil fällt (grobe Schätzung)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self._buckets[index] if index < len(self._buckets) else self.max
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 1) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "max": round(self.max, 1),
+            "buckets": dict(
+                zip([f"le_{bucket}" for bucket in self._buckets] + ["inf"], self.counts)
+            ),
+        }
+
+
+class FaberMetrics:
+    """Messwerte eines Config-Entries.
+
+    Ist die Erfassung deaktiviert, kehren alle Methoden sofort zurück; die
+    Kosten beschränken sich dann auf einen Attributzugriff pro Aufruf.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters = defaultdict(int)
+        self.histograms = {
+            METRIC_SERVICE_LATENCY: FaberHistogram(LATENCY_BUCKETS_MS),
+            METRIC_QUEUE_WAIT: FaberHistogram(LATENCY_BUCKETS_MS),
+            METRIC_PULSES_PER_INTENT: FaberHistogram(PULSE_BUCKETS),
+        }
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] += amount
+
+    def observe(self, name: str, value: float) -> None:
+        if self.enabled:
+            self.histograms[name].observe(value)
+
+    def as_dict(self):
+        return {
+            "enabled": self.enabled,
+            "counters": dict(self.counters),
+            "histograms": {name: histogram.as_dict() for name, histogram in self.histograms.items()},
+        }
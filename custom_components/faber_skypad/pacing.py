@@ -0,0 +1,84 @@
+"""Adaptive Pulsabstände für die IR-Befehle der Faber Skypad."""
+from typing import Optional
+
+from .const import (
+    DEFAULT_DELAY,
+    PACING_MIN_DELAY,
+    PACING_MAX_DELAY,
+    PACING_SHRINK_FACTOR,
+    PACING_BACKOFF_FACTOR,
+    PACING_FLOOR_MARGIN,
+    PACING_SUCCESS_STREAK,
+    PACING_LATENCY_WEIGHT,
+)
+
+
+class FaberPacingEngine:
+    """Lernt pro Config-Entry den kürzesten zuverlässigen Abstand zwischen Pulsen.
+
+    Jede Pulsfolge mit mehreren Pulsen ist eine Probe für den aktuellen
+    Abstand. Bestätigt der Leistungssensor das Ziel mehrmals in Folge, wird
+    der Abstand verkürzt; geht ein Puls verloren, wird er deutlich verlängert
+    und der fehlgeschlagene Wert als Untergrenze gemerkt.
+
+    Zusätzlich wird die Zeit vom Senden bis zur erkannten Stufe (Annahme-
+    Latenz) geglättet, um den Abgleich nach dem Senden zu verkürzen.
+    """
+
+    def __init__(self, delay=DEFAULT_DELAY):
+        self.delay = delay
+        self.floor = PACING_MIN_DELAY
+        self.latency = None
+        self._probe_delay = None
+        self._streak = 0
+
+    def restore(self, data) -> None:
+        """Übernimmt gespeicherte Werte."""
+        self.delay = min(max(data.get("delay", self.delay), PACING_MIN_DELAY), PACING_MAX_DELAY)
+        self.floor = min(max(data.get("floor", self.floor), PACING_MIN_DELAY), PACING_MAX_DELAY)
+        self.latency = data.get("latency", self.latency)
+
+    def as_dict(self):
+        return {"delay": self.delay, "floor": self.floor, "latency": self.latency}
+
+    def on_burst(self, pulse_count: int) -> None:
+        """Merkt sich den Abstand einer gesendeten Pulsfolge als Probe."""
+        self._probe_delay = self.delay if pulse_count > 1 else None
+
+    def report(self, success: bool) -> bool:
+        """Wertet das Ergebnis der letzten Probe aus; True bei geändertem Abstand."""
+        probe = self._probe_delay
+        self._probe_delay = None
+        if probe is None:
+            return False
+
+        if not success:
+            # Puls verpasst: dieser Abstand ist zu kurz
+            self._streak = 0
+            self.floor = min(max(self.floor, probe * PACING_FLOOR_MARGIN), PACING_MAX_DELAY)
+            self.delay = min(max(self.delay, probe) * PACING_BACKOFF_FACTOR, PACING_MAX_DELAY)
+            return True
+
+        self._streak += 1
+        if self._streak < PACING_SUCCESS_STREAK or self.delay <= self.floor:
+            return False
+        self._streak = 0
+        self.delay = round(max(self.delay * PACING_SHRINK_FACTOR, self.floor), 3)
+        return True
+
+    def record_latency(self, seconds: float) -> None:
+        """Glättet die gemessene Zeit bis zur Bestätigung durch den Sensor."""
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += PACING_LATENCY_WEIGHT * (seconds - self.latency)
+
+    def settle_time(self, minimum: float, maximum: float) -> float:
+        """Wartezeit bis zum Abgleich, aus der gelernten Latenz (begrenzt).
+
+        Ohne gelernte Latenz gilt die Mindestzeit (die erwartete Erkennungszeit).
+        """
+        latency: Optional[float] = self.latency
+        if latency is None:
+            return min(minimum, maximum)
+        return min(max(latency * 1.5, minimum), maximum)
@@ -0,0 +1,30 @@
+"""Nachlauf-Profile der Faber Skypad."""
+from typing import List, Tuple
+
+from .const import SPEED_MAPPING, RUN_ON_MIN_STAGE_SECONDS, RUN_ON_MAX_STAGE_SECONDS
+
+
+def parse_run_on_profile(text: str) -> List[Tuple[int, int]]:
+    """Liest ein Profil der Form "3:120, 2:300, 1:600" (Stufe:Sekunden); leer = kein Profil."""
+    if not text or not text.strip():
+        return []
+    stages = []
+    for part in text.replace(";", ",").split(","):
+        if not part.strip():
+            continue
+        try:
+            level, seconds = (int(value) for value in part.split(":"))
+        except ValueError as err:
+            raise ValueError(f"Ungültige Stufe '{part.strip()}', erwartet Stufe:Sekunden") from err
+        if level not in SPEED_MAPPING:
+            raise ValueError(f"Ungültige Stufe {level}, erlaubt sind 1 bis 3")
+        if not RUN_ON_MIN_STAGE_SECONDS <= seconds <= RUN_ON_MAX_STAGE_SECONDS:
+            raise ValueError(
+                f"Dauer {seconds} s außerhalb von {RUN_ON_MIN_STAGE_SECONDS}-{RUN_ON_MAX_STAGE_SECONDS} s"
+            )
+        stages.append((level, seconds))
+    return stages
+
+
+def format_run_on_profile(stages) -> str:
+    return ", ".join(f"{level}:{seconds}" for level, seconds in stages)
@@ -0,0 +1,106 @@
+"""Gemeinsamer Sende-Scheduler pro IR-Remote."""
+import asyncio
+from collections import deque
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+# Schlüssel in hass.data[DOMAIN] für die Scheduler aller Remotes
+DATA_SCHEDULERS = "transmit_schedulers"
+
+
+class FaberTransmitScheduler:
+    """Vergibt das Sendefenster einer Remote an die Warteschlangen aller Hauben.
+
+    Teilen sich mehrere Config-Entries einen IR-Sender, darf immer nur eine
+    Pulsfolge gleichzeitig laufen. Wartende Warteschlangen kommen reihum
+    (Round-Robin) an die Reihe, Ausschalt- und Sicherheitsbefehle werden
+    vorgezogen. Remotes ohne gemeinsame Nutzer laufen völlig unabhängig.
+    """
+
+    def __init__(self, remote_entity: str):
+        self.remote_entity = remote_entity
+        self.users = set()
+        self._busy = False
+        self._priority = deque()
+        self._waiting = {}
+        self._order = deque()
+
+    async def async_acquire(self, owner, priority: bool = False) -> None:
+        """Wartet, bis `owner` senden darf."""
+        if not self._busy:
+            self._busy = True
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        if priority:
+            self._priority.append(future)
+        else:
+            if owner not in self._waiting:
+                self._waiting[owner] = deque()
+                self._order.append(owner)
+            self._waiting[owner].append(future)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Fenster wurde noch vergeben: gleich weiterreichen
+                self.release()
+            else:
+                self._discard(owner, future)
+            raise
+
+    def release(self) -> None:
+        """Gibt das Sendefenster an den nächsten Wartenden weiter."""
+        while self._priority:
+            future = self._priority.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+
+        while self._order:
+            owner = self._order.popleft()
+            waiting = self._waiting[owner]
+            future = waiting.popleft()
+            if waiting:
+                self._order.append(owner)
+            else:
+                del self._waiting[owner]
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self._busy = False
+
+    def _discard(self, owner, future) -> None:
+        if future in self._priority:
+            self._priority.remove(future)
+            return
+        waiting = self._waiting.get(owner)
+        if waiting and future in waiting:
+            waiting.remove(future)
+            if not waiting:
+                del self._waiting[owner]
+                self._order.remove(owner)
+
+
+def async_get_scheduler(hass: HomeAssistant, remote_entity: str, entry_id: str) -> FaberTransmitScheduler:
+    """Liefert den Scheduler der Remote und registriert den Config-Entry als Nutzer."""
+    schedulers = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SCHEDULERS, {})
+    scheduler = schedulers.get(remote_entity)
+    if scheduler is None:
+        scheduler = schedulers[remote_entity] = FaberTransmitScheduler(remote_entity)
+    scheduler.users.add(entry_id)
+    return scheduler
+
+
+def async_release_scheduler(hass: HomeAssistant, scheduler: FaberTransmitScheduler, entry_id: str) -> None:
+    """Meldet den Config-Entry ab und entfernt ungenutzte Scheduler."""
+    scheduler.users.discard(entry_id)
+    if scheduler.users:
+        return
+    schedulers = hass.data.get(DOMAIN, {}).get(DATA_SCHEDULERS, {})
+    if schedulers.get(scheduler.remote_entity) is scheduler:
+        del schedulers[scheduler.remote_entity]
@@ -1,14 +1,38 @@
-"""Sensor platform for Faber Skypad (Timer Countdown)."""
+"""Sensor platform for Faber Skypad (Timer Countdown, Power-derived values, Metrics)."""
+from datetime import timedelta
+
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorDeviceClass,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.const import UnitOfEnergy, UnitOfTime
+
+from .const import DOMAIN, CONF_POWER_SENSOR
+from .entity import FaberEntity
+from .energy import LEVEL_MODES
+from .metrics import (
+    METRIC_INTENTS,
+    METRIC_SUPERSEDED,
+    METRIC_PULSES_SAVED,
+    METRIC_PULSES,
+    METRIC_PULSES_PER_INTENT,
+    METRIC_QUEUE_WAIT,
+    METRIC_SERVICE_CALLS,
+    METRIC_SERVICE_ERRORS,
+    METRIC_SERVICE_LATENCY,
+    METRIC_SAMPLES,
+    METRIC_DETECTIONS,
+    METRIC_STATE_WRITES,
+    METRIC_SUPPRESSED_WRITES,
+)
 
-from .const import DOMAIN, CONF_REMOTE_ENTITY
+# Only the metric sensors poll; they read in-memory counters
+SCAN_INTERVAL = timedelta(seconds=60)
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -16,62 +40,352 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Adds the sensor."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    config = data["config"]
-    runtime_data = data["runtime_data"]
-    name = config.get("name", "Faber Skypad")
-    remote_entity = config[CONF_REMOTE_ENTITY]
+    runtime_data = hass.data[DOMAIN][config_entry.entry_id]["runtime_data"]
+
+    entities = [
+        FaberRunOnTimeSensor(runtime_data),
+        FaberBoostTimeSensor(runtime_data),
+        FaberCalibrationProgressSensor(runtime_data),
+    ]
+    # Abgeleitete Werte gibt es nur mit einem Leistungssensor
+    if runtime_data.config.get(CONF_POWER_SENSOR):
+        entities.append(FaberDetectedLevelSensor(runtime_data))
+        entities.append(FaberHoodEnergySensor(runtime_data))
+        entities.append(FaberRuntimeSensor(runtime_data))
+        entities.extend(FaberLevelTimeSensor(runtime_data, mode) for mode in LEVEL_MODES)
 
-    async_add_entities([FaberRunOnTimeSensor(name, config_entry.entry_id, remote_entity, runtime_data)])
+    # Metric sensors only when collection is enabled in the options
+    if runtime_data.metrics.enabled:
+        entities.extend([
+            FaberServiceLatencySensor(runtime_data),
+            FaberQueueWaitSensor(runtime_data),
+            FaberPulsesSensor(runtime_data),
+            FaberDetectionsSensor(runtime_data),
+            FaberStateWritesSensor(runtime_data),
+        ])
 
-class FaberRunOnTimeSensor(SensorEntity):
+    async_add_entities(entities)
+
+class FaberRunOnTimeSensor(FaberEntity, SensorEntity):
     """Shows when the timer will end."""
 
     _attr_translation_key = "timer_end"
     _attr_has_entity_name = True
+    # Timestamp provides the countdown display in the frontend.
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:clock-end"
 
-    def __init__(self, name, entry_id, remote_entity, runtime_data):
-        self._base_name = name
-        self._entry_id = entry_id
-        self._remote_entity = remote_entity
-        self._runtime_data = runtime_data
-        
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._entry_id)},
-            name=self._base_name,
-            manufacturer="Faber",
-            model="Skypad",
-        )
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "run_on_end_time")
 
     @property
-    def unique_id(self):
-        return f"{self._entry_id}_run_on_end_time"
+    def native_value(self):
+        """Returns the end time."""
+        return self._runtime_data.run_on_finish_time
+
+    async def async_added_to_hass(self):
+        """Registers the listener for updates."""
+        self.async_on_remove(
+            self._runtime_data.coordinator.async_add_listener(self.async_write_ha_state_if_changed)
+        )
+
+
+class FaberBoostTimeSensor(FaberEntity, SensorEntity):
+    """Shows when the boost will end."""
+
+    _attr_translation_key = "boost_end"
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:fan-clock"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "boost_end_time")
 
     @property
     def native_value(self):
         """Returns the end time."""
-        return self._runtime_data.run_on_finish_time
+        return self._runtime_data.boost_finish_time
+
+    async def async_added_to_hass(self):
+        """Registers the listener for updates."""
+        self.async_on_remove(
+            self._runtime_data.coordinator.async_add_listener(self.async_write_ha_state_if_changed)
+        )
+
+
+class FaberCalibrationProgressSensor(FaberEntity, SensorEntity):
+    """Shows the progress of a running calibration."""
+
+    _attr_translation_key = "calibration_progress"
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = "%"
+    _attr_icon = "mdi:progress-wrench"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "calibration_progress")
+
+    @property
+    def native_value(self):
+        """Returns the progress in percent."""
+        return self._runtime_data.calibration.percent
 
     @property
-    def device_class(self):
-        """Timestamp provides the countdown display in the frontend."""
-        return SensorDeviceClass.TIMESTAMP
+    def extra_state_attributes(self):
+        """Current step, elapsed time and estimated remaining time."""
+        progress = self._runtime_data.calibration
+        return {
+            "state": progress.state,
+            "step": progress.step,
+            "elapsed": progress.elapsed,
+            "eta": progress.eta,
+        }
+
+    async def async_added_to_hass(self):
+        """Registers the listener for updates."""
+        self.async_on_remove(
+            self._runtime_data.coordinator.async_add_listener(self.async_write_ha_state_if_changed)
+        )
+
+
+class FaberDetectedLevelSensor(FaberEntity, SensorEntity):
+    """Shows the level detected from the power sensor."""
+
+    _attr_translation_key = "detected_level"
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = ["off", "1", "2", "3", "boost"]
+    _attr_icon = "mdi:speedometer"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "detected_level")
 
     @property
-    def icon(self):
-        return "mdi:clock-end"
+    def native_value(self):
+        """Returns the detected level (None until the first stable detection)."""
+        mode = self._runtime_data.coordinator.mode
+        return None if mode is None else str(mode)
 
     async def async_added_to_hass(self):
         """Registers the listener for updates."""
-        self._runtime_data.register_listener(self._handle_update)
+        self.async_on_remove(
+            self._runtime_data.coordinator.async_add_listener(self.async_write_ha_state_if_changed)
+        )
+
 
-    async def async_will_remove_from_hass(self):
-        """Removes the listener."""
-        self._runtime_data.unregister_listener(self._handle_update)
+class FaberEnergyBaseSensor(FaberEntity, SensorEntity):
+    """Base for the counters, published at most every ENERGY_PUBLISH_INTERVAL."""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    async def async_added_to_hass(self):
+        """Registers the rate-limited listener for updates."""
+        self.async_on_remove(
+            self._runtime_data.coordinator.async_add_energy_listener(self.async_write_ha_state_if_changed)
+        )
+
+
+class FaberHoodEnergySensor(FaberEnergyBaseSensor):
+    """Energy used by the hood above the learned standby baseline."""
+
+    _attr_translation_key = "hood_energy"
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_suggested_display_precision = 3
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "hood_energy")
+
+    @property
+    def native_value(self):
+        """Returns the energy in kWh."""
+        return round(self._runtime_data.coordinator.energy.energy_kwh, 6)
+
+
+class FaberRuntimeSensor(FaberEnergyBaseSensor):
+    """Total time the motor has been running (all levels)."""
+
+    _attr_translation_key = "runtime"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "runtime")
+
+    @property
+    def native_value(self):
+        """Returns the runtime in hours."""
+        return round(self._runtime_data.coordinator.energy.runtime_seconds / 3600, 4)
 
-    @callback
-    def _handle_update(self):
-        """Is called when the runtime data changes."""
-        self.async_write_ha_state()
\ No newline at end of file
+    @property
+    def extra_state_attributes(self):
+        """Number of times each level was entered."""
+        energy = self._runtime_data.coordinator.energy
+        return {
+            f"activations_{mode}": energy.level_activations(mode) for mode in LEVEL_MODES
+        }
+
+
+class FaberLevelTimeSensor(FaberEnergyBaseSensor):
+    """Time spent in a single level."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:timer-cog-outline"
+
+    def __init__(self, runtime_data, mode):
+        super().__init__(runtime_data, f"time_level_{mode}")
+        self._mode = mode
+        self._attr_translation_key = f"time_level_{mode}"
+
+    @property
+    def native_value(self):
+        """Returns the time in this level in hours."""
+        return round(self._runtime_data.coordinator.energy.level_seconds(self._mode) / 3600, 4)
+
+    @property
+    def extra_state_attributes(self):
+        """Number of times the level was entered."""
+        return {"activations": self._runtime_data.coordinator.energy.level_activations(self._mode)}
+
+
+class FaberMetricBaseSensor(FaberEntity, SensorEntity):
+    """Base for the metric sensors, polled every SCAN_INTERVAL."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+
+    @property
+    def _metrics(self):
+        return self._runtime_data.metrics
+
+
+class FaberServiceLatencySensor(FaberMetricBaseSensor):
+    """Mean duration of the remote.send_command calls."""
+
+    _attr_translation_key = "command_latency"
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "command_latency")
+
+    @property
+    def native_value(self):
+        """Returns the mean latency in ms."""
+        return self._metrics.histograms[METRIC_SERVICE_LATENCY].mean
+
+    @property
+    def extra_state_attributes(self):
+        """Histogram, call and error counts."""
+        return {
+            **self._metrics.histograms[METRIC_SERVICE_LATENCY].as_dict(),
+            "service_calls": self._metrics.counters[METRIC_SERVICE_CALLS],
+            "service_errors": self._metrics.counters[METRIC_SERVICE_ERRORS],
+        }
+
+
+class FaberQueueWaitSensor(FaberMetricBaseSensor):
+    """Mean time a command waits before it is sent."""
+
+    _attr_translation_key = "queue_wait"
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+    _attr_icon = "mdi:tray-full"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "queue_wait")
+
+    @property
+    def native_value(self):
+        """Returns the mean queue wait in ms."""
+        return self._metrics.histograms[METRIC_QUEUE_WAIT].mean
+
+    @property
+    def extra_state_attributes(self):
+        """Histogram of the queue wait."""
+        return self._metrics.histograms[METRIC_QUEUE_WAIT].as_dict()
+
+
+class FaberPulsesSensor(FaberMetricBaseSensor):
+    """Number of IR pulses sent since startup."""
+
+    _attr_translation_key = "pulses_sent"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:remote"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "pulses_sent")
+
+    @property
+    def native_value(self):
+        """Returns the number of pulses."""
+        return self._metrics.counters[METRIC_PULSES]
+
+    @property
+    def extra_state_attributes(self):
+        """Intents, superseded intents and pulses per intent."""
+        return {
+            "intents": self._metrics.counters[METRIC_INTENTS],
+            "intents_superseded": self._metrics.counters[METRIC_SUPERSEDED],
+            "pulses_saved": self._metrics.counters[METRIC_PULSES_SAVED],
+            "pulses_per_intent": self._metrics.histograms[METRIC_PULSES_PER_INTENT].as_dict(),
+        }
+
+
+class FaberDetectionsSensor(FaberMetricBaseSensor):
+    """Number of level changes committed by the classifier."""
+
+    _attr_translation_key = "detections"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:chart-bell-curve"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "detections")
+
+    @property
+    def native_value(self):
+        """Returns the number of detections."""
+        return self._metrics.counters[METRIC_DETECTIONS]
+
+    @property
+    def extra_state_attributes(self):
+        """Processed samples and detections per level."""
+        prefix = f"{METRIC_DETECTIONS}_"
+        return {
+            "samples": self._metrics.counters[METRIC_SAMPLES],
+            **{
+                name: count
+                for name, count in self._metrics.counters.items()
+                if name.startswith(prefix)
+            },
+        }
+
+
+class FaberStateWritesSensor(FaberMetricBaseSensor):
+    """Number of state writes of all entities of this hood."""
+
+    _attr_translation_key = "state_writes"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:database-edit-outline"
+
+    def __init__(self, runtime_data):
+        super().__init__(runtime_data, "state_writes")
+
+    @property
+    def native_value(self):
+        """Returns the number of state writes."""
+        return self._metrics.counters[METRIC_STATE_WRITES]
+
+    @property
+    def extra_state_attributes(self):
+        """Writes skipped because nothing changed."""
+        return {"suppressed_writes": self._metrics.counters[METRIC_SUPPRESSED_WRITES]}
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""Gemeinsamer Timer-Dienst aller Faber Skypad Config-Entries."""
+import asyncio
+import heapq
+import itertools
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Schlüssel in hass.data[DOMAIN] für den Timer-Dienst
+DATA_TIMERS = "timer_service"
+
+
+class FaberTimerHandle:
+    """Ein geplanter Aufruf; kann abgebrochen oder neu terminiert werden."""
+
+    __slots__ = ("_service", "owner", "action", "deadline", "_entry")
+
+    def __init__(self, service, owner, action):
+        self._service = service
+        self.owner = owner
+        self.action = action
+        self.deadline = None
+        self._entry = None
+
+    @property
+    def active(self) -> bool:
+        return self._entry is not None
+
+    @property
+    def remaining(self) -> float:
+        """Restzeit in Sekunden (0, wenn nicht mehr aktiv)."""
+        if self._entry is None:
+            return 0.0
+        return max(self.deadline - self._service.now(), 0.0)
+
+    @callback
+    def cancel(self) -> None:
+        self._service.cancel(self)
+
+    @callback
+    def reschedule(self, delay: float) -> None:
+        """Verschiebt den Aufruf auf `delay` Sekunden ab jetzt (auch nach Ablauf)."""
+        self._service.reschedule(self, delay)
+
+
+class FaberTimerService:
+    """Ein monotoner Timer für alle Fristen aller Hauben.
+
+    Nachlauf, Boost, Abgleich nach dem Senden, Verweilzeit des Klassifikators
+    und gedrosselte Veröffentlichungen teilen sich einen Heap nach Frist. Im
+    Event-Loop ist immer nur ein Timer für die früheste Frist geplant.
+    Planen und Verschieben kosten O(log n); abgebrochene Einträge bleiben bis
+    zum Erreichen der Heap-Spitze liegen und werden bei Bedarf gesammelt
+    entfernt. Fristen laufen auf der monotonen Uhr des Event-Loops und
+    springen daher nicht bei Zeitumstellung oder NTP-Korrekturen.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.users = set()
+        self._heap = []
+        self._sequence = itertools.count()
+        self._owned = {}
+        self._cancelled = 0
+        self._wakeup = None
+        self._wakeup_at = None
+
+    def now(self) -> float:
+        return self.hass.loop.time()
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    @callback
+    def async_call_later(self, delay: float, action, owner=None) -> FaberTimerHandle:
+        """Plant `action()` in `delay` Sekunden; Coroutinen laufen als Task."""
+        handle = FaberTimerHandle(self, owner, action)
+        self._push(handle, delay)
+        return handle
+
+    @callback
+    def cancel(self, handle: FaberTimerHandle) -> None:
+        entry = handle._entry
+        if entry is None:
+            return
+        entry[2] = None
+        handle._entry = None
+        self._cancelled += 1
+        self._owned.get(handle.owner, set()).discard(handle)
+        if self._cancelled > len(self._heap) // 2:
+            # Viele Leichen: Heap neu aufbauen statt sie einzeln abzuräumen
+            self._heap = [entry for entry in self._heap if entry[2] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+        self._arm()
+
+    @callback
+    def reschedule(self, handle: FaberTimerHandle, delay: float) -> None:
+        self.cancel(handle)
+        self._push(handle, delay)
+
+    @callback
+    def async_cancel_owner(self, owner) -> None:
+        """Bricht alle Timer eines Besitzers ab (z.B. beim Entladen eines Eintrags)."""
+        for handle in list(self._owned.pop(owner, ())):
+            self.cancel(handle)
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._heap.clear()
+        self._owned.clear()
+        self._cancelled = 0
+        self._disarm()
+
+    def _push(self, handle, delay) -> None:
+        handle.deadline = self.now() + max(delay, 0)
+        entry = [handle.deadline, next(self._sequence), handle]
+        handle._entry = entry
+        self._owned.setdefault(handle.owner, set()).add(handle)
+        heapq.heappush(self._heap, entry)
+        self._arm()
+
+    def _arm(self) -> None:
+        """Plant den Loop-Timer auf die früheste noch gültige Frist."""
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+        if not self._heap:
+            self._disarm()
+            return
+        deadline = self._heap[0][0]
+        if self._wakeup is not None and self._wakeup_at == deadline:
+            return
+        self._disarm()
+        self._wakeup_at = deadline
+        self._wakeup = self.hass.loop.call_at(deadline, self._run)
+
+    def _disarm(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wakeup = None
+        self._wakeup_at = None
+
+    @callback
+    def _run(self) -> None:
+        self._wakeup = None
+        self._wakeup_at = None
+        now = self.now()
+        while self._heap and self._heap[0][0] <= now:
+            _deadline, _sequence, handle = heapq.heappop(self._heap)
+            if handle is None:
+                self._cancelled -= 1
+                continue
+            handle._entry = None
+            self._owned.get(handle.owner, set()).discard(handle)
+            self._fire(handle)
+        self._arm()
+
+    def _fire(self, handle) -> None:
+        try:
+            result = handle.action()
+            if asyncio.iscoroutine(result):
+                self.hass.async_create_task(result)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Fehler in Timer-Aufruf %s", handle.action)
+
+
+class FaberTimerScope:
+    """Sicht eines Config-Entries auf den gemeinsamen Timer-Dienst."""
+
+    def __init__(self, service: FaberTimerService, owner: str):
+        self.service = service
+        self.owner = owner
+
+    @callback
+    def async_call_later(self, delay: float, action) -> FaberTimerHandle:
+        return self.service.async_call_later(delay, action, self.owner)
+
+    @callback
+    def async_cancel_all(self) -> None:
+        self.service.async_cancel_owner(self.owner)
+
+
+def async_get_timer_scope(hass: HomeAssistant, entry_id: str) -> FaberTimerScope:
+    """Liefert die Timer des Config-Entries auf dem (ggf. neuen) gemeinsamen Dienst."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    service = domain_data.get(DATA_TIMERS)
+    if service is None:
+        service = domain_data[DATA_TIMERS] = FaberTimerService(hass)
+    service.users.add(entry_id)
+    return FaberTimerScope(service, entry_id)
+
+
+def async_release_timer_scope(hass: HomeAssistant, scope: FaberTimerScope) -> None:
+    """Bricht alle Timer des Config-Entries ab und entfernt den ungenutzten Dienst."""
+    service = scope.service
+    service.async_cancel_owner(scope.owner)
+    service.users.discard(scope.owner)
+    if service.users:
+        return
+    service.async_shutdown()
+    domain_data = hass.data.get(DOMAIN, {})
+    if domain_data.get(DATA_TIMERS) is service:
+        del domain_data[DATA_TIMERS]
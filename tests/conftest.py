@@ -0,0 +1,348 @@
+"""Gemeinsame Hilfen für die Tests der Faber Skypad Integration.
+
+Die Tests laufen ohne Home Assistant Instanz: Wo die Module `hass`
+brauchen, genügt ein minimaler Ersatz mit Event-Loop, Zuständen und
+aufgezeichneten Dienstaufrufen. Home Assistant muss nur installiert sein,
+weil das Paket beim Import geladen wird.
+
+Tests der Entitäten laufen mit `vrun` auf einer virtuellen Uhr: Timer,
+`asyncio.sleep` und `time.monotonic` der Integration springen direkt zum
+nächsten Termin, Wartezeiten von Minuten kosten keine Rechenzeit.
+"""
+import asyncio
+import os
+import selectors
+import sys
+import time
+import types
+from collections import defaultdict
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homeassistant.core import State  # noqa: E402
+
+from custom_components.faber_skypad import FaberRuntimeData, const  # noqa: E402
+from custom_components.faber_skypad.command_queue import FaberCommandQueue  # noqa: E402
+from custom_components.faber_skypad.coordinator import FaberCoordinator  # noqa: E402
+from custom_components.faber_skypad.fan import FaberFan  # noqa: E402
+from custom_components.faber_skypad.light import FaberLight  # noqa: E402
+from custom_components.faber_skypad.timers import (  # noqa: E402
+    async_get_timer_scope,
+    async_release_timer_scope,
+)
+
+REMOTE_ENTITY = "remote.test"
+POWER_SENSOR = "sensor.test_power"
+
+# Zuordnung der gesendeten Codes zu Tastennamen der Haube
+COMMAND_NAMES = {
+    f"b64:{const.CMD_TURN_ON_OFF}": "power",
+    f"b64:{const.CMD_INCREASE}": "increase",
+    f"b64:{const.CMD_DECREASE}": "decrease",
+    f"b64:{const.CMD_BOOST}": "boost",
+    f"b64:{const.CMD_LIGHT}": "light",
+}
+
+
+class FakeServices:
+    """Zeichnet Dienstaufrufe auf (z.B. `remote.send_command`)."""
+
+    def __init__(self):
+        self.calls = []
+        # Optionaler Empfänger der Aufrufe (z.B. FakeHood), darf auch Fehler werfen
+        self.handler = None
+
+    async def async_call(self, domain, service, data, blocking=False):
+        self.calls.append((domain, service, data))
+        # Wie ein echter Dienst: einmal an den Event-Loop abgeben
+        await asyncio.sleep(0)
+        if self.handler is not None:
+            self.handler(domain, service, data)
+
+
+class FakeStates:
+    """Zustände mit Listenern wie `async_track_state_change_event`."""
+
+    def __init__(self):
+        self._states = {}
+        self._listeners = defaultdict(list)
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+    def async_set(self, entity_id, state):
+        old_state = self._states.get(entity_id)
+        new_state = State(entity_id, state)
+        self._states[entity_id] = new_state
+        event = types.SimpleNamespace(
+            data={"entity_id": entity_id, "old_state": old_state, "new_state": new_state}
+        )
+        for action in list(self._listeners[entity_id]):
+            action(event)
+
+    def track(self, entity_ids, action):
+        for entity_id in entity_ids:
+            self._listeners[entity_id].append(action)
+
+        def _remove():
+            for entity_id in entity_ids:
+                self._listeners[entity_id].remove(action)
+
+        return _remove
+
+
+class FakeBus:
+    """Nimmt Listener für Ereignisse wie EVENT_HOMEASSISTANT_STOP an."""
+
+    def __init__(self):
+        self.listeners = []
+
+    def async_listen_once(self, event_type, action):
+        entry = (event_type, action)
+        self.listeners.append(entry)
+        return lambda: self.listeners.remove(entry)
+
+
+class FakeHass:
+    """Minimaler Ersatz für HomeAssistant mit Event-Loop, Diensten und Tasks."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.data = {}
+        self.services = FakeServices()
+        self.states = FakeStates()
+        self.bus = FakeBus()
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+
+def _fake_track_state_change_event(hass, entity_ids, action):
+    return hass.states.track(list(entity_ids), action)
+
+
+@pytest.fixture
+def run():
+    """Führt eine Coroutine-Funktion mit einem FakeHass auf einem frischen Loop aus."""
+
+    def _run(test):
+        async def _main():
+            return await test(FakeHass(asyncio.get_running_loop()))
+
+        return asyncio.run(_main())
+
+    return _run
+
+
+# --- VIRTUELLE UHR ---
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Wartet nie real, sondern stellt die virtuelle Uhr auf den nächsten Timer."""
+
+    def __init__(self):
+        super().__init__()
+        self.loop = None
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events:
+            return events
+        if timeout is None:
+            raise RuntimeError("Test hängt: keine Timer und keine Ereignisse")
+        self.loop.advance(timeout)
+        return []
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event-Loop, dessen Zeit nur durch wartende Timer fortschreitet."""
+
+    def __init__(self):
+        selector = _VirtualSelector()
+        super().__init__(selector)
+        selector.loop = self
+        self._now = 0.0
+
+    def time(self):
+        return self._now
+
+    def advance(self, seconds):
+        self._now += max(seconds, 0.0)
+
+
+@pytest.fixture
+def vrun(monkeypatch):
+    """Wie `run`, aber auf der virtuellen Uhr und mit Zustandslistenern im FakeHass."""
+    def _run(test):
+        loop = VirtualClockLoop()
+        clock = types.SimpleNamespace(monotonic=loop.time, time=time.time)
+        for name, module in list(sys.modules.items()):
+            if name.startswith("custom_components.faber_skypad"):
+                if getattr(module, "time", None) is time:
+                    monkeypatch.setattr(module, "time", clock)
+                if hasattr(module, "async_track_state_change_event"):
+                    monkeypatch.setattr(
+                        module, "async_track_state_change_event", _fake_track_state_change_event
+                    )
+        try:
+            return loop.run_until_complete(test(FakeHass(loop)))
+        finally:
+            loop.close()
+
+    return _run
+
+
+# --- HAUBE ---
+
+class FakeHood:
+    """Die Haube hinter der Remote: IR-Befehle ändern Modus, Licht und Leistung.
+
+    Die Leistung folgt sofort ohne Anlauf und Rauschen. `pulses` hält
+    (Zeit, Taste) aller empfangenen Pulse, `drop` verschluckt die nächsten
+    Pulse einer Taste (z.B. {"increase": 1}), `fail` lässt den nächsten
+    Dienstaufruf mit einer Ausnahme scheitern.
+    """
+
+    LEVEL_WATTS = {"off": 2.0, 1: 30.0, 2: 50.0, 3: 80.0, "boost": 120.0}
+    LIGHT_OFFSET = 6.0
+
+    def __init__(self):
+        self.mode = "off"
+        self.light = False
+        self.pulses = []
+        self.drop = {}
+        self.fail = False
+
+    def __call__(self, domain, service, data):
+        if self.fail:
+            self.fail = False
+            raise RuntimeError("Remote nicht erreichbar")
+        commands = data["command"]
+        for command in [commands] if isinstance(commands, str) else commands:
+            name = COMMAND_NAMES.get(command, command)
+            self.pulses.append((asyncio.get_running_loop().time(), name))
+            if self.drop.get(name):
+                self.drop[name] -= 1
+                continue
+            self.press(name)
+
+    def press(self, name):
+        """Tastendruck (per IR oder an der Haube selbst)."""
+        if name == "light":
+            self.light = not self.light
+        elif name == "power":
+            self.mode = "off" if self.mode != "off" else 1
+        elif name == "boost":
+            self.mode = "boost"
+        elif self.mode != "off":
+            step = 3 if self.mode == "boost" else self.mode
+            self.mode = min(step + 1, 3) if name == "increase" else max(step - 1, 1)
+
+    @property
+    def power(self):
+        return self.LEVEL_WATTS[self.mode] + (self.LIGHT_OFFSET if self.light else 0.0)
+
+
+class _MemoryStore:
+    """Store-Ersatz ohne Dateizugriff."""
+
+    async def async_load(self):
+        return None
+
+    def async_delay_save(self, data_func, delay=0):
+        pass
+
+    async def async_save(self, data):
+        pass
+
+
+class TestHood:
+    """Eine eingerichtete Haube: Laufzeitdaten, Fan, Licht und simuliertes Gerät."""
+
+    __test__ = False
+
+    def __init__(self, hass, runtime_data, fan, light, device, sample_interval):
+        self.hass = hass
+        self.runtime_data = runtime_data
+        self.fan = fan
+        self.light = light
+        self.device = device
+        self.writes = defaultdict(int)
+        self._sample_interval = sample_interval
+        self._sensor_task = None
+
+    @property
+    def coordinator(self):
+        return self.runtime_data.coordinator
+
+    def start_sensor(self):
+        self._sensor_task = self.hass.loop.create_task(self._async_sensor_loop())
+
+    async def _async_sensor_loop(self):
+        while True:
+            await asyncio.sleep(self._sample_interval)
+            self.hass.states.async_set(POWER_SENSOR, f"{self.device.power:.1f}")
+
+    async def async_teardown(self):
+        if self._sensor_task:
+            self._sensor_task.cancel()
+            await asyncio.gather(self._sensor_task, return_exceptions=True)
+        await self.fan.async_will_remove_from_hass()
+        await self.light.async_will_remove_from_hass()
+        self.coordinator.async_shutdown()
+        async_release_timer_scope(self.hass, self.runtime_data.timers)
+        self.runtime_data.command_queue.shutdown()
+        # Übrige Tasks (z.B. Senden im Hintergrund) vor dem Schließen des Loops beenden
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def async_setup_hood(
+    hass, options=None, power_sensor=True, calibrated=True, sample_interval=1.0, batch=True
+):
+    """Richtet eine Haube wie `async_setup_entry` ein, nur mit FakeHass und FakeHood.
+
+    Ohne `power_sensor` läuft die Haube ohne Leistungssensor. Mit
+    `calibrated` wird das Profil der FakeHood samt Licht-Offset als gelernt
+    übernommen. Der Sensor meldet alle `sample_interval` Sekunden.
+    """
+    device = FakeHood()
+    hass.services.handler = device
+    config = {
+        "name": "Test",
+        const.CONF_REMOTE_ENTITY: REMOTE_ENTITY,
+        **(options or {}),
+    }
+    if power_sensor:
+        config[const.CONF_POWER_SENSOR] = POWER_SENSOR
+    runtime_data = FaberRuntimeData(
+        "test", config, FaberCommandQueue(hass, REMOTE_ENTITY, batch=batch), _MemoryStore()
+    )
+    if power_sensor and calibrated:
+        for mode, watt in FakeHood.LEVEL_WATTS.items():
+            runtime_data.power_profile[mode] = watt
+            runtime_data.power_stats[mode] = {"mean": watt, "std": 0.5, "count": 6, "settled": True}
+        runtime_data.light_offset = FakeHood.LIGHT_OFFSET
+    if power_sensor:
+        hass.states.async_set(POWER_SENSOR, f"{device.power:.1f}")
+    runtime_data.timers = async_get_timer_scope(hass, "test")
+    runtime_data.coordinator = FaberCoordinator(hass, runtime_data)
+    runtime_data.coordinator.async_start()
+
+    fan = FaberFan(hass, runtime_data)
+    light = FaberLight(runtime_data)
+    runtime_data.fan_entity = fan
+    hood = TestHood(hass, runtime_data, fan, light, device, sample_interval)
+    for entity, entity_id in ((fan, "fan.test"), (light, "light.test")):
+        entity.hass = hass
+        entity.entity_id = entity_id
+        entity.async_write_ha_state = lambda entity_id=entity_id: hood.writes.__setitem__(
+            entity_id, hood.writes[entity_id] + 1
+        )
+        await entity.async_added_to_hass()
+    if power_sensor:
+        hood.start_sensor()
+    return hood
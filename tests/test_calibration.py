@@ -0,0 +1,59 @@
+"""Tests für die Messung der Kalibrierungsstufen."""
+import math
+
+from custom_components.faber_skypad.calibration import (
+    FaberLevelSampler,
+    inconsistent_levels,
+    step_timeout,
+)
+from custom_components.faber_skypad.const import (
+    CALIBRATION_MIN_SETTLE_TIME,
+    CALIBRATION_SETTLE_SAMPLES,
+)
+
+PROFILE = {"off": 1.5, 1: 32.0, 2: 51.0, 3: 78.0, "boost": 118.0}
+
+
+def _stats(mean, settled=True):
+    return {"mean": mean, "std": 0.5, "count": CALIBRATION_SETTLE_SAMPLES, "settled": settled}
+
+
+def test_ramp_samples_are_dropped():
+    sampler = FaberLevelSampler(0.0)
+    for second in range(int(CALIBRATION_MIN_SETTLE_TIME)):
+        assert not sampler.add(10.0 + second, float(second))
+    assert sampler.samples == []
+
+
+def test_slow_ramp_tail_is_not_settled():
+    sampler = FaberLevelSampler(0.0, min_settle_time=0.0)
+    # Exponentielle Rampe 78 -> 118 W mit 6 s Zeitkonstante: kaum Streuung, aber ein Trend
+    settled_at = None
+    for second in range(60):
+        power = 118.0 - 40.0 * math.exp(-second / 6.0)
+        if sampler.add(power, float(second)) and settled_at is None:
+            settled_at = second
+    assert settled_at is not None
+    assert sampler.result()["mean"] > 116.0
+
+
+def test_stable_level_settles_with_full_window():
+    sampler = FaberLevelSampler(0.0)
+    values = [51.3, 50.6, 51.1, 50.8, 51.4, 50.9]
+    results = [sampler.add(value, CALIBRATION_MIN_SETTLE_TIME + index) for index, value in enumerate(values)]
+    assert results == [False] * (len(values) - 1) + [True]
+    result = sampler.result()
+    assert result["settled"] and abs(result["mean"] - 51.0) < 0.2
+
+
+def test_step_timeout_grows_with_sensor_interval():
+    assert step_timeout(30.0, None) == 30.0
+    assert step_timeout(20.0, 5.0) == CALIBRATION_MIN_SETTLE_TIME + 2 * CALIBRATION_SETTLE_SAMPLES * 5.0
+
+
+def test_unsettled_levels_are_inconsistent():
+    stats = {mode: _stats(watt) for mode, watt in PROFILE.items()}
+    stats["light"] = _stats(6.0)
+    assert inconsistent_levels(dict(PROFILE), stats) == set()
+    stats[2] = _stats(PROFILE[2], settled=False)
+    assert inconsistent_levels(dict(PROFILE), stats) == {2}
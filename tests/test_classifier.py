@@ -0,0 +1,122 @@
+"""Tests für den Streaming-Klassifikator der Leistungsmessung."""
+from custom_components.faber_skypad.classifier import FaberPowerClassifier
+from custom_components.faber_skypad.const import LIGHT_DWELL_TIME
+
+PROFILE = {"off": 10.0, 1: 50.0, 2: 80.0, 3: 120.0, "boost": 150.0}
+DWELL = 5.0
+
+
+def _feed(classifier, power, start, count=5, step=1.0):
+    """Speist `count` gleiche Werte ein und liefert den zuletzt übernommenen Zustand."""
+    accepted = None
+    for index in range(count):
+        accepted = classifier.add_sample(power, start + index * step) or accepted
+    return accepted
+
+
+def test_detects_levels_after_dwell():
+    classifier = FaberPowerClassifier(dict(PROFILE), dwell_time=DWELL)
+    assert _feed(classifier, 51.0, 0, count=3) is None
+    assert classifier.pending_deadline == 0 + DWELL
+    assert _feed(classifier, 51.0, 3, count=3) == (1, None)
+    assert classifier.mode == 1
+
+
+def test_dwell_counts_from_first_sample_of_new_level():
+    classifier = FaberPowerClassifier(dict(PROFILE), dwell_time=DWELL)
+    _feed(classifier, 50.0, 0, count=10, step=2.0)
+    assert classifier.mode == 1
+    # Sensor meldet alle 2 s: der Median zeigt Stufe 2 erst mit dem dritten Wert (t=24)
+    assert _feed(classifier, 80.0, 20, count=2, step=2.0) is None
+    assert _feed(classifier, 80.0, 24, count=1) is None
+    # Median und Verweilzeit addieren sich nicht: übernommen 5 s nach dem ersten Wert
+    assert classifier.pending_deadline == 20 + DWELL
+    assert classifier.poll(20 + DWELL) == (2, None)
+
+
+def test_step_shorter_than_dwell_is_rejected():
+    classifier = FaberPowerClassifier(dict(PROFILE), dwell_time=DWELL)
+    _feed(classifier, 50.0, 0, count=10)
+    # Vier Sekunden auf Stufe 2: der Median zeigt sie noch bis t=25, die Haube nicht mehr
+    assert _feed(classifier, 80.0, 20, count=4) is None
+    assert _feed(classifier, 50.0, 24, count=10) is None
+    assert classifier.mode == 1
+
+
+def test_hysteresis_keeps_level_near_boundary():
+    classifier = FaberPowerClassifier(dict(PROFILE), dwell_time=DWELL)
+    _feed(classifier, 50.0, 0, count=10)
+    assert classifier.mode == 1
+    # Knapp über der Mitte zwischen 1 und 2: nicht deutlich genug für einen Wechsel
+    _feed(classifier, 67.0, 10, count=10)
+    assert classifier.mode == 1
+    assert classifier.pending_deadline is None
+    _feed(classifier, 79.0, 20, count=10)
+    assert classifier.mode == 2
+
+
+def test_short_spike_is_filtered():
+    classifier = FaberPowerClassifier(dict(PROFILE), dwell_time=DWELL)
+    _feed(classifier, 50.0, 0, count=10)
+    classifier.add_sample(150.0, 10)
+    _feed(classifier, 50.0, 11, count=10)
+    assert classifier.mode == 1
+
+
+def test_light_offset_adds_light_states():
+    classifier = FaberPowerClassifier(dict(PROFILE), dwell_time=DWELL, light_offset=6.0)
+    _feed(classifier, 56.0, 0, count=10)
+    assert classifier.state == (1, True)
+    # Ein reiner Lichtwechsel braucht die eigene, längere Verweilzeit
+    _feed(classifier, 50.0, 10, count=10)
+    assert classifier.state == (1, True)
+    _feed(classifier, 50.0, 20, count=10)
+    assert classifier.state == (1, False)
+
+
+def test_ramp_through_light_band_keeps_light_off():
+    classifier = FaberPowerClassifier(dict(PROFILE), dwell_time=DWELL, light_offset=6.0)
+    _feed(classifier, 80.0, 0, count=10)
+    assert classifier.state == (2, False)
+    # Langsame Rampe 2 -> 1, die lange im Band von (1, Licht) liegt
+    reported = [classifier.add_sample(power, 10 + index) for index, power in enumerate([70.0, 62.0] + [56.0] * 10)]
+    reported += [classifier.add_sample(50.0, 22 + index) for index in range(20)]
+    assert all(state is None or state[1] is False for state in reported)
+    assert classifier.state == (1, False)
+
+
+def test_light_change_is_rejected_while_level_change_is_pending():
+    classifier = FaberPowerClassifier(dict(PROFILE), dwell_time=DWELL, light_offset=6.0)
+    _feed(classifier, 50.0, 0, count=10)
+    _feed(classifier, 80.0, 10, count=3)
+    assert classifier.pending_deadline is not None
+    # Rückkehr in das Lichtband von Stufe 1 verwirft den Stufenwechsel, ohne Licht zu melden
+    _feed(classifier, 56.0, 13, count=3)
+    assert classifier.state == (1, False)
+    assert classifier.pending_deadline is None
+    # Erst danach beginnt ein eigener Lichtwechsel mit voller Verweilzeit
+    classifier.add_sample(56.0, 16)
+    assert classifier.pending_deadline == 16 + LIGHT_DWELL_TIME
+
+
+def test_fallback_without_calibration_detects_on_and_off():
+    profile = {"off": 5.0, 1: 0.0, 2: 0.0, 3: 0.0, "boost": 0.0}
+    classifier = FaberPowerClassifier(profile, dwell_time=DWELL)
+    _feed(classifier, 5.0, 0, count=10)
+    assert classifier.state == ("off", None)
+    _feed(classifier, 60.0, 10, count=10)
+    assert classifier.state == (1, None)
+    # Zurück auf die Baseline: muss wieder als aus erkannt werden
+    _feed(classifier, 5.0, 20, count=20)
+    assert classifier.state == ("off", None)
+
+
+def test_fallback_hysteresis_around_threshold():
+    profile = {"off": 5.0, 1: 0.0, 2: 0.0, 3: 0.0, "boost": 0.0}
+    classifier = FaberPowerClassifier(profile, dwell_time=DWELL)
+    _feed(classifier, 60.0, 0, count=10)
+    # Knapp unter der Schwelle (Baseline + 15 W) bleibt die Haube an
+    _feed(classifier, 19.0, 10, count=10)
+    assert classifier.state == (1, None)
+    _feed(classifier, 16.0, 20, count=10)
+    assert classifier.state == ("off", None)
@@ -0,0 +1,132 @@
+"""Tests für die IR-Befehlswarteschlange (Ersetzen, Pulsgrenzen, Batch)."""
+import asyncio
+
+from custom_components.faber_skypad.command_queue import FaberCommandQueue, INTENT_SPEED
+from custom_components.faber_skypad.const import (
+    COMMAND_POWER,
+    COMMAND_INCREASE,
+    COMMAND_DECREASE,
+)
+from custom_components.faber_skypad.pacing import FaberPacingEngine
+
+REMOTE = "remote.test"
+
+
+def _queue(hass, batch=False):
+    return FaberCommandQueue(hass, REMOTE, batch=batch, pacing=FaberPacingEngine(delay=0.0))
+
+
+def _sent(hass):
+    """Gesendete Befehle als logische Namen, ein Eintrag pro Remote-Aufruf."""
+    names = {}
+    queue = _queue(hass)
+    for command in (COMMAND_POWER, COMMAND_INCREASE, COMMAND_DECREASE):
+        names[queue.commands.resolve([command])[0]] = command
+    return [[names[code] for code in data["command"]] for _domain, _service, data in hass.services.calls]
+
+
+def test_single_pulses_without_batch(run):
+    async def _test(hass):
+        queue = _queue(hass)
+        pulses = []
+        assert await queue.async_submit(
+            [COMMAND_INCREASE, COMMAND_INCREASE], key=INTENT_SPEED, on_pulse=pulses.append
+        )
+        assert _sent(hass) == [[COMMAND_INCREASE], [COMMAND_INCREASE]]
+        assert pulses == [[COMMAND_INCREASE], [COMMAND_INCREASE]]
+
+    run(_test)
+
+
+def test_batch_sends_sequence_in_one_call(run):
+    async def _test(hass):
+        queue = _queue(hass, batch=True)
+        pulses = []
+        assert await queue.async_submit(
+            [COMMAND_INCREASE, COMMAND_INCREASE], key=INTENT_SPEED,
+            on_pulse=pulses.append, prefix=[COMMAND_POWER],
+        )
+        assert _sent(hass) == [[COMMAND_POWER, COMMAND_INCREASE, COMMAND_INCREASE]]
+        assert "delay_secs" in hass.services.calls[0][2]
+        # Ein Rückruf für die ganze Folge, keine erfundenen Zwischenstände
+        assert pulses == [[COMMAND_POWER, COMMAND_INCREASE, COMMAND_INCREASE]]
+
+    run(_test)
+
+
+def test_supersede_aborts_at_pulse_boundary(run):
+    async def _test(hass):
+        queue = _queue(hass)
+
+        def _on_pulse(_commands):
+            queue.supersede(INTENT_SPEED)
+
+        completed = await queue.async_submit(
+            [COMMAND_INCREASE] * 3, key=INTENT_SPEED, on_pulse=_on_pulse
+        )
+        assert completed is False
+        assert _sent(hass) == [[COMMAND_INCREASE]]
+        assert queue.pulses_saved == 2
+
+    run(_test)
+
+
+def test_waiting_intents_are_replaced_by_the_newest(run):
+    async def _test(hass):
+        queue = _queue(hass)
+        planned = []
+
+        def _plan(target):
+            def _commands():
+                planned.append(target)
+                return [COMMAND_INCREASE] * target
+            return _commands
+
+        first = asyncio.ensure_future(queue.async_submit([COMMAND_POWER]))
+        second = asyncio.ensure_future(queue.async_submit(_plan(1), key=INTENT_SPEED))
+        third = asyncio.ensure_future(queue.async_submit(_plan(2), key=INTENT_SPEED))
+        assert await asyncio.gather(first, second, third) == [True, False, True]
+        # Der überholte Plan wird gar nicht erst berechnet
+        assert planned == [2]
+        assert _sent(hass) == [[COMMAND_POWER], [COMMAND_INCREASE], [COMMAND_INCREASE]]
+
+    run(_test)
+
+
+def test_prefix_is_sent_even_if_superseded(run):
+    async def _test(hass):
+        queue = _queue(hass)
+        blocker = asyncio.ensure_future(queue.async_submit([COMMAND_DECREASE]))
+        stale = asyncio.ensure_future(
+            queue.async_submit([COMMAND_INCREASE], key=INTENT_SPEED, prefix=[COMMAND_POWER])
+        )
+        await asyncio.sleep(0)
+        queue.supersede(INTENT_SPEED)
+        assert await asyncio.gather(blocker, stale) == [True, False]
+        assert _sent(hass) == [[COMMAND_DECREASE], [COMMAND_POWER]]
+
+    run(_test)
+
+
+def test_generation_from_supersede_is_not_superseded_again(run):
+    async def _test(hass):
+        queue = _queue(hass)
+        stale = queue.supersede(INTENT_SPEED)
+        current = queue.supersede(INTENT_SPEED)
+        assert await queue.async_submit([COMMAND_INCREASE], key=INTENT_SPEED, generation=stale) is False
+        assert await queue.async_submit([COMMAND_INCREASE], key=INTENT_SPEED, generation=current)
+        assert queue.generation(INTENT_SPEED) == current
+        assert queue.is_current(INTENT_SPEED, current)
+        assert _sent(hass) == [[COMMAND_INCREASE]]
+
+    run(_test)
+
+
+def test_shutdown_drops_pending_commands(run):
+    async def _test(hass):
+        queue = _queue(hass)
+        queue.shutdown()
+        assert await queue.async_submit([COMMAND_INCREASE], key=INTENT_SPEED) is False
+        assert hass.services.calls == []
+
+    run(_test)
@@ -0,0 +1,35 @@
+"""Tests für die Energie- und Laufzeitzähler."""
+import pytest
+
+from custom_components.faber_skypad.energy import FaberEnergyMeter, new_energy_totals
+
+
+def _meter():
+    return FaberEnergyMeter({"off": 5.0, 1: 40.0, 2: 60.0, 3: 90.0, "boost": 130.0}, new_energy_totals())
+
+
+def test_integrates_power_above_baseline_while_running():
+    meter = _meter()
+    meter.add_sample(45.0, 0.0, 1)
+    meter.add_sample(45.0, 3600.0, 1)
+    # 40 W über der Baseline für eine Stunde
+    assert meter.energy_kwh == pytest.approx(0.04)
+    assert meter.level_seconds(1) == 3600.0
+    assert meter.level_activations(1) == 1
+
+
+def test_ignores_power_while_off_or_unknown():
+    meter = _meter()
+    # Baseline-Drift im Aus-Zustand und vor der ersten Erkennung
+    meter.add_sample(9.0, 0.0, None)
+    meter.add_sample(9.0, 600.0, "off")
+    meter.add_sample(9.0, 1200.0, "off")
+    assert meter.energy_kwh == 0.0
+    assert meter.runtime_seconds == 0.0
+
+    # Gezählt wird ab dem ersten Intervall, das in einer Stufe beginnt
+    meter.add_sample(45.0, 1800.0, 1)
+    meter.add_sample(45.0, 5400.0, "off")
+    meter.advance(9000.0, "off")
+    assert meter.energy_kwh == pytest.approx(0.04)
+    assert meter.runtime_seconds == 3600.0
@@ -0,0 +1,206 @@
+"""Tests der Lüfter-Entität mit simulierter Haube auf der virtuellen Uhr."""
+import asyncio
+
+from custom_components.faber_skypad.auto_mode import PULSE_WINDOW
+from custom_components.faber_skypad.calibration import STATE_CANCELLED, STATE_DONE
+from custom_components.faber_skypad.const import (
+    AUTO_MAX_PULSES_PER_MINUTE,
+    CONF_AUTO_HUMIDITY_SENSOR,
+    CONF_HOMING,
+    CONF_OPTIMISTIC,
+    CONF_RUN_ON_PROFILE,
+    PRESET_AUTO,
+)
+
+from conftest import FakeHood, async_setup_hood
+
+HUMIDITY_SENSOR = "sensor.test_humidity"
+
+
+def _level_pulses(hood):
+    return [at for at, name in hood.device.pulses if name in ("increase", "decrease")]
+
+
+def test_auto_rate_limit_counts_homing_pulses(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(
+            hass,
+            {CONF_AUTO_HUMIDITY_SENSOR: HUMIDITY_SENSOR, CONF_HOMING: True},
+            power_sensor=False,
+        )
+        # Verlorene Pulse und unbestätigte Stufe: ohne Sensor wählt der Planer Homing
+        homing = hood.runtime_data.homing
+        homing.loss_rate = 0.2
+        homing.unconfirmed_pulses = 10
+        assert homing.plan(1, 3, False)[1]
+        homing.unconfirmed_pulses = 10
+        hass.states.async_set(HUMIDITY_SENSOR, "95")
+        await hood.fan.async_set_preset_mode(PRESET_AUTO)
+        await asyncio.sleep(600)
+
+        pulses = _level_pulses(hood)
+        assert hood.device.mode == 3
+        assert pulses
+        for start in pulses:
+            in_window = [at for at in pulses if start <= at < start + PULSE_WINDOW]
+            assert len(in_window) <= AUTO_MAX_PULSES_PER_MINUTE
+        await hood.async_teardown()
+
+    vrun(_test)
+
+
+def test_slider_burst_sends_only_the_final_target(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(hass)
+        await hood.fan.async_turn_on(percentage=33)
+        await asyncio.sleep(10)
+        # Schnelle Slider-Bewegungen warten auf die Sperre der laufenden Absicht
+        tasks = []
+        for percentage in (66, 100, 33, 100, 66, 33, 66, 100, 66):
+            tasks.append(hass.loop.create_task(hood.fan.async_set_percentage(percentage)))
+            await asyncio.sleep(0.3)
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(30)
+
+        assert hood.device.mode == 2
+        assert hood.fan.percentage == 66
+        # Überholte Absichten senden nichts: höchstens der Weg zum ersten und zum letzten Ziel
+        assert len(_level_pulses(hood)) <= 4
+        await hood.async_teardown()
+
+    vrun(_test)
+
+
+def test_dropped_pulse_is_corrected_once(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(hass)
+        await hood.fan.async_turn_on(percentage=33)
+        await asyncio.sleep(20)
+        hood.device.drop = {"increase": 1}
+        await hood.fan.async_set_percentage(100)
+        await asyncio.sleep(90)
+
+        assert hood.device.mode == 3
+        assert hood.fan.percentage == 100
+        assert hood.fan.extra_state_attributes["drift_corrections"] == 1
+        # Zwei Pulse zum Ziel, einer davon verloren, und genau ein Ausgleichspuls
+        assert [name for _at, name in hood.device.pulses[1:]] == ["increase"] * 3
+        await hood.async_teardown()
+
+    vrun(_test)
+
+
+def test_slow_sensor_does_not_trigger_corrections(vrun):
+    async def _test(hass):
+        # Der Median braucht mehrere Meldungen, bevor die Verweilzeit überhaupt beginnt
+        hood = await async_setup_hood(hass, sample_interval=6.0)
+        await asyncio.sleep(30)
+        await hood.fan.async_turn_on(percentage=66)
+        await asyncio.sleep(90)
+        await hood.fan.async_set_percentage(100)
+        await asyncio.sleep(90)
+        await hood.fan.async_turn_off()
+        await asyncio.sleep(90)
+
+        assert hood.device.mode == "off"
+        assert not hood.fan.is_on
+        assert hood.fan.extra_state_attributes["drift_corrections"] == 0
+        assert [name for _at, name in hood.device.pulses] == [
+            "power", "increase", "increase", "power"
+        ]
+        await hood.async_teardown()
+
+    vrun(_test)
+
+
+def test_failed_optimistic_send_rolls_back_to_the_settled_level(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(hass, {CONF_OPTIMISTIC: True}, batch=False)
+        await hood.fan.async_turn_on(percentage=33)
+        await asyncio.sleep(30)
+
+        # Der erste Puls kommt an, der zweite Aufruf der Remote scheitert
+        device = hood.device
+
+        def _fail_second_call(domain, service, data):
+            device(domain, service, data)
+            device.fail = True
+
+        hass.services.handler = _fail_second_call
+        await hood.fan.async_set_percentage(100)
+        shown = []
+        for _second in range(60):
+            await asyncio.sleep(1)
+            shown.append(hood.fan.percentage)
+
+        assert device.mode == 2
+        # Kein Sprung auf die veraltete Messung, sondern vom Ziel direkt auf die Messung
+        assert 33 not in shown
+        assert shown[0] == 100
+        assert shown[-1] == 66
+        await hood.async_teardown()
+
+    vrun(_test)
+
+
+def test_calibration_learns_the_hood_profile(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(hass, calibrated=False)
+        await asyncio.sleep(10)
+        await hood.fan.async_start_calibration()
+        await asyncio.sleep(600)
+
+        assert hood.runtime_data.calibration.state == STATE_DONE
+        for mode, watt in FakeHood.LEVEL_WATTS.items():
+            assert abs(hood.runtime_data.power_profile[mode] - watt) < 1.0
+        assert abs(hood.runtime_data.light_offset - FakeHood.LIGHT_OFFSET) < 1.0
+        assert hood.device.mode == "off"
+        assert not hood.device.light
+        await hood.async_teardown()
+
+    vrun(_test)
+
+
+def test_unload_during_calibration_turns_the_hood_off(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(hass, calibrated=False)
+        await asyncio.sleep(10)
+        await hood.fan.async_start_calibration()
+        await asyncio.sleep(60)
+        assert hood.device.mode != "off"
+
+        # Wie beim Entladen: Entität entfernen, danach die Warteschlange schließen
+        await hood.fan.async_will_remove_from_hass()
+        hood.runtime_data.command_queue.shutdown()
+        await asyncio.sleep(10)
+
+        assert hood.runtime_data.calibration.state == STATE_CANCELLED
+        assert hood.device.mode == "off"
+        assert not hood.device.light
+        await hood.async_teardown()
+
+    vrun(_test)
+
+
+def test_speed_change_during_run_on_finish_keeps_the_hood_on(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(hass, {CONF_RUN_ON_PROFILE: [(2, 10), (1, 0.5)]}, batch=False)
+        hood.runtime_data.run_on_enabled = True
+        hood.runtime_data.run_on_seconds = 30
+        await hood.fan.async_turn_on(percentage=66)
+        await asyncio.sleep(20)
+        await hood.fan.async_turn_off()
+        # Der Stufenwechsel des Nachlaufs hält die Sperre, wenn die Absicht eintrifft,
+        # und die letzte Stufe endet, bevor die Absicht an der Reihe ist
+        await asyncio.sleep(10.2)
+        task = hass.loop.create_task(hood.fan.async_set_percentage(100))
+        await asyncio.sleep(40)
+        await task
+
+        assert not hood.runtime_data.run_on_active
+        assert hood.device.mode == 3
+        assert hood.fan.is_on
+        assert hood.fan.percentage == 100
+        await hood.async_teardown()
+
+    vrun(_test)
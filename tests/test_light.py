@@ -0,0 +1,50 @@
+"""Tests der Licht-Entität mit simulierter Haube auf der virtuellen Uhr."""
+import asyncio
+
+from conftest import async_setup_hood
+
+
+def _light_pulses(hood):
+    return [at for at, name in hood.device.pulses if name == "light"]
+
+
+def test_missed_light_toggle_is_sent_again(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(hass)
+        await hood.fan.async_turn_on(percentage=66)
+        await asyncio.sleep(20)
+        hood.device.drop = {"light": 1}
+        await hood.light.async_turn_on()
+        shown = []
+        for _second in range(60):
+            await asyncio.sleep(1)
+            shown.append(hood.light.is_on)
+
+        assert hood.device.light
+        # Während der Abgleich läuft, springt die Entität nicht auf die Messung zurück
+        assert all(shown)
+        assert len(_light_pulses(hood)) == 2
+
+        await hood.light.async_turn_off()
+        await asyncio.sleep(60)
+        assert not hood.device.light
+        assert not hood.light.is_on
+        assert len(_light_pulses(hood)) == 3
+        await hood.async_teardown()
+
+    vrun(_test)
+
+
+def test_light_follows_the_hood_buttons(vrun):
+    async def _test(hass):
+        hood = await async_setup_hood(hass)
+        await hood.fan.async_turn_on(percentage=33)
+        await asyncio.sleep(20)
+        hood.device.press("light")
+        await asyncio.sleep(30)
+
+        assert hood.light.is_on
+        assert not _light_pulses(hood)
+        await hood.async_teardown()
+
+    vrun(_test)
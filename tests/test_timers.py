@@ -0,0 +1,89 @@
+"""Tests für den gemeinsamen Timer-Dienst."""
+import asyncio
+
+from custom_components.faber_skypad.const import DOMAIN
+from custom_components.faber_skypad.timers import (
+    DATA_TIMERS,
+    async_get_timer_scope,
+    async_release_timer_scope,
+)
+
+
+def test_timers_fire_in_deadline_order(run):
+    async def _test(hass):
+        scope = async_get_timer_scope(hass, "entry")
+        fired = []
+        scope.async_call_later(0.03, lambda: fired.append("late"))
+        scope.async_call_later(0.01, lambda: fired.append("early"))
+        await asyncio.sleep(0.06)
+        assert fired == ["early", "late"]
+        assert len(scope.service) == 0
+
+    run(_test)
+
+
+def test_cancel_and_reschedule(run):
+    async def _test(hass):
+        scope = async_get_timer_scope(hass, "entry")
+        fired = []
+        cancelled = scope.async_call_later(0.01, lambda: fired.append("cancelled"))
+        moved = scope.async_call_later(0.01, lambda: fired.append("moved"))
+        cancelled.cancel()
+        moved.reschedule(0.04)
+        assert not cancelled.active
+        assert moved.active and moved.remaining > 0.02
+        await asyncio.sleep(0.02)
+        assert fired == []
+        await asyncio.sleep(0.04)
+        assert fired == ["moved"]
+        assert not moved.active and moved.remaining == 0.0
+
+    run(_test)
+
+
+def test_only_earliest_deadline_is_armed(run):
+    async def _test(hass):
+        scope = async_get_timer_scope(hass, "entry")
+        later = scope.async_call_later(10, lambda: None)
+        earlier = scope.async_call_later(5, lambda: None)
+        assert scope.service._wakeup_at == earlier.deadline
+        earlier.cancel()
+        assert scope.service._wakeup_at == later.deadline
+        later.cancel()
+        assert scope.service._wakeup is None
+
+    run(_test)
+
+
+def test_coroutine_actions_run_as_task(run):
+    async def _test(hass):
+        scope = async_get_timer_scope(hass, "entry")
+        done = asyncio.Event()
+
+        async def _action():
+            done.set()
+
+        scope.async_call_later(0, _action)
+        await asyncio.wait_for(done.wait(), 1)
+
+    run(_test)
+
+
+def test_release_cancels_owner_and_removes_unused_service(run):
+    async def _test(hass):
+        first = async_get_timer_scope(hass, "first")
+        second = async_get_timer_scope(hass, "second")
+        assert first.service is second.service
+        fired = []
+        first.async_call_later(0.01, lambda: fired.append("first"))
+        second.async_call_later(0.01, lambda: fired.append("second"))
+
+        async_release_timer_scope(hass, first)
+        await asyncio.sleep(0.03)
+        assert fired == ["second"]
+        assert hass.data[DOMAIN][DATA_TIMERS] is second.service
+
+        async_release_timer_scope(hass, second)
+        assert DATA_TIMERS not in hass.data[DOMAIN]
+
+    run(_test)